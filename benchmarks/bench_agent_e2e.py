@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of FlightAgent turns on the fake LLM provider: scripted EN/VI booking conversations through
+run and stream, reporting per-node latency, checkpoint growth, DB write latency, peak RSS and turns/sec as JSON
+"""
+
+import argparse
+import dataclasses
+import functools
+import importlib
+import inspect
+import json
+import os
+import platform
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.agents import FlightAgent
+from src.config import settings
+from src.utils.conversation_service import conversation_service
+from src.utils.database import DatabaseManager
+from src.utils.flight_inventory import FlightInventory
+from src.utils.llm_provider import create_llms
+from src.utils.summary_worker import summary_worker
+from src.utils.tool_cache import tool_cache, route_tag
+
+flight_tools = importlib.import_module("src.tools.flight_tools")
+
+# Graph node -> agent methods that may implement it (plain or fused graph)
+NODE_METHODS = {
+    "manage_memory": ["manage_memory"],
+    "save_conversation": ["save_conversation"],
+    "classify_intent": ["classify_intent", "classify_and_extract"],
+    "collect_info": ["collect_booking_info", "collect_extracted_info"],
+    "process_booking": ["process_booking"],
+    "summarize_conversation": ["summarize_conversation"],
+}
+
+
+def conversations(today: Optional[date] = None) -> Dict[str, List[str]]:
+    """Scripted multi-turn conversations; travel dates are kept in the future."""
+    today = today or date.today()
+    first, second = (today + timedelta(days=30)).isoformat(), (today + timedelta(days=45)).isoformat()
+    return {
+        "en_booking": [
+            "Hi there",
+            f"Book a flight from Paris to Tokyo on {first}, one way, 1 passenger, economy",
+            "John Smith",
+            "john.smith@example.com",
+            "What's the weather in Tokyo?",
+            "Thanks, what else can you help me with?",
+        ],
+        "vi_booking": [
+            "Xin chào",
+            f"Đặt vé từ Pa-ri đi Luân Đôn ngày {second}, một chiều, 2 người, hạng phổ thông",
+            "Nguyễn Văn An",
+            "an.nguyen@example.com",
+            "Thời tiết ở Luân Đôn thế nào?",
+            "Cảm ơn em",
+        ],
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1e3 if values else 0.0
+
+
+def latency_stats(values: List[float]) -> dict:
+    """Count and p50/p99/mean/total in milliseconds."""
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 0.5),
+        "p99_ms": percentile(values, 0.99),
+        "mean_ms": sum(values) / len(values) * 1e3 if values else 0.0,
+        "total_ms": sum(values) * 1e3,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+class Timings:
+    """Elapsed times per label, recorded by wrapped callables."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, label: str, func: Callable) -> Callable:
+        # functools.wraps keeps the signature LangGraph inspects to pass config
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.samples[label].append(time.perf_counter() - start)
+        else:
+            @functools.wraps(func)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.samples[label].append(time.perf_counter() - start)
+        return timed
+
+    def report(self) -> Dict[str, dict]:
+        return {label: latency_stats(values) for label, values in sorted(self.samples.items())}
+
+
+def instrument(agent: FlightAgent, nodes: Timings, writes: Timings):
+    """Time the graph nodes, the checkpointer writes and the conversation DB writes of an agent."""
+    for node, methods in NODE_METHODS.items():
+        for method in methods:
+            # Instance attributes shadow the methods create_graph() registers as nodes
+            setattr(agent, method, nodes.wrap(node, getattr(agent, method)))
+    agent.compile_graph()
+    checkpointer = agent._checkpointer
+    checkpointer.put = writes.wrap("checkpoint_put", checkpointer.put)
+    checkpointer.put_writes = writes.wrap("checkpoint_put_writes", checkpointer.put_writes)
+    db = conversation_service.db
+    db.add_conversation_entries = writes.wrap("conversation_db_write", db.add_conversation_entries)
+
+
+def uninstrument():
+    """Drop the wrapper on the shared conversation DB manager."""
+    del conversation_service.db.add_conversation_entries
+
+
+@contextmanager
+def scratch_stores(tmp: str):
+    """Keep the conversation DB, flight inventory and bookings of the benchmark in ``tmp`` instead of data/."""
+    db = DatabaseManager(str(Path(tmp) / "conversations.db"))
+    inventory = FlightInventory(str(Path(tmp) / "flight_inventory.db"))
+    # Same seat invalidation hook as the shared inventory
+    inventory.add_seat_listener(
+        lambda departure, arrival, flight_date: tool_cache.invalidate("search_flights", route_tag(departure, arrival, flight_date))
+    )
+    saved = conversation_service.db, flight_tools.shared_tools
+    conversation_service.db = db
+    if conversation_service.write_buffer is not None:
+        conversation_service.write_buffer.db = db
+    flight_tools.shared_tools = flight_tools.FlightTools(inventory)
+    tool_cache.clear()
+    try:
+        yield
+    finally:
+        conversation_service.flush(timeout=30)
+        conversation_service.db, flight_tools.shared_tools = saved
+        if conversation_service.write_buffer is not None:
+            conversation_service.write_buffer.db = saved[0]
+        tool_cache.clear()
+        db.close()
+        inventory.close()
+
+
+def checkpoint_size(path: str, thread_id: str) -> dict:
+    """Stored checkpoints of a thread and the size of its latest one."""
+    with sqlite3.connect(path) as conn:
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints "
+            "WHERE thread_id = ?", (thread_id,)).fetchone()
+        latest = conn.execute(
+            "SELECT LENGTH(checkpoint) FROM checkpoints WHERE thread_id = ? ORDER BY checkpoint_id DESC LIMIT 1",
+            (thread_id,)).fetchone()
+    return {"checkpoints": count, "thread_bytes": total, "latest_bytes": latest[0] if latest else 0}
+
+
+def file_bytes(path: str) -> int:
+    """Size of an SQLite database on disk, including its write-ahead log."""
+    return sum(Path(name).stat().st_size for name in (path, f"{path}-wal") if Path(name).exists())
+
+
+def run_turn(agent: FlightAgent, mode: str, text: str, thread_id: str) -> dict:
+    """One turn through run() or a fully consumed stream()."""
+    start = time.perf_counter()
+    if mode == "run":
+        response = agent.run(text, thread_id=thread_id, user_id="bench-user")
+        ok, events = response.success, 0
+    else:
+        chunks = list(agent.stream(text, thread_id=thread_id, user_id="bench-user"))
+        ok, events = all(chunk.get("type") != "error" for chunk in chunks), len(chunks)
+    return {"latency": time.perf_counter() - start, "ok": ok, "events": events}
+
+
+def run_mode(mode: str, llm_config, repeats: int, checkpoint_path: str) -> dict:
+    """Drive every scripted conversation ``repeats`` times through one agent."""
+    agent = FlightAgent()
+    agent.llm, agent.processed_llm = create_llms(llm_config)
+    agent.checkpoint_path = checkpoint_path
+    nodes, writes = Timings(), Timings()
+    instrument(agent, nodes, writes)
+
+    turns, growth = [], {}
+    run_id = uuid.uuid4().hex[:8]
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        for name, script in conversations().items():
+            thread_id = f"e2e-{mode}-{run_id}-{name}-{repeat}"
+            sizes = []
+            for text in script:
+                turn = run_turn(agent, mode, text, thread_id)
+                turns.append({"conversation": name, **turn})
+                sizes.append(checkpoint_size(checkpoint_path, thread_id))
+            # Growth curve of the first repeat; later repeats only repeat it
+            growth.setdefault(name, sizes)
+    elapsed = time.perf_counter() - start
+
+    # Conversation DB writes and stored summaries are deferred: wait for them before reading the timings
+    flush_start = time.perf_counter()
+    conversation_service.flush(timeout=30)
+    summary_worker.flush(timeout=30)
+    drain = time.perf_counter() - flush_start
+    agent.close()
+    uninstrument()
+
+    latencies = [turn["latency"] for turn in turns]
+    return {
+        "turns": len(turns),
+        "failed_turns": sum(not turn["ok"] for turn in turns),
+        "stream_events": sum(turn["events"] for turn in turns),
+        "elapsed_s": elapsed,
+        "turns_per_sec": len(turns) / elapsed,
+        "turn_latency": latency_stats(latencies),
+        "nodes": nodes.report(),
+        "db_writes": writes.report(),
+        "checkpoint_growth": growth,
+        "checkpoint_file_bytes": file_bytes(checkpoint_path),
+        "drain_ms": drain * 1e3,
+        "llm_calls": agent.llm.calls + agent.processed_llm.calls,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def report(mode: str, result: dict):
+    print(f"{mode}: {result['turns']} turns in {result['elapsed_s']:.2f} s ({result['turns_per_sec']:.1f} turns/s), "
+          f"{result['failed_turns']} failed | turn p50 {result['turn_latency']['p50_ms']:.1f} ms | "
+          f"p99 {result['turn_latency']['p99_ms']:.1f} ms | {result['llm_calls'] / result['turns']:.1f} LLM calls/turn")
+    for node, stats in result["nodes"].items():
+        print(f"  {node:<24} x{stats['count']:<4} p50 {stats['p50_ms']:7.2f} ms | p99 {stats['p99_ms']:7.2f} ms")
+    for label, stats in result["db_writes"].items():
+        print(f"  {label:<24} x{stats['count']:<4} p50 {stats['p50_ms']:7.2f} ms | p99 {stats['p99_ms']:7.2f} ms")
+    print(f"  write-behind and summary drain after the last turn {result['drain_ms']:.1f} ms")
+    for name, sizes in result["checkpoint_growth"].items():
+        print(f"  checkpoint {name:<13} " + " -> ".join(f"{size['latest_bytes'] / 1024:.1f}" for size in sizes)
+              + f" KiB ({sizes[-1]['checkpoints']} checkpoints, {sizes[-1]['thread_bytes'] / 1024:.0f} KiB stored)")
+    print(f"  peak RSS {result['peak_rss_mb']:.1f} MB | checkpoint file {result['checkpoint_file_bytes'] / 1024:.0f} KiB")
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Metrics that got worse than the baseline by more than ``tolerance`` (and ``min_delta_ms`` for latencies)."""
+    if baseline.get("config") != results["config"]:
+        print("  ⚠️  baseline was run with a different configuration")
+    regressions = []
+    for mode, result in results["modes"].items():
+        previous = baseline.get("modes", {}).get(mode)
+        if not previous:
+            continue
+        checks = [("turns/sec", previous["turns_per_sec"], result["turns_per_sec"], False),
+                  ("turn p50 ms", previous["turn_latency"]["p50_ms"], result["turn_latency"]["p50_ms"], True),
+                  ("peak RSS MB", previous["peak_rss_mb"], result["peak_rss_mb"], True)]
+        checks += [(f"{node} p50 ms", previous["nodes"][node]["p50_ms"], stats["p50_ms"], True)
+                   for node, stats in result["nodes"].items() if node in previous["nodes"]]
+        for label, before, after, lower_is_better in checks:
+            change = (after - before) / before if before else 0.0
+            print(f"  {mode:<6} {label:<32} {before:9.2f} -> {after:9.2f} ({change:+.0%})")
+            if label.endswith(" ms") and abs(after - before) < min_delta_ms:
+                continue
+            if (change if lower_is_better else -change) > tolerance:
+                regressions.append(f"{mode} {label}")
+    return regressions
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="End-to-end FlightAgent benchmark")
+    parser.add_argument("--repeats", type=int, default=3, help="Times each scripted conversation is run per mode")
+    parser.add_argument("--modes", nargs="+", choices=["run", "stream"], default=["run", "stream"])
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fake LLM mean time to first token")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Fake LLM latency spread")
+    parser.add_argument("--distribution", default="lognormal",
+                        choices=["constant", "uniform", "normal", "lognormal"], help="Fake LLM latency distribution")
+    parser.add_argument("--token-ms", type=float, default=0, help="Fake LLM time per following token")
+    parser.add_argument("--output", default="logs/bench_agent_e2e.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Relative change reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Latency changes below this are noise")
+    args = parser.parse_args()
+
+    script = conversations()
+    print("🏁 End-to-end agent benchmark")
+    print(f"   {len(script)} conversations ({', '.join(script)}) x {args.repeats} repeats, "
+          f"{sum(map(len, script.values()))} turns each; fake LLM {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms "
+          f"{args.distribution}, {args.token_ms:.0f} ms/token")
+    print("=" * 50)
+
+    llm_config = dataclasses.replace(
+        settings.llm, provider="fake", fake_latency_ms=args.latency_ms, fake_latency_jitter_ms=args.jitter_ms,
+        fake_latency_distribution=args.distribution, fake_token_ms=args.token_ms)
+    results = {
+        "benchmark": "agent_e2e",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "repeats": args.repeats,
+            "llm": {key: getattr(llm_config, key) for key in ("fake_latency_ms", "fake_latency_jitter_ms",
+                                                                "fake_latency_distribution", "fake_token_ms")},
+            "fast_intent": settings.agent.fast_intent_enabled,
+            "fused_intent_extraction": settings.agent.fused_intent_extraction,
+            "memory_window": settings.memory.enabled,
+            "background_summaries": settings.memory.background_summaries,
+        },
+        "modes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp, scratch_stores(tmp):
+        for mode in args.modes:
+            result = run_mode(mode, llm_config, args.repeats, str(Path(tmp) / f"checkpoints_{mode}.db"))
+            results["modes"][mode] = result
+            report(mode, result)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"results written to {output}")
+
+    if args.baseline:
+        print(f"compared with {args.baseline}:")
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        print(f"{len(regressions)} regressions beyond {args.tolerance:.0%}" +
+              (f": {', '.join(regressions)}" if regressions else ""))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
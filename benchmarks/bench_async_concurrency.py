@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Load test: sequential FlightAgent.run vs concurrent FlightAgent.arun on one event loop
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from benchmarks.fakes import use_fake_llms
+from src.agents import FlightAgent
+
+
+async def run_concurrent(agent: FlightAgent, conversations: int) -> float:
+    """Run one turn for every conversation concurrently; return elapsed seconds."""
+    start = time.perf_counter()
+    responses = await asyncio.gather(*[
+        agent.arun("hello", thread_id=f"async-{i}", user_id="bench-user")
+        for i in range(conversations)
+    ])
+    elapsed = time.perf_counter() - start
+    failures = [r.error for r in responses if not r.success]
+    if failures:
+        raise RuntimeError(failures[0])
+    await agent.aclose()
+    return elapsed
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description="Async concurrency load test")
+    parser.add_argument("--conversations", type=int, default=200, help="Concurrent conversations")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--sequential-sample", type=int, default=20, help="Turns to time on the sync path")
+    args = parser.parse_args()
+
+    print("🏁 Async concurrency load test (fake LLM)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_agent = use_fake_llms(FlightAgent(), latency=args.latency)
+        sync_agent.compile_graph(file_path=str(Path(tmp) / "sync.db"))
+        start = time.perf_counter()
+        for i in range(args.sequential_sample):
+            sync_agent.run("hello", thread_id=f"sync-{i}", user_id="bench-user")
+        sync_per_turn = (time.perf_counter() - start) / args.sequential_sample
+        sync_agent.close()
+
+        async_agent = use_fake_llms(FlightAgent(), latency=args.latency)
+        async_agent.checkpoint_path = str(Path(tmp) / "async.db")
+        elapsed = asyncio.run(run_concurrent(async_agent, args.conversations))
+
+    sync_throughput = 1 / sync_per_turn
+    async_throughput = args.conversations / elapsed
+    print(f"Sequential run():  {sync_per_turn * 1000:.1f} ms/turn -> {sync_throughput:,.1f} turns/sec")
+    print(f"Concurrent arun(): {args.conversations} conversations in {elapsed:.2f}s -> {async_throughput:,.1f} turns/sec")
+    print(f"Concurrency gain: {async_throughput / sync_throughput:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
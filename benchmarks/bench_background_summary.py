@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark conversation summarization: an LLM summary on every turn vs incremental summaries in a background worker
+"""
+
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from statistics import median
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.fakes import ScriptedChatModel, INTENT_JSON
+from src.agents import FlightAgent
+from src.agents import enhanced_agent
+from src.config import settings
+from src.utils.summary_worker import ConversationSummaryWorker
+
+QUESTIONS = [
+    "What is the baggage allowance on long-haul flights to Tokyo?",
+    "Can I change my seat after booking?",
+    "Which airlines fly from Paris to Seoul?",
+    "Do you offer vegetarian meals on international routes?",
+]
+
+
+class CountingChatModel(ScriptedChatModel):
+    """Scripted model counting summary calls; summaries take ``summary_latency`` seconds."""
+
+    summary_calls: int = 0
+    summary_latency: float = 0.05
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        system = str(messages[0].content) if messages else ""
+        if "summarizing conversations" in system:
+            self.summary_calls += 1
+            time.sleep(self.summary_latency)
+            content = "The user asked about baggage, seats, routes and meals; no booking yet."
+        elif "intent classifier" in system:
+            content = INTENT_JSON.replace("greeting", "general_inquiry")
+        else:
+            content = "Here is the answer to your question."
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def run_mode(worker: ConversationSummaryWorker, conversations: int, turns: int, tmp: str, label: str) -> dict:
+    """Drive several conversations and count summary LLM calls."""
+    enhanced_agent.summary_worker = worker
+    agent = FlightAgent()
+    model = CountingChatModel(responses=[""])
+    agent.llm = agent.processed_llm = model
+    agent.compile_graph(file_path=str(Path(tmp) / f"checkpoints_{label}.db"))
+
+    latencies = []
+    run_id = uuid.uuid4().hex[:8]
+    for conversation in range(conversations):
+        thread_id = f"summary-bench-{run_id}-{conversation}"
+        for turn in range(turns):
+            start = time.perf_counter()
+            agent.run(QUESTIONS[turn % len(QUESTIONS)], thread_id=thread_id, user_id="bench-user")
+            latencies.append(time.perf_counter() - start)
+    during = model.summary_calls
+    # Conversations end here: the idle trigger summarizes what is left
+    worker.flush()
+    worker.close()
+    agent.close()
+    return {
+        "calls_during": during,
+        "calls_total": model.summary_calls,
+        "p50_ms": median(latencies) * 1e3,
+        "max_ms": max(latencies) * 1e3,
+        "stats": worker.get_stats(),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Background summary benchmark")
+    parser.add_argument("--conversations", type=int, default=5, help="Conversations to run")
+    parser.add_argument("--turns", type=int, default=12, help="Turns per conversation")
+    parser.add_argument("--every", type=int, default=5, help="Turns between incremental summaries")
+    args = parser.parse_args()
+
+    print("🏁 Background summary benchmark")
+    print(f"   {args.conversations} conversations x {args.turns} turns, summary call 50 ms")
+    print("=" * 50)
+
+    settings.agent.fast_intent_enabled = False
+    modes = [
+        ("every turn, inline", ConversationSummaryWorker(
+            dataclasses.replace(settings.memory, summary_every_turns=1), background=False)),
+        (f"every {args.every} turns/idle, background", ConversationSummaryWorker(
+            dataclasses.replace(settings.memory, summary_every_turns=args.every), background=True)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = []
+        for index, (label, worker) in enumerate(modes):
+            result = run_mode(worker, args.conversations, args.turns, tmp, str(index))
+            results.append(result)
+            print(f"{label}:")
+            print(f"  summary LLM calls: {result['calls_total']} "
+                  f"({result['calls_total'] / args.conversations:.1f}/conversation, {result['calls_during']} during turns)")
+            print(f"  turn latency: p50 {result['p50_ms']:.1f} ms | max {result['max_ms']:.1f} ms")
+            print(f"  worker: {result['stats']['submitted']} submitted, {result['stats']['coalesced']} coalesced, "
+                  f"{result['stats']['failures']} failures")
+    saved = 1 - results[1]["calls_total"] / max(results[0]["calls_total"], 1)
+    print(f"{saved:.0%} fewer summary LLM calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark accuracy and latency of the deterministic booking field extractor on an EN/VI corpus
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.utils.booking_extractor import BookingFieldExtractor
+
+TODAY = date(2025, 6, 15)  # a Sunday
+
+# (message, pending field or None, expected fields)
+CORPUS = [
+    # English, full requests
+    ("I want to book a flight from Paris to Tokyo", None, {"departure_city": "Paris", "arrival_city": "Tokyo"}),
+    ("Book 2 tickets from London to Seoul on July 10, business class", None,
+     {"departure_city": "London", "arrival_city": "Seoul", "date": "2025-07-10", "passengers": 2,
+      "class_type": "business"}),
+    ("Round trip New York to Rome, leaving 2025-08-01 and returning 2025-08-15", None,
+     {"departure_city": "New York", "arrival_city": "Rome", "round_trip": True, "date": "2025-08-01",
+      "return_date": "2025-08-15"}),
+    ("one way to Sydney tomorrow for 3 people", None,
+     {"arrival_city": "Sydney", "round_trip": False, "date": "2025-06-16", "passengers": 3}),
+    ("Find flights from Berlin to Paris next friday", None,
+     {"departure_city": "Berlin", "arrival_city": "Paris", "date": "2025-06-20"}),
+    ("I need a first class ticket from Tokyo to London on 20th July", None,
+     {"departure_city": "Tokyo", "arrival_city": "London", "class_type": "first", "date": "2025-07-20"}),
+    ("Paris to Tokyo, 1 adult, economy", None,
+     {"departure_city": "Paris", "arrival_city": "Tokyo", "passengers": 1, "class_type": "economy"}),
+    ("Can I bring my dog on the plane?", None, {}),
+    ("What is the cheapest flight you have?", None, {}),
+    # English, answers to a pending question
+    ("Paris", "departure_city", {"departure_city": "Paris"}),
+    ("to Tokyo", "departure_city", {"arrival_city": "Tokyo"}),
+    ("New York", "arrival_city", {"arrival_city": "New York"}),
+    ("yes", "round_trip", {"round_trip": True}),
+    ("no, one way", "round_trip", {"round_trip": False}),
+    ("tomorrow", "date", {"date": "2025-06-16"}),
+    ("2025-07-01", "date", {"date": "2025-07-01"}),
+    ("July 4th", "date", {"date": "2025-07-04"}),
+    ("in 3 days", "date", {"date": "2025-06-18"}),
+    ("10/07/2025", "date", {"date": "2025-07-10"}),
+    ("2", "passengers", {"passengers": 2}),
+    ("just me", "passengers", {"passengers": 1}),
+    ("four passengers", "passengers", {"passengers": 4}),
+    ("business", "class_type", {"class_type": "business"}),
+    ("first", "class_type", {"class_type": "first"}),
+    ("John Smith", "passenger_name", {"passenger_name": "John Smith"}),
+    ("my name is mary jane watson", "passenger_name", {"passenger_name": "Mary Jane Watson"}),
+    ("john.smith@example.com", "email", {"email": "john.smith@example.com"}),
+    ("it's an.nguyen+travel@mail.vn", "email", {"email": "an.nguyen+travel@mail.vn"}),
+    ("July 20", "return_date", {"return_date": "2025-07-20"}),
+    ("Actually make it business class please", "passenger_name", {"class_type": "business"}),
+    # Vietnamese, full requests
+    ("Tôi muốn đặt vé từ Luân Đôn đi Tokyo ngày mai", None,
+     {"departure_city": "London", "arrival_city": "Tokyo", "date": "2025-06-16"}),
+    ("Đặt 2 vé khứ hồi từ Paris đến Seoul ngày 20 tháng 7, về ngày 30 tháng 7", None,
+     {"passengers": 2, "round_trip": True, "departure_city": "Paris", "arrival_city": "Seoul",
+      "date": "2025-07-20", "return_date": "2025-07-30"}),
+    ("vé một chiều đi Sydney hạng thương gia", None,
+     {"round_trip": False, "arrival_city": "Sydney", "class_type": "business"}),
+    ("tìm chuyến bay từ Berlin tới Rome thứ sáu tuần sau cho 3 người", None,
+     {"departure_city": "Berlin", "arrival_city": "Rome", "date": "2025-06-20", "passengers": 3}),
+    ("Tôi có được mang thú cưng lên máy bay không?", None, {}),
+    # Vietnamese, answers to a pending question
+    ("Hà Nội", "departure_city", {}),
+    ("đi Tokyo", "departure_city", {"arrival_city": "Tokyo"}),
+    ("có", "round_trip", {"round_trip": True}),
+    ("một chiều", "round_trip", {"round_trip": False}),
+    ("ngày mai", "date", {"date": "2025-06-16"}),
+    ("ngày 5 tháng 8", "date", {"date": "2025-08-05"}),
+    ("15/08", "date", {"date": "2025-08-15"}),
+    ("hai người", "passengers", {"passengers": 2}),
+    ("một mình tôi", "passengers", {"passengers": 1}),
+    ("phổ thông", "class_type", {"class_type": "economy"}),
+    ("hạng nhất", "class_type", {"class_type": "first"}),
+    ("Nguyễn Văn An", "passenger_name", {"passenger_name": "Nguyễn Văn An"}),
+    ("tên tôi là Trần Thị Mai", "passenger_name", {"passenger_name": "Trần Thị Mai"}),
+    ("email của tôi là an@example.com", "email", {"email": "an@example.com"}),
+]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Deterministic booking extractor benchmark")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing repetitions over the corpus")
+    parser.add_argument("--llm-latency", type=float, default=0.8,
+                        help="Assumed seconds per LLM extraction call")
+    args = parser.parse_args()
+
+    extractor = BookingFieldExtractor()
+
+    print("🏁 Deterministic booking extractor benchmark")
+    print("=" * 50)
+
+    true_positive = Counter()
+    false_positive = Counter()
+    expected_total = Counter()
+    exact = skipped = unsafe_skips = 0
+    mistakes = []
+    for text, pending_field, expected in CORPUS:
+        result = extractor.extract(text, pending_field, today=TODAY)
+        for name, value in expected.items():
+            expected_total[name] += 1
+            if result.fields.get(name) == value:
+                true_positive[name] += 1
+        for name, value in result.fields.items():
+            if expected.get(name) != value:
+                false_positive[name] += 1
+        if result.fields == expected:
+            exact += 1
+        else:
+            mistakes.append((text, expected, result.fields))
+        if result.complete:
+            skipped += 1
+            unsafe_skips += result.fields != expected
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text, pending_field, _ in CORPUS:
+            extractor.extract(text, pending_field, today=TODAY)
+    per_message = (time.perf_counter() - start) / (args.repeat * len(CORPUS))
+
+    total = len(CORPUS)
+    print(f"Corpus messages: {total} (EN + VI)")
+    print(f"{'field':<16}{'recall':>8}{'precision':>11}")
+    for name in sorted(set(expected_total) | set(false_positive)):
+        found = true_positive[name] + false_positive[name]
+        recall = true_positive[name] / expected_total[name] if expected_total[name] else 1.0
+        precision = true_positive[name] / found if found else 1.0
+        print(f"{name:<16}{recall:>8.0%}{precision:>11.0%}")
+    print(f"Exact message match: {exact / total:.1%}")
+    for text, expected, got in mistakes:
+        print(f"  ✗ {text!r}: expected {expected}, got {got}")
+    print(f"LLM extraction skipped: {skipped / total:.1%} of messages ({unsafe_skips} skipped with wrong fields)")
+    print(f"Local extraction cost: {per_message * 1e6:.1f} µs/message")
+    print(f"Estimated extraction latency saved: {skipped * args.llm_latency / total * 1000:.0f} ms/message "
+          f"(assuming {args.llm_latency * 1000:.0f} ms per LLM call)")
+
+
+if __name__ == "__main__":
+    main()
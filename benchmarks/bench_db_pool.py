@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark conversation entry writes with and without the connection pool
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import DatabaseManager
+
+
+class UnpooledDatabaseManager(DatabaseManager):
+    """DatabaseManager that opens and closes a connection per call (pre-pool behaviour)."""
+
+    @contextmanager
+    def connection(self):
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def run_writes(db: DatabaseManager, entries: int, threads: int) -> float:
+    """Write ``entries`` conversation entries across ``threads`` threads; return entries/sec."""
+    per_thread = entries // threads
+
+    def worker(worker_id: int):
+        for i in range(per_thread):
+            db.add_conversation_entry(
+                thread_id=f"bench-{worker_id}-{i % 20}",
+                user_id=f"user-{worker_id}",
+                user_input="I want to fly from Paris to Tokyo",
+                assistant_response="May I please know your departure date?",
+                metadata={"source": "benchmark", "turn": i}
+            )
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return (per_thread * threads) / elapsed
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Connection pool write benchmark")
+    parser.add_argument("--entries", type=int, default=2000, help="Total entries to write")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent writer threads")
+    parser.add_argument("--pool-size", type=int, default=4, help="Pool size for the pooled run")
+    args = parser.parse_args()
+
+    print("🏁 Connection pool benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        unpooled = UnpooledDatabaseManager(str(Path(tmp) / "unpooled.db"))
+        before = run_writes(unpooled, args.entries, args.threads)
+        unpooled.close()
+
+        pooled = DatabaseManager(str(Path(tmp) / "pooled.db"), pool_size=args.pool_size)
+        after = run_writes(pooled, args.entries, args.threads)
+        stats = pooled.get_pool_stats()
+        pooled.close()
+
+    print(f"Entries: {args.entries} | Threads: {args.threads} | SQLite {sqlite3.sqlite_version}")
+    print(f"Before (connect per call): {before:,.0f} entries/sec")
+    print(f"After  (pooled, size={args.pool_size}): {after:,.0f} entries/sec")
+    print(f"Speedup: {after / before:.2f}x")
+    print(f"Pool stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
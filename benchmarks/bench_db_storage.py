@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent writers on one thread_id under different storage profiles
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import DatabaseConfig
+from src.utils.database import DatabaseManager
+
+
+PROFILES = {
+    # SQLite defaults the database used before storage profiles existed
+    "rollback_full": DatabaseConfig(journal_mode="DELETE", synchronous="FULL", mmap_size=0, cache_size=-2000),
+    "wal_normal": DatabaseConfig()
+}
+
+
+def run_profile(db_path: str, config: DatabaseConfig, writers: int, entries_per_writer: int) -> dict:
+    """Hammer a single thread_id from several writer threads."""
+    db = DatabaseManager(db_path, pool_size=writers, config=config)
+    failures = []
+    latencies = []
+    lock = threading.Lock()
+
+    def writer(writer_id: int):
+        for i in range(entries_per_writer):
+            start = time.perf_counter()
+            ok = db.add_conversation_entry(
+                thread_id="shared-thread",
+                user_id="bench-user",
+                user_input=f"Writer {writer_id} message {i}",
+                assistant_response="Noted.",
+                metadata={"writer": writer_id, "turn": i}
+            )
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    failures.append((writer_id, i))
+
+    db.create_conversation("shared-thread", "bench-user")
+    first = db.get_conversation("shared-thread")
+    # CURRENT_TIMESTAMP has one-second resolution; make a reset of created_at visible
+    time.sleep(1.1)
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    conversation = db.get_conversation("shared-thread")
+    db.close()
+
+    latencies.sort()
+    written = len(latencies) - len(failures)
+    return {
+        "entries_per_sec": written / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "failures": len(failures),
+        "stored_entries": len(conversation["entries"]) if conversation else 0,
+        "created_at_stable": bool(conversation) and conversation["created_at"] == first["created_at"]
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Storage profile benchmark")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+    parser.add_argument("--entries", type=int, default=100, help="Entries per writer")
+    args = parser.parse_args()
+
+    print("🏁 Storage profile benchmark (concurrent writers, one thread_id)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, config in PROFILES.items():
+            result = run_profile(str(Path(tmp) / f"{name}.db"), config, args.writers, args.entries)
+            print(f"{name:>14}: {result['entries_per_sec']:,.0f} entries/sec | "
+                  f"p50 {result['p50_ms']:.2f} ms | p99 {result['p99_ms']:.2f} ms | "
+                  f"failures {result['failures']} | stored {result['stored_entries']} | "
+                  f"created_at stable: {result['created_at_stable']}")
+
+
+if __name__ == "__main__":
+    main()
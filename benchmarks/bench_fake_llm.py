@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark graph, DB and tool overhead offline with the fake LLM provider: zero latency vs simulated OpenAI latency
+"""
+
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from statistics import median
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.agents import FlightAgent
+from src.config import settings
+from src.utils.llm_provider import create_llms
+
+CONVERSATION = [
+    "Hi there",
+    "Book a flight from Paris to Tokyo on 2026-12-15, one way, 1 passenger, economy",
+    "John Smith",
+    "john.smith@example.com",
+    "What's the weather in Tokyo?",
+]
+
+
+def run_conversations(config, conversations: int, checkpoint_path: str) -> dict:
+    """Drive the scripted booking conversation through the full graph."""
+    agent = FlightAgent()
+    agent.llm, agent.processed_llm = create_llms(config)
+    agent.checkpoint_path = checkpoint_path
+
+    latencies = []
+    run_id = uuid.uuid4().hex[:8]
+    start = time.perf_counter()
+    for conversation in range(conversations):
+        thread_id = f"fake-llm-{run_id}-{conversation}"
+        for text in CONVERSATION:
+            turn_start = time.perf_counter()
+            agent.run(text, thread_id=thread_id, user_id="bench-user")
+            latencies.append(time.perf_counter() - turn_start)
+    elapsed = time.perf_counter() - start
+    agent.close()
+    return {
+        "turns_per_sec": len(latencies) / elapsed,
+        "p50_ms": median(latencies) * 1e3,
+        "max_ms": max(latencies) * 1e3,
+        "llm_calls": agent.llm.calls + agent.processed_llm.calls,
+        "turns": len(latencies),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Fake LLM provider benchmark")
+    parser.add_argument("--conversations", type=int, default=5, help="Booking conversations to run")
+    parser.add_argument("--latency-ms", type=float, default=400, help="Mean simulated time to first token")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="Latency spread (lognormal shape)")
+    parser.add_argument("--token-ms", type=float, default=5, help="Simulated time per following token")
+    args = parser.parse_args()
+
+    print("🏁 Fake LLM provider benchmark")
+    print(f"   {args.conversations} conversations x {len(CONVERSATION)} turns (greeting, booking, weather)")
+    print("=" * 50)
+
+    settings.agent.fast_intent_enabled = False
+    modes = [
+        ("zero latency (framework only)", dataclasses.replace(settings.llm, provider="fake")),
+        (f"lognormal {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms", dataclasses.replace(
+            settings.llm, provider="fake", fake_latency_ms=args.latency_ms, fake_latency_jitter_ms=args.jitter_ms,
+            fake_latency_distribution="lognormal", fake_token_ms=args.token_ms)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = []
+        for index, (label, config) in enumerate(modes):
+            result = run_conversations(config, args.conversations, str(Path(tmp) / f"checkpoints_{index}.db"))
+            results.append(result)
+            print(f"{label}:")
+            print(f"  {result['turns_per_sec']:.1f} turns/s | turn p50 {result['p50_ms']:.1f} ms | "
+                  f"max {result['max_ms']:.1f} ms | {result['llm_calls'] / result['turns']:.1f} LLM calls/turn")
+    overhead = results[0]["p50_ms"] / results[1]["p50_ms"]
+    print(f"graph, DB and tool overhead: {overhead:.1%} of a median turn with simulated LLM latency")
+
+
+if __name__ == "__main__":
+    main()
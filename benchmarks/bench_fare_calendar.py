@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized fare calendar against per-day search_flights calls and a scalar pricing loop
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.tools.flight_tools import FlightTools
+from src.utils.fare_calendar import FareCalendar
+from src.utils.flight_inventory import FlightInventory
+from src.utils.schedule_generator import ScheduleGenerator
+
+START = date(2025, 7, 1)
+CLASS_TYPE = "business"
+PASSENGERS = 2
+
+
+def scalar_calendar(tools: FlightTools, departure: str, arrival: str, dates):
+    """Today's approach: one search_flights lookup per day, priced flight by flight."""
+    cheapest = []
+    for flight_date in dates:
+        best = None
+        for flight in tools.inventory.search_flights(departure, arrival, flight_date):
+            total = tools._calculate_price(flight["price"], PASSENGERS, CLASS_TYPE)
+            if flight["available_seats"] >= PASSENGERS and (best is None or total < best):
+                best = total
+        cheapest.append(None if best is None else round(best, 2))
+    return cheapest
+
+
+def scalar_pass(tools: FlightTools, rows, dates):
+    """Scalar pricing loop over already fetched rows."""
+    best = dict.fromkeys(dates)
+    for row in rows:
+        total = tools._calculate_price(row[6], PASSENGERS, CLASS_TYPE)
+        if row[8] >= PASSENGERS and (best[row[1]] is None or total < best[row[1]]):
+            best[row[1]] = total
+    return [None if best[flight_date] is None else round(best[flight_date], 2) for flight_date in dates]
+
+
+def timed(function, repeat: int):
+    """Mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Fare calendar benchmark")
+    parser.add_argument("--airports", type=int, default=500, help="Airports to generate")
+    parser.add_argument("--days", type=int, default=60, help="Calendar window in days")
+    parser.add_argument("--routes", type=int, default=50, help="Routes to query")
+    parser.add_argument("--rows", type=int, default=500000, help="Rows for the compute-only comparison")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args()
+
+    print("🏁 Fare calendar benchmark")
+    print("=" * 50)
+
+    dates = [(START + timedelta(days=offset)).isoformat() for offset in range(args.days)]
+    generator = ScheduleGenerator(airports=args.airports, horizon_days=args.days, start_date=START)
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = FlightInventory(str(Path(tmp) / "inventory.db"))
+        generator.load(inventory)
+        tools = FlightTools(inventory)
+        fares = FareCalendar(inventory)
+        multiplier = 2.5
+
+        # Busiest routes first: the mock hubs have the most daily frequencies
+        frequencies = Counter((schedule.departure, schedule.arrival) for schedule in generator.schedules())
+        routes = sorted(frequencies, key=lambda route: (-frequencies[route], route))[:args.routes]
+
+        scalar_total = vector_total = 0.0
+        mismatches = 0
+        flights = 0
+        for departure, arrival in routes:
+            scalar_elapsed, expected = timed(lambda: scalar_calendar(tools, departure, arrival, dates), args.repeat)
+            vector_elapsed, calendar = timed(
+                lambda: fares.calendar(departure, arrival, START.isoformat(), days=args.days, passengers=PASSENGERS,
+                                       class_type=CLASS_TYPE, price_multipliers={CLASS_TYPE: multiplier}),
+                args.repeat)
+            scalar_total += scalar_elapsed
+            vector_total += vector_elapsed
+            mismatches += expected != [day["total_price"] for day in calendar["days"]]
+            flights += sum(day["flights"] for day in calendar["days"])
+
+        print(f"Route calendars ({len(routes)} routes x {args.days} days, {flights / len(routes):.0f} flights/route):")
+        print(f"  per-day search_flights + _calculate_price: {scalar_total / len(routes) * 1e3:.2f} ms/route")
+        print(f"  fare_calendar (one range query + NumPy):   {vector_total / len(routes) * 1e3:.2f} ms/route "
+              f"({scalar_total / vector_total:.1f}x faster)")
+        print(f"  identical cheapest fares: {len(routes) - mismatches}/{len(routes)} routes")
+        inventory.close()
+
+    # Pricing pass alone on a large synthetic row set
+    rng = random.Random(5)
+    rows = [(f"BN{i:06d}", dates[rng.randrange(args.days)], "A", "B", "08:00", "10:00",
+             round(rng.uniform(50, 900), 2), "MockAir", rng.randint(0, 40)) for i in range(args.rows)]
+    scalar_elapsed, expected = timed(lambda: scalar_pass(tools, rows, dates), args.repeat)
+    vector_elapsed, calendar = timed(lambda: fares.price_days(rows, dates, PASSENGERS, multiplier), args.repeat)
+    print(f"Pricing pass only ({args.rows:,} rows):")
+    print(f"  scalar loop: {scalar_elapsed * 1e3:.1f} ms | NumPy: {vector_elapsed * 1e3:.1f} ms "
+          f"({scalar_elapsed / vector_elapsed:.1f}x) | identical: {expected == [day['total_price'] for day in calendar]}")
+
+
+if __name__ == "__main__":
+    main()
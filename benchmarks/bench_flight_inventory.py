@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark indexed route lookups and concurrent seat booking in the shared flight inventory
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.utils.flight_inventory import FlightInventory, InventoryError
+
+FLIGHT_DATE = "2025-07-01"
+
+
+def make_flights(routes: int, seed: int = 7):
+    """Rows for ``routes`` distinct routes, two flights each, on one date."""
+    rng = random.Random(seed)
+    for i in range(routes):
+        departure, arrival = f"City{i:06d}", f"City{(i * 7919 + 1) % routes:06d}x"
+        for k, (departure_time, arrival_time) in enumerate([("08:00", "10:30"), ("14:30", "17:00")]):
+            yield (f"BN{i:06d}{k}", FLIGHT_DATE, departure, arrival, departure_time, arrival_time,
+                   rng.randint(200, 600), "MockAir", rng.randint(20, 50))
+
+
+def percentile(values, fraction: float) -> float:
+    """Percentile of a sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Flight inventory benchmark")
+    parser.add_argument("--routes", type=int, default=100000, help="Routes to load")
+    parser.add_argument("--lookups", type=int, default=5000, help="Route searches to time")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent booking threads")
+    args = parser.parse_args()
+
+    print("🏁 Flight inventory benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = FlightInventory(str(Path(tmp) / "inventory.db"), pool_size=args.threads)
+
+        start = time.perf_counter()
+        loaded = inventory.add_flights(make_flights(args.routes))
+        load_elapsed = time.perf_counter() - start
+
+        rng = random.Random(1)
+        routes = [(f"City{i:06d}", f"City{(i * 7919 + 1) % args.routes:06d}x")
+                  for i in (rng.randrange(args.routes) for _ in range(args.lookups))]
+        latencies = []
+        for departure, arrival in routes:
+            start = time.perf_counter()
+            flights = inventory.search_flights(departure, arrival, FLIGHT_DATE)
+            latencies.append(time.perf_counter() - start)
+            assert len(flights) == 2
+        latencies.sort()
+
+        with inventory.connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM flights WHERE departure = ? AND arrival = ? AND flight_date = ?",
+                ("a", "b", FLIGHT_DATE)
+            ).fetchall()
+
+        # Many threads race for the seats of one flight
+        flight = inventory.get_flight("BN0000000", FLIGHT_DATE)
+        confirmed = []
+        rejected = []
+
+        def book_until_full():
+            while True:
+                try:
+                    confirmed.append(inventory.book("BN0000000", "Bench Passenger", "bench@example.com",
+                                                    flight_date=FLIGHT_DATE)["booking_ref"])
+                except InventoryError:
+                    rejected.append(1)
+                    return
+
+        start = time.perf_counter()
+        workers = [threading.Thread(target=book_until_full) for _ in range(args.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        booking_elapsed = time.perf_counter() - start
+        remaining = inventory.get_flight("BN0000000", FLIGHT_DATE)["available_seats"]
+        found = sum(inventory.get_booking(ref) is not None for ref in confirmed)
+        inventory.close()
+
+    print(f"Loaded {loaded:,} flights on {args.routes:,} routes in {load_elapsed:.2f}s "
+          f"({loaded / load_elapsed:,.0f} rows/sec)")
+    print(f"Query plan: {plan[0][-1]}")
+    print(f"search_flights: p50 {percentile(latencies, 0.5) * 1e6:.0f} µs | "
+          f"p99 {percentile(latencies, 0.99) * 1e6:.0f} µs over {args.lookups:,} lookups")
+    print(f"Concurrent booking ({args.threads} threads): {len(confirmed)} confirmed for "
+          f"{flight['available_seats']} seats, {remaining} left, {len(rejected)} rejected, "
+          f"{len(confirmed) / booking_elapsed:,.0f} bookings/sec")
+    print(f"Bookings retrievable by reference: {found}/{len(confirmed)}")
+
+
+if __name__ == "__main__":
+    main()
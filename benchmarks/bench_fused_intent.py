@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Compare the two-call (classify, then extract) flow with fused intent + extraction
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from benchmarks.fakes import ScriptedChatModel
+from src.agents import FlightAgent
+from src.config import settings
+
+# Scripted booking conversations: (user message, intent, fields the user provided this turn)
+CONVERSATIONS = {
+    "en": [
+        ("I want to book a flight from Paris to Tokyo", "book_flight",
+         {"departure_city": "Paris", "arrival_city": "Tokyo"}),
+        ("one way please", "book_flight", {"round_trip": False}),
+        ("2025-07-01", "book_flight", {"date": "2025-07-01"}),
+        ("2 passengers", "book_flight", {"passengers": 2}),
+        ("business", "book_flight", {"class_type": "business"}),
+        ("Nguyen Van An", "book_flight", {"passenger_name": "Nguyen Van An"}),
+    ],
+    "vi": [
+        ("Tôi muốn đặt vé từ London đi Seoul", "book_flight",
+         {"departure_city": "London", "arrival_city": "Seoul"}),
+        ("khứ hồi", "book_flight", {"round_trip": True}),
+        ("ngày 2025-08-10", "book_flight", {"date": "2025-08-10"}),
+        ("3 người", "book_flight", {"passengers": 3}),
+        ("phổ thông", "book_flight", {"class_type": "economy"}),
+        ("Tran Thi Binh", "book_flight", {"passenger_name": "Tran Thi Binh"}),
+    ],
+}
+
+
+class PromptRoutedChatModel(ScriptedChatModel):
+    """Fake processed_llm that answers intent, extraction and fused prompts for the current scripted turn."""
+
+    turn: Optional[Dict[str, Any]] = None
+    calls: int = 0
+
+    def _next_message(self, messages: List[BaseMessage] = None) -> ChatResult:
+        system = messages[0].content if messages else ""
+        if "summarizing conversations" in system:
+            self.responses = ["Summary of the booking conversation so far."]
+            self.i = 0
+            return super()._next_message()
+        self.calls += 1
+        user_text, intent, fields = self.turn["text"], self.turn["intent"], self.turn["fields"]
+        intent_result = {
+            "intent": intent,
+            "confidence": 0.95,
+            "reasoning": f"User wants to book a flight: {user_text}",
+            "language": self.turn["language"],
+        }
+        if "booking information extractor" in system:
+            response = {**intent_result, "booking_info": fields}
+        elif "extracting flight booking information" in system:
+            response = {"extracted_info": fields, "updated_info": fields}
+        else:
+            response = intent_result
+        self.responses = [json.dumps(response, ensure_ascii=False)]
+        self.i = 0
+        return super()._next_message()
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Background summaries are the same in both modes, so only classify/extract calls pay latency
+        if self.latency and "summarizing conversations" not in messages[0].content:
+            time.sleep(self.latency)
+        return self._next_message(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def run_mode(fused: bool, checkpoint_path: str, latency: float, live: bool) -> Dict[str, Any]:
+    """Drive every scripted conversation through one graph mode."""
+    agent = FlightAgent(fused=fused)
+    fake = PromptRoutedChatModel(responses=["{}"], latency=latency)
+    agent.llm = ScriptedChatModel(responses=["Searching flights for you..."], latency=latency)
+    if not live:
+        agent.processed_llm = fake
+    agent.compile_graph(file_path=checkpoint_path)
+
+    turn_latencies = []
+    intents_correct = fields_correct = fields_total = 0
+    for language, turns in CONVERSATIONS.items():
+        thread_id = f"{'fused' if fused else 'two-call'}-{language}"
+        expected_info = {}
+        for text, intent, fields in turns:
+            fake.turn = {"text": text, "intent": intent, "fields": fields, "language": language}
+            expected_info.update(fields)
+
+            start = time.perf_counter()
+            response = agent.run(text, thread_id=thread_id, user_id="bench-user")
+            turn_latencies.append(time.perf_counter() - start)
+
+            intents_correct += response.intent == intent
+            for field, value in expected_info.items():
+                fields_total += 1
+                got = response.booking_info.get(field)
+                fields_correct += str(got).strip().lower() == str(value).strip().lower()
+    agent.close()
+
+    turn_latencies.sort()
+    turns = len(turn_latencies)
+    return {
+        "llm_calls": fake.calls if not live else None,
+        "turns": turns,
+        "mean_ms": sum(turn_latencies) / turns * 1000,
+        "p95_ms": turn_latencies[min(turns - 1, int(turns * 0.95))] * 1000,
+        "intent_accuracy": intents_correct / turns,
+        "field_accuracy": fields_correct / fields_total if fields_total else 0.0,
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Fused intent + extraction benchmark")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Simulated seconds per fake LLM call")
+    parser.add_argument("--fast-path", action="store_true", help="Keep the rule-based intent fast path on")
+    parser.add_argument("--local-extraction", action="store_true",
+                        help="Keep the deterministic booking field extractor on")
+    parser.add_argument("--live", action="store_true",
+                        help="Use the configured OpenAI model for classification/extraction (accuracy comparison)")
+    args = parser.parse_args()
+
+    # Isolate the effect of fusing LLM calls unless asked otherwise
+    settings.agent.fast_intent_enabled = args.fast_path
+    settings.agent.local_extraction_enabled = args.local_extraction
+
+    print(f"🏁 Fused intent + extraction benchmark ({'live LLM' if args.live else 'scripted LLM'})")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {
+            "two-call": run_mode(False, str(Path(tmp) / "two_call.db"), args.llm_latency, args.live),
+            "fused": run_mode(True, str(Path(tmp) / "fused.db"), args.llm_latency, args.live),
+        }
+
+    for mode, result in results.items():
+        calls = f"{result['llm_calls']} classify/extract calls | " if result["llm_calls"] is not None else ""
+        print(f"{mode:>8}: {calls}mean {result['mean_ms']:.0f} ms/turn | p95 {result['p95_ms']:.0f} ms | "
+              f"intent acc {result['intent_accuracy']:.0%} | field acc {result['field_accuracy']:.0%}")
+    saved = results["two-call"]["mean_ms"] - results["fused"]["mean_ms"]
+    print(f"Latency saved by fusing: {saved:.0f} ms/turn "
+          f"({saved / results['two-call']['mean_ms']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark per-turn overhead of compiling the graph on every run vs reusing it
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from benchmarks.fakes import use_fake_llms
+from src.agents import FlightAgent
+
+
+class RecompilingFlightAgent(FlightAgent):
+    """FlightAgent with the old behaviour: new connection, saver and compile on every turn."""
+
+    def compile_graph(self, file_path=None):
+        if file_path:
+            self.checkpoint_path = file_path
+        if self.graph is None:
+            self.graph = self.create_graph()
+        conn = sqlite3.connect(self.checkpoint_path, check_same_thread=False)
+        return self.graph.compile(checkpointer=SqliteSaver(conn))
+
+
+def make_agent(agent_cls, checkpoint_path: str) -> FlightAgent:
+    """Create an agent wired to fake LLMs."""
+    agent = use_fake_llms(agent_cls())
+    agent.compile_graph(file_path=checkpoint_path)
+    return agent
+
+
+def time_turns(agent: FlightAgent, turns: int) -> float:
+    """Average seconds per turn."""
+    start = time.perf_counter()
+    for i in range(turns):
+        response = agent.run("hello", thread_id=f"bench-{i % 10}", user_id="bench-user")
+        if not response.success:
+            raise RuntimeError(response.error)
+    return (time.perf_counter() - start) / turns
+
+
+def time_compile(agent: FlightAgent, iterations: int) -> float:
+    """Average seconds spent obtaining the compiled graph."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        agent.compile_graph()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Compiled graph reuse benchmark")
+    parser.add_argument("--turns", type=int, default=50, help="Turns per agent")
+    args = parser.parse_args()
+
+    print("🏁 Compiled graph reuse benchmark (fake LLM)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = make_agent(RecompilingFlightAgent, str(Path(tmp) / "legacy.db"))
+        cached = make_agent(FlightAgent, str(Path(tmp) / "cached.db"))
+
+        legacy_compile = time_compile(legacy, args.turns)
+        cached_compile = time_compile(cached, args.turns)
+        legacy_turn = time_turns(legacy, args.turns)
+        cached_turn = time_turns(cached, args.turns)
+        cached.close()
+
+    print(f"compile_graph(): recompiling {legacy_compile * 1000:.2f} ms | cached {cached_compile * 1000:.4f} ms")
+    print(f"Full turn:       recompiling {legacy_turn * 1000:.2f} ms | cached {cached_turn * 1000:.2f} ms")
+    print(f"Per-turn overhead removed: {(legacy_turn - cached_turn) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
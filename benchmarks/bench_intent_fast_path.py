@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark the rule-based intent fast path on a labeled EN/VI set
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.config import settings
+from src.utils import IntentClassification
+from src.utils.intent_rules import RuleBasedIntentClassifier
+
+# Pending booking contexts: the agent has asked for the first missing field
+BOOKING_CONTEXTS = {
+    "ask_departure": {},
+    "ask_arrival": {"departure_city": "Paris"},
+    "ask_round_trip": {"departure_city": "Paris", "arrival_city": "Tokyo"},
+    "ask_date": {"departure_city": "Paris", "arrival_city": "Tokyo", "round_trip": False},
+    "ask_passengers": {"departure_city": "Paris", "arrival_city": "Tokyo", "round_trip": False, "date": "2025-07-01"},
+    "ask_class": {"departure_city": "Paris", "arrival_city": "Tokyo", "round_trip": False, "date": "2025-07-01",
+                  "passengers": 1},
+    "ask_name": {"departure_city": "Paris", "arrival_city": "Tokyo", "round_trip": False, "date": "2025-07-01",
+                 "passengers": 1, "class_type": "economy"},
+    "ask_email": {"departure_city": "Paris", "arrival_city": "Tokyo", "round_trip": False, "date": "2025-07-01",
+                  "passengers": 1, "class_type": "economy", "passenger_name": "An Nguyen"},
+    "ask_return_date": {"departure_city": "Paris", "arrival_city": "Tokyo", "round_trip": True, "date": "2025-07-01",
+                        "passengers": 1, "class_type": "economy", "passenger_name": "An Nguyen",
+                        "email": "an@example.com"},
+}
+
+# (message, expected intent, pending context or None)
+LABELED_SET = [
+    # Greetings / small talk
+    ("Hello", "greeting", None),
+    ("hi there!", "greeting", None),
+    ("Good morning", "greeting", None),
+    ("Thanks so much", "greeting", None),
+    ("bye", "greeting", None),
+    ("Xin chào", "greeting", None),
+    ("chào bạn", "greeting", None),
+    ("Cảm ơn bạn nhiều", "greeting", None),
+    ("tạm biệt", "greeting", None),
+    # Keyword intents
+    ("What's the weather in Tokyo?", "check_weather", None),
+    ("Is it raining in London today", "check_weather", None),
+    ("Thời tiết ở Hà Nội thế nào?", "check_weather", None),
+    ("nhiệt độ ở Paris bao nhiêu", "check_weather", None),
+    ("Flight status of FL001", "flight_status", None),
+    ("Is flight FL002 delayed?", "flight_status", None),
+    ("tình trạng chuyến bay FL003", "flight_status", None),
+    ("Chuyến bay FL001 có bị trễ không", "flight_status", None),
+    ("I want to cancel my booking BK12345678", "cancel_booking", None),
+    ("Please cancel the reservation", "cancel_booking", None),
+    ("Tôi muốn hủy vé", "cancel_booking", None),
+    ("huỷ đặt chỗ BK1A2B3C4D giúp tôi", "cancel_booking", None),
+    ("Show me my booking details", "booking_info", None),
+    ("booking reference BK87654321", "booking_info", None),
+    ("tra cứu đặt chỗ của tôi", "booking_info", None),
+    ("Mã đặt chỗ BK11112222", "booking_info", None),
+    # Replies to the pending booking question
+    ("Paris", "book_flight", "ask_departure"),
+    ("Tokyo", "book_flight", "ask_arrival"),
+    ("Ho Chi Minh City", "book_flight", "ask_arrival"),
+    ("tomorrow", "book_flight", "ask_date"),
+    ("2025-07-15", "book_flight", "ask_date"),
+    ("ngày mai", "book_flight", "ask_date"),
+    ("ngày 20 tháng 7", "book_flight", "ask_date"),
+    ("2", "book_flight", "ask_passengers"),
+    ("three people", "book_flight", "ask_passengers"),
+    ("hai người", "book_flight", "ask_passengers"),
+    ("business", "book_flight", "ask_class"),
+    ("thương gia", "book_flight", "ask_class"),
+    ("Nguyen Van An", "book_flight", "ask_name"),
+    ("Tran Thi Binh", "book_flight", "ask_name"),
+    ("an.nguyen@example.com", "book_flight", "ask_email"),
+    ("yes", "book_flight", "ask_round_trip"),
+    ("một chiều", "book_flight", "ask_round_trip"),
+    ("khứ hồi", "book_flight", "ask_round_trip"),
+    ("July 10", "book_flight", "ask_return_date"),
+    # Topic switch while a question is pending
+    ("Actually, cancel my booking BK12345678", "cancel_booking", "ask_date"),
+    # Needs the LLM (complex or ambiguous)
+    ("Book a flight from Paris to Tokyo on July 1st for 2 people in business", "book_flight", None),
+    ("Find me flights from London to New York next week", "search_flights", None),
+    ("What is your baggage allowance policy?", "general_inquiry", None),
+    ("Tôi muốn đặt vé từ Hà Nội đi Đà Nẵng", "book_flight", None),
+    ("Can I bring my dog on the plane?", "general_inquiry", None),
+    ("Check weather in Tokyo and book a flight there", "book_flight", None),
+]
+
+
+def build_state(context: str):
+    """Build the graph state a message would be classified in."""
+    if context is None:
+        return {}
+    return {
+        "current_step": "collecting_info",
+        "booking_info": dict(BOOKING_CONTEXTS[context]),
+        "intent_classification": IntentClassification(
+            intent="book_flight",
+            confidence=0.9,
+            reasoning="User wants to book a flight from Paris to Tokyo.",
+            language="en"
+        )
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Intent fast path benchmark")
+    parser.add_argument("--llm-latency", type=float, default=0.8,
+                        help="Assumed seconds per LLM classification call")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing repetitions over the set")
+    args = parser.parse_args()
+
+    threshold = settings.agent.fast_intent_threshold
+    classifier = RuleBasedIntentClassifier()
+
+    print("🏁 Intent fast path benchmark")
+    print("=" * 50)
+
+    correct = 0
+    wrong = []
+    paths = Counter()
+    for text, expected, context in LABELED_SET:
+        result = classifier.classify(text, build_state(context))
+        if result is None or result["confidence"] < threshold:
+            paths["llm_fallback"] += 1
+            continue
+        paths[result["path"]] += 1
+        if result["intent"] == expected:
+            correct += 1
+        else:
+            wrong.append((text, expected, result["intent"]))
+
+    states = [(text, build_state(context)) for text, _, context in LABELED_SET]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text, state in states:
+            classifier.classify(text, state)
+    per_call = (time.perf_counter() - start) / (args.repeat * len(states))
+
+    total = len(LABELED_SET)
+    handled = total - paths["llm_fallback"]
+    print(f"Labeled messages: {total} | threshold: {threshold}")
+    print(f"Fast path hit rate: {handled / total:.1%} "
+          f"(greeting {paths['greeting']}, keyword {paths['keyword']}, pending answer {paths['pending_answer']}, "
+          f"LLM fallback {paths['llm_fallback']})")
+    print(f"Fast path precision: {correct / handled:.1%}" if handled else "Fast path precision: n/a")
+    for text, expected, got in wrong:
+        print(f"  ✗ {text!r}: expected {expected}, got {got}")
+    print(f"Rule classification cost: {per_call * 1e6:.1f} µs/message")
+    print(f"Estimated classification latency saved: "
+          f"{handled * args.llm_latency / total * 1000:.0f} ms/turn on average "
+          f"(assuming {args.llm_latency * 1000:.0f} ms per LLM call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark multi-leg itinerary search over a generated schedule and check it against exhaustive enumeration
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.utils.flight_inventory import FlightInventory
+from src.utils.itinerary_search import ItinerarySearch, MINUTES_PER_DAY
+from src.utils.schedule_generator import ScheduleGenerator
+
+START = date(2025, 7, 1)
+
+
+def percentile(values, fraction: float) -> float:
+    """Percentile of a sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def exhaustive(search: ItinerarySearch, departure: str, arrival: str, max_legs: int, objective: str, k: int):
+    """Top-k costs by enumerating every path (reference for the best-first search)."""
+    days = [search._days[flight_date] for flight_date in sorted(search._days)]
+    target = arrival.casefold()
+    costs = []
+
+    def extend(path, airport, arrived, visited):
+        if airport == target:
+            first_departure = path[0][1][0]
+            costs.append(round(sum(leg[5] for _, leg in path), 2) if objective == "price" else arrived - first_departure)
+            return
+        if len(path) == max_legs:
+            return
+        low, high = (arrived + search.min_connection_minutes, arrived + search.max_connection_minutes) if path else (0, MINUTES_PER_DAY - 1)
+        for offset in range(low // MINUTES_PER_DAY, min(high // MINUTES_PER_DAY, len(days) - 1) + 1):
+            for leg in days[offset].departures.get(airport, ([], []))[1]:
+                departed = offset * MINUTES_PER_DAY + leg[0]
+                if low <= departed <= high and leg[4].casefold() not in visited:
+                    extend(path + [(offset, leg)], leg[4].casefold(), offset * MINUTES_PER_DAY + leg[1],
+                           visited | {leg[4].casefold()})
+
+    extend([], departure.casefold(), 0, {departure.casefold()})
+    return sorted(costs)[:k]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Itinerary search benchmark")
+    parser.add_argument("--airports", type=int, default=2000, help="Airports to generate")
+    parser.add_argument("--days", type=int, default=7, help="Days of flights to load")
+    parser.add_argument("--queries", type=int, default=500, help="Random searches per configuration")
+    parser.add_argument("--verify", type=int, default=50, help="Searches to check against exhaustive enumeration")
+    parser.add_argument("-k", type=int, default=5, help="Itineraries per search")
+    args = parser.parse_args()
+
+    print("🏁 Itinerary search benchmark")
+    print("=" * 50)
+
+    generator = ScheduleGenerator(airports=args.airports, horizon_days=args.days, start_date=START)
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = FlightInventory(str(Path(tmp) / "inventory.db"))
+        counts = generator.load(inventory)
+        search = ItinerarySearch(inventory)
+
+        start = time.perf_counter()
+        search.search(generator.cities[0], generator.cities[1], START.isoformat())
+        index_elapsed = time.perf_counter() - start
+        indexed = sum(len(day) for day in search._days.values())
+
+        print(f"Inventory: {len(generator.airports()):,} airports, {counts['flights']:,} dated flights")
+        print(f"Day indexes built once: {len(search._days)} days, {indexed:,} flights in {index_elapsed:.2f}s")
+
+        names = [airport.name for airport in generator.airports()]
+        rng = random.Random(3)
+        for max_legs in (2, 3):
+            for objective in ("price", "duration"):
+                pairs = [rng.sample(names, 2) for _ in range(args.queries)]
+                latencies = []
+                found = 0
+                for departure, arrival in pairs:
+                    start = time.perf_counter()
+                    itineraries = search.search(departure, arrival, START.isoformat(), max_legs=max_legs,
+                                                k=args.k, objective=objective)
+                    latencies.append(time.perf_counter() - start)
+                    found += len(itineraries)
+                latencies.sort()
+
+                mismatches = 0
+                for departure, arrival in pairs[:args.verify]:
+                    itineraries = search.search(departure, arrival, START.isoformat(), max_legs=max_legs,
+                                                k=args.k, objective=objective)
+                    got = [itinerary["total_price"] if objective == "price" else itinerary["duration_minutes"]
+                           for itinerary in itineraries]
+                    mismatches += got != exhaustive(search, departure, arrival, max_legs, objective, args.k)
+
+                print(f"{max_legs - 1} stop(s) max, by {objective:<8}: p50 {percentile(latencies, 0.5) * 1e3:.2f} ms | "
+                      f"p99 {percentile(latencies, 0.99) * 1e3:.2f} ms | {found / len(pairs):.1f} itineraries/search | "
+                      f"top-{args.k} exact on {args.verify - mismatches}/{args.verify}")
+        inventory.close()
+
+
+if __name__ == "__main__":
+    main()
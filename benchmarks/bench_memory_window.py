@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark prompt and checkpoint size over a long conversation with and without the token-budgeted memory window
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.fakes import ScriptedChatModel, INTENT_JSON
+from src.agents import FlightAgent
+from src.config import settings
+from src.utils.conversation_memory import conversation_memory
+
+QUESTIONS = [
+    "What is the baggage allowance on long-haul flights to Tokyo?",
+    "Can I change my seat after booking, and is there a fee for business class?",
+    "Which airlines fly from Paris to Seoul with the shortest layover?",
+    "Do you offer special meals for vegetarian passengers on international routes?",
+]
+
+
+class RecordingChatModel(ScriptedChatModel):
+    """Scripted model recording the prompt size of every call; answers summaries and intents by system prompt."""
+
+    prompt_tokens: List[int] = []
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        system = str(messages[0].content) if messages else ""
+        if "memory of a flight booking conversation" in system or "summarizing conversations" in system:
+            content = "The user asked about baggage, seats, routes and meals; no booking yet."
+        elif "intent classifier" in system:
+            content = INTENT_JSON.replace("greeting", "general_inquiry")
+        else:
+            self.prompt_tokens.append(conversation_memory.count_tokens(messages))
+            content = "Here is a detailed answer about your question, covering the policy, fees and options. " * 4
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def checkpoint_bytes(path: str, thread_id: str) -> int:
+    """Size of the thread's latest checkpoint blob."""
+    with sqlite3.connect(path) as conn:
+        row = conn.execute("SELECT length(checkpoint) FROM checkpoints WHERE thread_id = ? "
+                           "ORDER BY checkpoint_id DESC LIMIT 1", (thread_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def run_mode(enabled: bool, turns: int, tmp: str) -> dict:
+    """Drive one long conversation and sample prompt and checkpoint size."""
+    settings.memory.enabled = enabled
+    path = str(Path(tmp) / f"checkpoints_{enabled}.db")
+    agent = FlightAgent()
+    model = RecordingChatModel(responses=[""], prompt_tokens=[])
+    agent.llm = agent.processed_llm = model
+    agent.compile_graph(file_path=path)
+
+    samples = []
+    start = time.perf_counter()
+    for turn in range(1, turns + 1):
+        agent.run(QUESTIONS[turn % len(QUESTIONS)], thread_id="long-thread", user_id="bench-user")
+        if turn % (turns // 5) == 0:
+            samples.append((turn, model.prompt_tokens[-1], checkpoint_bytes(path, "long-thread")))
+    elapsed = time.perf_counter() - start
+    agent.close()
+    return {"samples": samples, "ms_per_turn": elapsed / turns * 1e3}
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Memory window benchmark")
+    parser.add_argument("--turns", type=int, default=100, help="Turns in the conversation")
+    args = parser.parse_args()
+
+    print("🏁 Memory window benchmark")
+    print(f"   window: {settings.memory.max_turns} turns / {settings.memory.max_tokens} tokens, "
+          f"folded down to {settings.memory.keep_turns} turns")
+    print("=" * 50)
+
+    settings.agent.fast_intent_enabled = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, enabled in [("full history", False), ("memory window", True)]:
+            folds = conversation_memory.stats["folds"]
+            result = run_mode(enabled, args.turns, tmp)
+            print(f"{label} ({result['ms_per_turn']:.1f} ms/turn, {conversation_memory.stats['folds'] - folds} folds):")
+            for turn, tokens, size in result["samples"]:
+                print(f"  turn {turn:4d}: prompt {tokens:6d} tokens | checkpoint {size / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
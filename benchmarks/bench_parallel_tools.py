@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs concurrent tool calls in process_booking with simulated tool latencies
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.tools import tool
+
+from src.config import ToolExecutionConfig
+from src.utils.tool_executor import ToolExecutor
+
+RNG = random.Random(3)
+
+
+def latency(mean: float) -> float:
+    """Long-tailed latency: mostly near the mean, sometimes 5x slower."""
+    return mean * (5 if RNG.random() < 0.05 else RNG.uniform(0.5, 1.5))
+
+
+@tool
+def get_weather(city: str) -> str:
+    """Simulated remote weather lookup."""
+    time.sleep(latency(0.08))
+    return f"Sunny in {city}"
+
+
+@tool
+def search_flights(departure_city: str, arrival_city: str, date: str) -> str:
+    """Simulated flight search."""
+    time.sleep(latency(0.05))
+    return f"3 flights {departure_city} -> {arrival_city} on {date}"
+
+
+@tool
+def get_flight_status(flight_number: str) -> str:
+    """Simulated status lookup that sometimes fails."""
+    time.sleep(latency(0.03))
+    if RNG.random() < 0.1:
+        raise RuntimeError("status service unavailable")
+    return f"{flight_number} on time"
+
+
+@tool
+def book_flight(flight_number: str) -> str:
+    """Simulated booking (state-changing, always run alone)."""
+    time.sleep(latency(0.04))
+    return f"Booked {flight_number}"
+
+
+@tool
+def hang(seconds: float) -> str:
+    """Tool that never answers in time."""
+    time.sleep(seconds)
+    return "late"
+
+
+def make_turns(count: int):
+    """Tool calls of typical multi-tool replies (weather at both ends + search, status checks, a booking)."""
+    turns = []
+    for i in range(count):
+        turns.append([
+            (get_weather, {"city": "Hanoi"}),
+            (get_weather, {"city": "Tokyo"}),
+            (search_flights, {"departure_city": "Hanoi", "arrival_city": "Tokyo", "date": "2025-07-01"}),
+            (get_flight_status, {"flight_number": f"FL00{i % 5 + 1}"}),
+        ] + ([(book_flight, {"flight_number": "FL001"})] if i % 4 == 0 else []))
+    return turns
+
+
+def percentile(values, fraction: float) -> float:
+    """Percentile of a sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(label: str, latencies, baseline=None):
+    latencies.sort()
+    line = f"{label:<22} p50 {percentile(latencies, 0.5) * 1e3:6.1f} ms | p99 {percentile(latencies, 0.99) * 1e3:6.1f} ms"
+    if baseline:
+        line += f" | {percentile(baseline, 0.5) / percentile(latencies, 0.5):.1f}x faster at p50"
+    print(line)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Concurrent tool call benchmark")
+    parser.add_argument("--turns", type=int, default=100, help="Multi-tool turns to run")
+    parser.add_argument("--workers", type=int, default=8, help="Thread pool size")
+    args = parser.parse_args()
+
+    print("🏁 Concurrent tool call benchmark")
+    print("=" * 50)
+
+    turns = make_turns(args.turns)
+    results = {}
+    for label, parallel in [("sequential", False), ("thread pool", True)]:
+        executor = ToolExecutor(ToolExecutionConfig(parallel=parallel, max_workers=args.workers))
+        latencies = []
+        for calls in turns:
+            start = time.perf_counter()
+            outcome = executor.run(calls)
+            latencies.append(time.perf_counter() - start)
+            assert [r.name for r in outcome] == [t.name for t, _ in calls]
+        results[label] = latencies
+        report(label, latencies, results.get("sequential") if parallel else None)
+        stats = executor.get_stats()
+        print(f"{'':<22} {stats['calls']} calls, {stats['errors']} isolated errors")
+        executor.shutdown()
+
+    async def run_async(executor):
+        latencies = []
+        for calls in turns:
+            start = time.perf_counter()
+            await executor.arun(calls)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    executor = ToolExecutor(ToolExecutionConfig(parallel=True))
+    report("asyncio.gather", asyncio.run(run_async(executor)), results["sequential"])
+
+    # A hung tool only costs its own timeout; the other calls still answer
+    executor = ToolExecutor(ToolExecutionConfig(parallel=True, timeouts={"hang": 0.2}))
+    start = time.perf_counter()
+    outcome = executor.run([(hang, {"seconds": 2}), (get_weather, {"city": "Paris"})])
+    print(f"Hung tool with 0.2 s timeout: turn took {(time.perf_counter() - start) * 1e3:.0f} ms | "
+          f"hang -> {outcome[0].error!r} | get_weather -> {outcome[1].result!r}")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-node prompt/chain construction: rebuilt on every call vs built once and reused
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.messages import HumanMessage
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from benchmarks.fakes import ScriptedChatModel
+from src.agents import FlightAgent
+from src.agents import enhanced_agent
+from src.utils import IntentClassification
+
+STATE = {
+    "messages": [HumanMessage(content="Book a flight from Paris to Tokyo on 2025-07-01")],
+    "booking_info": {"departure_city": "Paris", "arrival_city": "Tokyo", "date": "2025-07-01", "round_trip": False},
+    "intent_classification": IntentClassification(intent="book_flight", confidence=0.95, reasoning="", language="en"),
+}
+
+
+def raw_messages(prompt: ChatPromptTemplate):
+    """(role, template) pairs of a prompt, as the nodes used to pass them to from_messages."""
+    messages = []
+    for message in prompt.messages:
+        if isinstance(message, MessagesPlaceholder):
+            messages.append(message)
+        else:
+            role = "system" if "System" in type(message).__name__ else "user"
+            messages.append((role, message.prompt.template))
+    return messages
+
+
+def rebuild_booking(agent: FlightAgent, state: dict):
+    """Previous process_booking: format every intent's system prompt, then build the prompt and chain."""
+    context = agent._booking_context(state)
+    system_prompts = {intent: template.format(**context)
+                      for intent, template in enhanced_agent.BOOKING_SYSTEM_PROMPTS.items()}
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompts[state["intent_classification"].intent].replace("{", "{{").replace("}", "}}")),
+        MessagesPlaceholder(variable_name="messages")
+    ])
+    return prompt | agent.tool_registry.bound_llm(agent.llm, "book_flight")
+
+
+def timed(function, repeat: int) -> float:
+    """Mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Prompt precompilation benchmark")
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    print("🏁 Prompt precompilation benchmark")
+    print("=" * 50)
+
+    agent = FlightAgent()
+    agent.llm = agent.processed_llm = ScriptedChatModel(responses=["{}"])
+    llm = agent.processed_llm
+    rebuilt = {
+        "classify_intent": lambda: ChatPromptTemplate.from_messages(raw_messages(enhanced_agent.INTENT_PROMPT))
+        | llm | JsonOutputParser(pydantic_object=IntentClassification),
+        "classify_and_extract": lambda: ChatPromptTemplate.from_messages(raw_messages(enhanced_agent.FUSED_PROMPT))
+        | llm | agent.fused_parser,
+        "collect_info": lambda: ChatPromptTemplate.from_messages(raw_messages(enhanced_agent.EXTRACTION_PROMPT))
+        | llm | JsonOutputParser(),
+        "summarize": lambda: ChatPromptTemplate.from_messages(raw_messages(enhanced_agent.SUMMARY_PROMPT)) | llm,
+        "process_booking": lambda: rebuild_booking(agent, STATE),
+    }
+    cached = {
+        "classify_intent": agent._intent_chain,
+        "classify_and_extract": agent._fused_chain,
+        "collect_info": agent._extraction_chain,
+        "summarize": agent._summary_chain,
+        "process_booking": lambda: (agent._booking_chain(STATE), agent._booking_context(STATE)),
+    }
+
+    total_before = total_after = 0.0
+    for node in rebuilt:
+        before = timed(rebuilt[node], args.repeat)
+        after = timed(cached[node], args.repeat)
+        total_before += before
+        total_after += after
+        print(f"{node:<22} rebuilt {before:7.1f} µs | precompiled {after:5.1f} µs | saved {before - after:7.1f} µs/call")
+    print(f"{'all nodes':<22} rebuilt {total_before:7.1f} µs | precompiled {total_after:5.1f} µs "
+          f"({total_before / total_after:.0f}x less construction overhead)")
+
+
+if __name__ == "__main__":
+    main()
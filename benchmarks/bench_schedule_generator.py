@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark synthetic schedule generation, bulk loading and search over the generated inventory
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.utils.flight_inventory import FlightInventory
+from src.utils.schedule_generator import ScheduleGenerator
+
+
+def percentile(values, fraction: float) -> float:
+    """Percentile of a sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Schedule generator benchmark")
+    parser.add_argument("--airports", type=int, default=2000, help="Airports to generate")
+    parser.add_argument("--routes", type=int, default=6, help="Routes per airport")
+    parser.add_argument("--days", type=int, default=60, help="Horizon in days")
+    parser.add_argument("--lookups", type=int, default=5000, help="Route searches to time")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    print("🏁 Schedule generator benchmark")
+    print("=" * 50)
+
+    generator = ScheduleGenerator(airports=args.airports, routes_per_airport=args.routes,
+                                  horizon_days=args.days, seed=args.seed)
+    start = time.perf_counter()
+    schedules = generator.schedules()
+    schedule_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generated = sum(1 for _ in generator.flights())
+    generate_elapsed = time.perf_counter() - start
+
+    # Same seed, same data
+    first = [row for _, row in zip(range(1000), generator.flights())]
+    again = ScheduleGenerator(airports=args.airports, routes_per_airport=args.routes, horizon_days=args.days,
+                              start_date=generator.start_date, seed=args.seed)
+    deterministic = first == [row for _, row in zip(range(1000), again.flights())]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = FlightInventory(str(Path(tmp) / "inventory.db"))
+        start = time.perf_counter()
+        counts = generator.load(inventory)
+        load_elapsed = time.perf_counter() - start
+        db_size = sum(f.stat().st_size for f in Path(tmp).iterdir())
+
+        rng = random.Random(1)
+        samples = [rng.choice(schedules) for _ in range(args.lookups)]
+        dates = [(generator.start_date + timedelta(days=rng.randrange(args.days))).isoformat() for _ in samples]
+        latencies = []
+        found = 0
+        for schedule, flight_date in zip(samples, dates):
+            start = time.perf_counter()
+            flights = inventory.search_flights(schedule.departure, schedule.arrival, flight_date)
+            latencies.append(time.perf_counter() - start)
+            found += bool(flights)
+        latencies.sort()
+        inventory.close()
+
+    print(f"Airports: {len(generator.airports()):,} | routes: {len(generator.routes()):,} | "
+          f"schedules: {len(schedules):,}")
+    print(f"Schedules built in {schedule_elapsed:.2f}s")
+    print(f"Generated {generated:,} dated flights over {args.days} days in {generate_elapsed:.2f}s "
+          f"({generated / generate_elapsed:,.0f} rows/sec)")
+    print(f"Bulk load (generate + insert + index): {counts['flights']:,} flights in {load_elapsed:.2f}s "
+          f"({counts['flights'] / load_elapsed:,.0f} rows/sec), {db_size / 1e6:.0f} MB on disk")
+    print(f"Deterministic for seed {args.seed}: {deterministic}")
+    print(f"search_flights: p50 {percentile(latencies, 0.5) * 1e6:.0f} µs | "
+          f"p99 {percentile(latencies, 0.99) * 1e6:.0f} µs, {found}/{args.lookups} routes with flights that day")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Load generator for the HTTP/SSE server: p50/p99 latency of run and stream turns, and 429 shedding under overload
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+import httpx
+
+from benchmarks.fakes import use_fake_llms
+from src.agents import FlightAgent
+from src.config import settings, ServerConfig
+from src.server import create_app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    """In-process uvicorn server on a background thread, serving an agent with fake LLMs."""
+
+    def __init__(self, config: ServerConfig, latency: float, checkpoint_path: str):
+        import uvicorn
+
+        agent = use_fake_llms(FlightAgent(), latency=latency)
+        agent.checkpoint_path = checkpoint_path
+        self.app = create_app(agent, config)
+        self.port = free_port()
+        self.server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        # Graceful shutdown: uvicorn stops accepting, then the app drains and closes the agent
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1e3 if values else 0.0
+
+
+async def run_turn(client: httpx.AsyncClient, url: str, thread_id: str, message: str) -> dict:
+    start = time.perf_counter()
+    response = await client.post(f"{url}/threads/{thread_id}/run", json={"message": message, "user_id": "load-user"})
+    return {"kind": "run", "status": response.status_code, "latency": time.perf_counter() - start, "first": None}
+
+
+async def stream_turn(client: httpx.AsyncClient, url: str, thread_id: str, message: str) -> dict:
+    start = time.perf_counter()
+    first = None
+    async with client.stream("POST", f"{url}/threads/{thread_id}/stream",
+                             json={"message": message, "user_id": "load-user"}) as response:
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                if first is None:
+                    first = time.perf_counter() - start
+                if json.loads(line[6:]).get("type") == "done":
+                    break
+    return {"kind": "stream", "status": response.status_code, "latency": time.perf_counter() - start, "first": first}
+
+
+async def virtual_user(client: httpx.AsyncClient, url: str, user: int, turns: int, results: list):
+    """One conversation; turns alternate between run and stream."""
+    thread_id = f"load-{uuid.uuid4().hex[:8]}-{user}"
+    for turn in range(turns):
+        message = "Hello, what can you help me with?" if turn == 0 else f"Tell me more ({turn})"
+        call = run_turn if turn % 2 == 0 else stream_turn
+        results.append(await call(client, url, thread_id, message))
+
+
+async def generate_load(url: str, users: int, turns: int) -> dict:
+    results = []
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(client, url, user, turns, results) for user in range(users)))
+        elapsed = time.perf_counter() - start
+        stats = (await client.get(f"{url}/stats")).json()
+    return {"results": results, "elapsed": elapsed, "server": stats}
+
+
+def report(label: str, load: dict):
+    results = load["results"]
+    ok = [r for r in results if r["status"] == 200]
+    shed = [r for r in results if r["status"] == 429]
+    print(f"{label}: {len(results)} requests in {load['elapsed']:.2f} s "
+          f"({len(ok) / load['elapsed']:.1f} turns/s), {len(shed)} shed with 429, "
+          f"{len(results) - len(ok) - len(shed)} other errors")
+    for kind in ["run", "stream"]:
+        latencies = [r["latency"] for r in ok if r["kind"] == kind]
+        line = f"  {kind:<6} p50 {percentile(latencies, 0.5):7.1f} ms | p99 {percentile(latencies, 0.99):7.1f} ms"
+        if kind == "stream":
+            line += f" | first event p50 {percentile([r['first'] for r in ok if r['kind'] == kind], 0.5):7.1f} ms"
+        print(line)
+    if shed:
+        print(f"  429    p50 {percentile([r['latency'] for r in shed], 0.5):7.1f} ms")
+
+
+def main():
+    """Run the load generator."""
+    parser = argparse.ArgumentParser(description="HTTP/SSE server load generator")
+    parser.add_argument("--url", default=None, help="Server to load (default: an in-process server with fake LLMs)")
+    parser.add_argument("--users", type=int, default=32, help="Concurrent conversations")
+    parser.add_argument("--turns", type=int, default=6, help="Turns per conversation")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency (seconds)")
+    args = parser.parse_args()
+
+    print("🏁 Server load benchmark")
+    print(f"   {args.users} concurrent conversations x {args.turns} turns (run/stream alternating)")
+    print("=" * 50)
+
+    if args.url:
+        report(args.url, asyncio.run(generate_load(args.url, args.users, args.turns)))
+        return
+
+    settings.agent.fast_intent_enabled = False
+    print(f"   in-process server, fake LLM latency {args.latency * 1e3:.0f} ms")
+    scenarios = [
+        ("sized for the load", dataclasses.replace(settings.server, max_concurrency=args.users, max_queue=args.users)),
+        ("overloaded (4 slots, 4 queued)", dataclasses.replace(settings.server, max_concurrency=4, max_queue=4,
+                                                                queue_timeout=1.0)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (label, config) in enumerate(scenarios):
+            with LocalServer(config, args.latency, str(Path(tmp) / f"checkpoints_{index}.db")) as server:
+                load = asyncio.run(generate_load(server.url, args.users, args.turns))
+            report(label, load)
+            print(f"  server: {load['server']['completed']} completed, {load['server']['shed']} shed, "
+                  f"drained={server.app.draining}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark streamed events of a turn: 4-character question pieces and one event per token vs the coalescing StreamEmitter
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from benchmarks.bench_token_streaming import ANSWER
+from src.config import settings
+from src.utils.models import QuestionTemplates
+from src.utils.stream_emitter import StreamEmitter
+
+
+class Consumer:
+    """Stream consumer serializing events as server-sent events; ``delay`` simulates a slow client."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.events = 0
+        self.wire_bytes = 0
+        self.text = ""
+
+    def __call__(self, event: dict):
+        frame = f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8")
+        self.events += 1
+        self.wire_bytes += len(frame)
+        self.text += event["content"]
+        if self.delay:
+            time.sleep(self.delay)
+
+
+def question_text() -> str:
+    """Vietnamese questions asked while collecting booking information, then the completion message."""
+    templates = QuestionTemplates()
+    fields = ["departure_city", "arrival_city", "date", "passenger_name", "email", "class_type"]
+    return [templates.get_question(field, "vi") for field in fields] + [templates.get_completion_message("vi")]
+
+
+def stream_per_piece(consumer: Consumer, token_gap: float):
+    """Previous behavior: questions in 4-character pieces, one event per LLM token."""
+    for question in question_text():
+        for i in range(0, len(question), 4):
+            consumer({"type": "question_chunk", "content": question[i:i + 4]})
+    for word in ANSWER.split(" "):
+        time.sleep(token_gap)
+        consumer({"type": "answer_chunk", "content": word + " "})
+
+
+def stream_coalesced(consumer: Consumer, token_gap: float):
+    """StreamEmitter per streamed message, as collect_info and process_booking use it."""
+    for question in question_text():
+        emitter = StreamEmitter(consumer, "question_chunk")
+        emitter.write(question)
+        emitter.flush()
+    emitter = StreamEmitter(consumer, "answer_chunk")
+    for word in ANSWER.split(" "):
+        time.sleep(token_gap)
+        emitter.write(word + " ")
+    emitter.flush()
+
+
+def measure(stream: Callable[[Consumer, float], None], delay: float, token_gap: float) -> dict:
+    consumer = Consumer(delay)
+    start = time.perf_counter()
+    stream(consumer, token_gap)
+    elapsed = time.perf_counter() - start
+    return {"events": consumer.events, "wire_bytes": consumer.wire_bytes, "elapsed": elapsed,
+            "events_per_sec": consumer.events / elapsed, "text": consumer.text}
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Stream coalescing benchmark")
+    parser.add_argument("--token-ms", type=float, default=5, help="Gap between LLM tokens")
+    parser.add_argument("--slow-ms", type=float, default=5, help="Per-event cost of the slow consumer")
+    args = parser.parse_args()
+
+    print("🏁 Stream coalescing benchmark")
+    print(f"   7 Vietnamese questions + {len(ANSWER.split())}-token answer ({args.token_ms:.0f} ms/token); "
+          f"chunks {settings.streaming.min_chunk_bytes}-{settings.streaming.max_chunk_bytes} bytes, "
+          f"{settings.streaming.flush_interval * 1e3:.0f} ms window")
+    print("=" * 50)
+
+    for consumer_label, delay in [("fast consumer", 0.0), (f"slow consumer ({args.slow_ms:.0f} ms/event)", args.slow_ms / 1e3)]:
+        print(f"{consumer_label}:")
+        results = []
+        for label, stream in [("per piece/token", stream_per_piece), ("coalesced", stream_coalesced)]:
+            result = measure(stream, delay, args.token_ms / 1e3)
+            results.append(result)
+            print(f"  {label:<16} {result['events']:4d} events | {result['wire_bytes']:6d} bytes on wire | "
+                  f"{result['events_per_sec']:7.0f} events/s | turn {result['elapsed'] * 1e3:6.1f} ms")
+        assert results[0]["text"] == results[1]["text"], "coalesced text differs"
+        print(f"  {1 - results[1]['events'] / results[0]['events']:.0%} fewer events, "
+              f"{1 - results[1]['wire_bytes'] / results[0]['wire_bytes']:.0%} fewer bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-first-token of a process_booking answer: complete reply only vs answer_chunk token streaming
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from statistics import median
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from benchmarks.fakes import ScriptedChatModel, INTENT_JSON
+from src.agents import FlightAgent
+from src.config import settings
+
+ANSWER = ("It is sunny in Tokyo today with a light breeze, so it is a great day to fly. "
+          "Pack a light jacket for the evening and let me know if you want me to search flights for you. ") * 2
+
+
+class StreamingToolModel(ScriptedChatModel):
+    """Fake booking LLM: calls get_weather, then streams the answer word by word.
+
+    ``latency`` is the time to the first token, ``token_latency`` the time per following token.
+    """
+
+    token_latency: float = 0.01
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[AIMessageChunk]:
+        if not isinstance(messages[-1], ToolMessage):
+            return [AIMessageChunk(content="", tool_call_chunks=[{
+                "name": "get_weather", "args": json.dumps({"city": "Tokyo"}), "id": "call_weather", "index": 0}])]
+        words = ANSWER.split(" ")
+        return [AIMessageChunk(content=word + " ") for word in words]
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        for index, chunk in enumerate(self._chunks(messages)):
+            if index:
+                time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        for index, chunk in enumerate(self._chunks(messages)):
+            if index:
+                await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=chunk)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = None
+        for chunk in self._stream(messages):
+            message = chunk.message if message is None else message + chunk.message
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(
+            content=message.content, tool_calls=message.tool_calls))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def timed_run(agent: FlightAgent, text: str, thread_id: str) -> dict:
+    """Complete reply: the answer is visible once the turn returns."""
+    start = time.perf_counter()
+    response = agent.run(text, thread_id=thread_id, user_id="bench-user")
+    elapsed = time.perf_counter() - start
+    return {"ttft": elapsed, "total": elapsed, "answer": response.response}
+
+
+def timed_stream(agent: FlightAgent, text: str, thread_id: str) -> dict:
+    """Streamed reply: the answer is visible from the first answer_chunk."""
+    start = time.perf_counter()
+    first, answer = None, ""
+    for chunk in agent.stream(text, thread_id=thread_id, user_id="bench-user"):
+        if chunk.get("type") == "answer_chunk":
+            if first is None:
+                first = time.perf_counter() - start
+            answer += chunk["content"]
+    return {"ttft": first, "total": time.perf_counter() - start, "answer": answer}
+
+
+async def atimed_stream(agent: FlightAgent, text: str, thread_id: str) -> dict:
+    """Async streamed reply."""
+    start = time.perf_counter()
+    first, answer = None, ""
+    async for chunk in agent.astream(text, thread_id=thread_id, user_id="bench-user"):
+        if chunk.get("type") == "answer_chunk":
+            if first is None:
+                first = time.perf_counter() - start
+            answer += chunk["content"]
+    return {"ttft": first, "total": time.perf_counter() - start, "answer": answer}
+
+
+def report(label: str, results: List[dict]):
+    print(f"{label:<22} TTFT p50 {median(r['ttft'] for r in results) * 1e3:7.1f} ms | "
+          f"complete p50 {median(r['total'] for r in results) * 1e3:7.1f} ms")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Token streaming benchmark")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per mode")
+    parser.add_argument("--first-token-ms", type=float, default=300, help="Simulated time to the first token")
+    parser.add_argument("--token-ms", type=float, default=10, help="Simulated time per following token")
+    args = parser.parse_args()
+
+    print("🏁 Token streaming benchmark")
+    print(f"   get_weather tool call, then a {len(ANSWER.split())}-word answer; "
+          f"{args.first_token_ms:.0f} ms to first token, {args.token_ms:.0f} ms/token")
+    print("=" * 50)
+
+    settings.agent.fast_intent_enabled = False
+    agent = FlightAgent()
+    agent.llm = StreamingToolModel(responses=[""], latency=args.first_token_ms / 1e3, token_latency=args.token_ms / 1e3)
+    agent.processed_llm = ScriptedChatModel(responses=[INTENT_JSON.replace("greeting", "general_inquiry")])
+    text = "What's the weather in Tokyo today?"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agent.checkpoint_path = str(Path(tmp) / "checkpoints.db")
+        runs = [timed_run(agent, text, f"run-{i}") for i in range(args.turns)]
+        streams = [timed_stream(agent, text, f"stream-{i}") for i in range(args.turns)]
+
+        async def astreams():
+            results = [await atimed_stream(agent, text, f"astream-{i}") for i in range(args.turns)]
+            await agent.aclose()
+            return results
+        async_streams = asyncio.run(astreams())
+        agent.close()
+
+    report("complete reply (run)", runs)
+    report("streamed (stream)", streams)
+    report("streamed (astream)", async_streams)
+    assert streams[-1]["answer"].strip() == runs[-1]["answer"].strip(), "streamed answer differs from the reply"
+    print(f"first token {median(r['ttft'] for r in runs) / median(r['ttft'] for r in streams):.1f}x sooner")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tool result cache on a skewed stream of repeated searches, weather and status lookups
+"""
+
+import argparse
+import importlib
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from src.utils.flight_inventory import FlightInventory
+from src.utils.tool_cache import tool_cache, route_tag
+
+flight_tools = importlib.import_module("src.tools.flight_tools")
+
+CITIES = ["New York", "London", "Paris", "Tokyo", "Sydney", "Seoul", "Berlin", "Rome", "Hanoi", "Bangkok",
+          "Singapore", "Dubai", "Madrid", "Toronto", "Lima", "Cairo"]
+DATES = [f"2025-07-{day:02d}" for day in range(1, 15)]
+
+
+def make_calls(count: int, seed: int = 11):
+    """Zipf-skewed tool calls with the casing/spacing variations users type."""
+    rng = random.Random(seed)
+    routes = [(a, b) for a in CITIES for b in CITIES if a != b]
+    route_weights = [1 / (rank + 1) for rank in range(len(routes))]
+    city_weights = [1 / (rank + 1) for rank in range(len(CITIES))]
+    calls = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            departure, arrival = rng.choices(routes, weights=route_weights)[0]
+            calls.append((flight_tools.search_flights, {
+                "departure_city": rng.choice([departure, departure.lower(), f" {departure} "]),
+                "arrival_city": rng.choice([arrival, arrival.upper()]),
+                "date": rng.choice(DATES[:4]) if rng.random() < 0.8 else rng.choice(DATES),
+                "passengers": rng.choice([1, 1, 1, 2]),
+                "class_type": rng.choice(["economy", "economy", "Economy", "business"])
+            }))
+        elif kind < 0.85:
+            calls.append((flight_tools.get_weather, {"city": rng.choices(CITIES, weights=city_weights)[0]}))
+        else:
+            calls.append((flight_tools.get_flight_status, {"flight_number": rng.choice(["FL001", "fl001", "FL003", "FL004"])}))
+    return calls
+
+
+def run(calls):
+    """Run every tool body (the cached function); returns latencies and random-tool answers per question."""
+    latencies = []
+    answers = {}
+    for tool, arguments in calls:
+        start = time.perf_counter()
+        answer = tool.func(**arguments)
+        latencies.append(time.perf_counter() - start)
+        if tool.name != "search_flights":
+            question = (tool.name,) + tuple(str(value).strip().casefold() for value in arguments.values())
+            answers.setdefault(question, set()).add(answer)
+    latencies.sort()
+    return latencies, answers
+
+
+def percentile(values, fraction: float) -> float:
+    """Percentile of a sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Tool result cache benchmark")
+    parser.add_argument("--calls", type=int, default=5000, help="Tool calls to replay")
+    parser.add_argument("--small-cache", type=int, default=64, help="Capacity for the eviction run")
+    args = parser.parse_args()
+
+    print("🏁 Tool result cache benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Tools on a scratch inventory, with the same seat invalidation hook as the shared one
+        inventory = FlightInventory(str(Path(tmp) / "inventory.db"))
+        flight_tools.shared_tools = flight_tools.FlightTools(inventory)
+        inventory.add_seat_listener(
+            lambda departure, arrival, flight_date: tool_cache.invalidate("search_flights", route_tag(departure, arrival, flight_date))
+        )
+        calls = make_calls(args.calls)
+        run(calls[:200])  # materialize the searched flights once
+
+        results = {}
+        for label, enabled, capacity in [("uncached", False, tool_cache.config.max_entries),
+                                         ("cached", True, tool_cache.config.max_entries),
+                                         (f"cached, {args.small_cache} entries", True, args.small_cache)]:
+            tool_cache.config.enabled = enabled
+            tool_cache.config.max_entries = capacity
+            tool_cache.clear()
+            tool_cache.stats = dict.fromkeys(tool_cache.stats, 0)
+            start = time.perf_counter()
+            latencies, answers = run(calls)
+            elapsed = time.perf_counter() - start
+            inconsistent = sum(1 for found in answers.values() if len(found) > 1)
+            results[label] = elapsed
+            stats = tool_cache.get_stats()
+            print(f"{label:<20} {elapsed * 1e3:7.0f} ms total | p50 {percentile(latencies, 0.5) * 1e6:5.0f} µs | "
+                  f"p99 {percentile(latencies, 0.99) * 1e6:5.0f} µs | hit rate {stats['hit_rate']:.1%} | "
+                  f"evictions {stats['evictions']} | weather/status questions answered differently {inconsistent}/{len(answers)}")
+
+        # A booking must drop exactly the cached searches of its route and date
+        tool_cache.config.max_entries = 1024
+        search = {"departure_city": "Paris", "arrival_city": "Tokyo", "date": DATES[0]}
+        before = flight_tools.search_flights.invoke(search)
+        cached_entries = tool_cache.get_stats()["size"]
+        flight_tools.book_flight.invoke({"flight_number": "FL004", "passenger_name": "Bench Passenger",
+                                         "email": "bench@example.com", "date": DATES[0]})
+        after = flight_tools.search_flights.invoke(search)
+        print(f"Booking FL004 on {DATES[0]}: {tool_cache.stats['invalidations']} entry invalidated of {cached_entries}, "
+              f"fresh seat count served: {before != after}")
+        print(f"Speed-up of tool bodies with cache: {results['uncached'] / results['cached']:.1f}x")
+
+        start = time.perf_counter()
+        for _ in range(200):
+            flight_tools.get_weather.invoke({"city": "Paris"})
+        print(f"LangChain tool.invoke overhead on a cache hit: {(time.perf_counter() - start) / 200 * 1e6:.0f} µs/call")
+        inventory.close()
+
+
+if __name__ == "__main__":
+    main()
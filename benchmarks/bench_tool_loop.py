@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Compare the single-shot process_booking (tool output pasted into the reply) with the ToolMessage loop
+"""
+
+import argparse
+import importlib
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.bench_fused_intent import PromptRoutedChatModel
+from benchmarks.fakes import ScriptedChatModel
+from src.agents import FlightAgent
+from src.config import settings
+from src.utils.flight_inventory import FlightInventory
+
+flight_tools = importlib.import_module("src.tools.flight_tools")
+
+FLIGHT_NUMBER = re.compile(r"\b([A-Z]{2}\d{3,4})\b")
+BOOKING = {"departure_city": "Paris", "arrival_city": "Tokyo", "passengers": 1,
+           "class_type": "economy", "passenger_name": "Bench Passenger", "email": "bench@example.com"}
+
+
+class BookingToolModel(ScriptedChatModel):
+    """Fake booking LLM: searches, books the first flight it has seen, then answers."""
+
+    calls: int = 0
+    date: str = ""
+
+    def _next_message(self, messages: List[BaseMessage] = None) -> ChatResult:
+        self.calls += 1
+        tool_outputs = {m.name: m.content for m in messages if isinstance(m, ToolMessage)}
+        last_user = next(m.content for m in reversed(messages) if isinstance(m, HumanMessage))
+        chosen = FLIGHT_NUMBER.search(tool_outputs.get("search_flights", "") or last_user)
+        if "book_flight" in tool_outputs:
+            message = AIMessage(content=f"Done! {tool_outputs['book_flight'].splitlines()[0]}")
+        elif chosen:
+            message = AIMessage(content="Booking that flight for you.", tool_calls=[{
+                "name": "book_flight", "id": f"call_{self.calls}",
+                "args": {"flight_number": chosen.group(1), "passenger_name": BOOKING["passenger_name"],
+                         "email": BOOKING["email"], "date": self.date}}])
+        else:
+            message = AIMessage(content="Let me search flights first.", tool_calls=[{
+                "name": "search_flights", "id": f"call_{self.calls}",
+                "args": {"departure_city": BOOKING["departure_city"], "arrival_city": BOOKING["arrival_city"],
+                         "date": self.date}}])
+        message.usage_metadata = {"input_tokens": sum(len(str(m.content)) for m in messages) // 4,
+                                  "output_tokens": 20, "total_tokens": sum(len(str(m.content)) for m in messages) // 4 + 20}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._next_message(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def complete_booking(agent: FlightAgent, model: BookingToolModel, intent_model: PromptRoutedChatModel,
+                     thread_id: str, flight_date: str) -> dict:
+    """Drive user turns through the full graph until a booking is confirmed."""
+    model.calls = intent_model.calls = 0
+    model.date = flight_date
+    fields = {**BOOKING, "date": flight_date, "round_trip": False}
+    text = (f"Book me the first flight from Paris to Tokyo on {flight_date}, one way, 1 passenger, economy, "
+            f"name {BOOKING['passenger_name']}, email {BOOKING['email']}")
+    turns = 0
+    start = time.perf_counter()
+    while turns < 5:
+        turns += 1
+        intent_model.turn = {"text": text, "intent": "book_flight", "fields": fields, "language": "en"}
+        reply = agent.run(text, thread_id=thread_id, user_id="bench-user").response
+        if "booking confirmed" in reply.lower():
+            break
+        # The user reads the pasted search results and names a flight in a new turn
+        text = f"Please book {FLIGHT_NUMBER.search(reply).group(1)}"
+    return {"turns": turns, "llm_calls": model.calls + intent_model.calls, "seconds": time.perf_counter() - start,
+            "booked": "booking confirmed" in reply.lower()}
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Tool loop benchmark")
+    parser.add_argument("--bookings", type=int, default=20, help="Bookings to complete per mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated LLM latency in seconds")
+    args = parser.parse_args()
+
+    print("🏁 Tool loop benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = FlightInventory(str(Path(tmp) / "inventory.db"))
+        flight_tools.shared_tools = flight_tools.FlightTools(inventory)
+        agent = FlightAgent()
+        model = BookingToolModel(responses=[""], latency=args.latency)
+        intent_model = PromptRoutedChatModel(responses=["{}"], latency=args.latency)
+        agent.llm = model
+        agent.processed_llm = intent_model
+        agent.compile_graph(file_path=str(Path(tmp) / "checkpoints.db"))
+
+        for label, iterations in [("single shot (1 LLM call per turn)", 1),
+                                  (f"tool loop (up to {settings.agent.max_tool_iterations} calls)",
+                                   settings.agent.max_tool_iterations)]:
+            settings.agent.max_tool_iterations = iterations
+            # One booking per date so no flight sells out
+            runs = [complete_booking(agent, model, intent_model, f"{iterations}-{i}",
+                                     (date(2025, 7, 1) + timedelta(days=i + iterations * args.bookings)).isoformat())
+                    for i in range(args.bookings)]
+            turns = sum(run["turns"] for run in runs) / len(runs)
+            calls = sum(run["llm_calls"] for run in runs) / len(runs)
+            seconds = sum(run["seconds"] for run in runs) / len(runs)
+            booked = sum(run["booked"] for run in runs)
+            print(f"{label:<36} user turns/booking {turns:.1f} | LLM calls/booking {calls:.1f} (excl. summaries) | "
+                  f"{seconds * 1e3:.0f} ms/booking | booked {booked}/{len(runs)}")
+        agent.close()
+        inventory.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool dispatch and per-intent tool binding: lookup cost, bind_tools cost and tool schema tokens per request
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_openai import ChatOpenAI
+
+from src.config import settings
+from src.tools import flight_tools, ToolRegistry
+
+INTENT_TOOLS = settings.tool_selection.intent_tools
+
+
+def token_counter():
+    """tiktoken encoder for the configured model, or a ~4 characters/token estimate when unavailable.
+
+    tiktoken downloads its BPE file once; offline, point TIKTOKEN_CACHE_DIR at a cached copy.
+    """
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(settings.llm.model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), f"tiktoken {encoding.name}"
+    except Exception:
+        return (lambda text: len(text) // 4), "estimate (4 chars/token, tiktoken encoding unavailable)"
+
+
+def schema_tokens(tools, count) -> int:
+    """Tokens of the tool schemas sent with a request."""
+    return count(json.dumps([convert_to_openai_tool(tool) for tool in tools]))
+
+
+def linear_lookup(tool_name: str):
+    """Previous get_tool_by_name: scan the tool list."""
+    for tool in flight_tools:
+        if tool.name == tool_name:
+            return tool
+    return None
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Tool registry benchmark")
+    parser.add_argument("--lookups", type=int, default=200000, help="Tool lookups to time")
+    parser.add_argument("--binds", type=int, default=200, help="bind_tools calls to time")
+    args = parser.parse_args()
+
+    print("🏁 Tool registry benchmark")
+    print("=" * 50)
+
+    registry = ToolRegistry(flight_tools)
+    names = [tool.name for tool in flight_tools]
+
+    # Name lookup: linear scan vs dict
+    for label, lookup in [("linear scan", linear_lookup), ("registry dict", registry.get)]:
+        start = time.perf_counter()
+        for i in range(args.lookups):
+            lookup(names[i % len(names)])
+        print(f"{label:<14} {(time.perf_counter() - start) / args.lookups * 1e9:6.0f} ns/lookup ({len(names)} tools)")
+
+    # Binding: bind_tools on every process_booking call vs cached per intent
+    llm = ChatOpenAI(model=settings.llm.model)
+    start = time.perf_counter()
+    for _ in range(args.binds):
+        llm.bind_tools(flight_tools)
+    per_bind = (time.perf_counter() - start) / args.binds
+    for intent in INTENT_TOOLS:
+        registry.bound_llm(llm, intent)  # bound once, at the first turn of each intent
+    start = time.perf_counter()
+    for i in range(args.binds):
+        registry.bound_llm(llm, list(INTENT_TOOLS)[i % len(INTENT_TOOLS)])
+    per_cached = (time.perf_counter() - start) / args.binds
+    print(f"bind_tools per turn: {per_bind * 1e3:.2f} ms | pre-bound per intent: {per_cached * 1e6:.1f} µs")
+
+    # Prompt tokens of the tool schemas per intent
+    count, method = token_counter()
+    full = schema_tokens(flight_tools, count)
+    print(f"Tool schema tokens per request ({method}):")
+    print(f"  all tools ({len(flight_tools)}): {full}")
+    selection = settings.tool_selection
+    for intent in list(INTENT_TOOLS) + ["general_inquiry"]:
+        tools = registry.tools_for(selection.get_toolset(intent, 0.95))
+        tokens = schema_tokens(tools, count)
+        fallback = schema_tokens(registry.tools_for(selection.get_toolset(intent, selection.min_confidence / 2)), count)
+        print(f"  {intent:<15} {len(tools):2d} tools {tokens:5d} tokens (-{full - tokens}, {1 - tokens / full:.0%} saved) "
+              f"| confidence < {selection.min_confidence}: {fallback} tokens (full set)")
+
+
+if __name__ == "__main__":
+    main()
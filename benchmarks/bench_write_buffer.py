@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark caller-side latency of synchronous vs write-behind conversation writes
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.database import DatabaseManager
+from src.utils.write_buffer import ConversationWriteBuffer
+
+
+def make_entry(i: int) -> dict:
+    """Build a representative conversation entry."""
+    return {
+        "thread_id": f"bench-{i % 50}",
+        "user_id": "bench-user",
+        "user_input": "Book me a business class ticket from Paris to Tokyo",
+        "assistant_response": "May I have the passenger's full name, please?",
+        "session_id": None,
+        "metadata": {"source": "benchmark", "turn": i}
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Write-behind buffer benchmark")
+    parser.add_argument("--entries", type=int, default=2000, help="Entries to write")
+    parser.add_argument("--batch-size", type=int, default=50, help="Write-behind batch size")
+    args = parser.parse_args()
+
+    print("🏁 Write-behind buffer benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_db = DatabaseManager(str(Path(tmp) / "sync.db"))
+        start = time.perf_counter()
+        for i in range(args.entries):
+            sync_db.add_conversation_entry(**make_entry(i))
+        sync_elapsed = time.perf_counter() - start
+        sync_db.close()
+
+        buffered_db = DatabaseManager(str(Path(tmp) / "buffered.db"))
+        buffer = ConversationWriteBuffer(buffered_db, batch_size=args.batch_size)
+        start = time.perf_counter()
+        for i in range(args.entries):
+            buffer.add(make_entry(i))
+        enqueue_elapsed = time.perf_counter() - start
+        buffer.flush()
+        durable_elapsed = time.perf_counter() - start
+        buffer.close()
+        stats = buffer.get_stats()
+        stored = buffered_db.get_statistics()["total_entries"]
+        buffered_db.close()
+
+    print(f"Synchronous:  {sync_elapsed / args.entries * 1e6:8.1f} µs/entry on the caller "
+          f"({args.entries / sync_elapsed:,.0f} entries/sec)")
+    print(f"Write-behind: {enqueue_elapsed / args.entries * 1e6:8.1f} µs/entry on the caller "
+          f"({args.entries / durable_elapsed:,.0f} entries/sec until durable)")
+    print(f"Stored entries: {stored} | batches: {stats['batches']} | "
+          f"avg flush: {stats['avg_flush_ms']:.2f} ms | max flush: {stats['max_flush_ms']:.2f} ms | "
+          f"sync fallbacks: {stats['sync_fallbacks']}")
+
+
+if __name__ == "__main__":
+    main()
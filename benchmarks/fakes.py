@@ -0,0 +1,53 @@
+"""
+Offline chat model stand-ins shared by the benchmarks
+"""
+
+import asyncio
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+INTENT_JSON = '{"intent": "greeting", "confidence": 0.95, "reasoning": "User greets", "language": "en"}'
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model cycling through canned replies with a fixed simulated latency."""
+
+    responses: List[str]
+    latency: float = 0.0
+    i: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-benchmark"
+
+    def _next_message(self) -> ChatResult:
+        response = self.responses[self.i % len(self.responses)]
+        self.i += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._next_message()
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._next_message()
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def use_fake_llms(agent, latency: float = 0.0):
+    """Swap an agent's LLMs for scripted stand-ins."""
+    agent.llm = ScriptedChatModel(responses=["Hello! How can I help you with your flight today?"], latency=latency)
+    agent.processed_llm = ScriptedChatModel(responses=[INTENT_JSON], latency=latency)
+    return agent
@@ -112,6 +112,11 @@ def main():
                     elif chunk.get("type") == "completion_chunk":
                         print(chunk["content"], end="", flush=True)
                         current_message += chunk["content"]
+                    elif chunk.get("type") == "answer_chunk":
+                        print(chunk["content"], end="", flush=True)
+                        current_message += chunk["content"]
+                    elif chunk.get("type") == "tool_progress" and chunk["status"] != "started":
+                        print(f"\n🔧 {chunk['tool']}: {chunk['status']} ({chunk['elapsed_ms']} ms)")
                     elif chunk.get("type") == "error":
                         print(f"❌ Error: {chunk['message']}")
                 
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+HTTP/SSE server for Flight Booking Agent
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+import uvicorn
+
+from src.config import settings
+
+
+def main():
+    """Start the server."""
+    parser = argparse.ArgumentParser(description="Serve the flight booking agent over HTTP/SSE")
+    parser.add_argument("--host", default=settings.server.host, help="Bind address")
+    parser.add_argument("--port", type=int, default=settings.server.port, help="Bind port")
+    parser.add_argument("--workers", type=int, default=settings.server.workers,
+                        help="Worker processes (each with its own agent and concurrency limit)")
+    args = parser.parse_args()
+
+    if not settings.validate():
+        print("❌ Configuration validation failed. Please check your .env file.")
+        return
+
+    print("🎫 Flight Booking Agent server")
+    print("=" * 50)
+    print(f"   http://{args.host}:{args.port} with {args.workers} worker(s), "
+          f"{settings.server.max_concurrency} concurrent turns and {settings.server.max_queue} queued per worker")
+    uvicorn.run(
+        "src.server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        # Stop accepting connections, then give running turns time to finish
+        timeout_graceful_shutdown=int(settings.server.drain_timeout),
+        log_level="info"
+    )
+
+
+if __name__ == "__main__":
+    main()
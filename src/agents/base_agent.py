@@ -2,17 +2,21 @@
 Base agent class for Flight Booking Agent
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from langchain_openai import ChatOpenAI
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import aiosqlite
 from langchain_core.messages import HumanMessage
 from langgraph.graph import StateGraph
 
-from src.config import settings
 from src.utils import AgentResponse
-from src.tools import flight_tools
+from src.utils.llm_provider import create_llms
+from src.tools import flight_tools, ToolRegistry
 import sqlite3
 from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.checkpoint.memory import InMemorySaver
 
 
@@ -20,164 +24,261 @@ class BaseAgent(ABC):
     """Base class for flight booking agents."""
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.llm.model,
-            temperature=settings.llm.temperature,
-            max_tokens=settings.llm.max_tokens
-        )
-        self.processed_llm = ChatOpenAI(
-            model=settings.llm.model,
-            temperature=0.1,  
-            disable_streaming=True
-        )
+        # OpenAI, or an offline fake backend (settings.llm.provider)
+        self.llm, self.processed_llm = create_llms()
         self.tools = flight_tools
+        # Name lookup and per-intent tool bindings, built once
+        self.tool_registry = ToolRegistry(self.tools)
         self.graph = None
+        self.checkpoint_path = "data/langgraph_checkpoints.db"
+        
+        # Compiled graph and checkpointer are built once and reused across turns
+        self._compiled_graph = None
+        self._checkpointer = None
+        self._checkpoint_conn = None
+        self._compile_lock = threading.Lock()
+        
+        # Async graph state, bound to the event loop it was compiled on
+        self._async_compiled_graph = None
+        self._async_checkpointer = None
+        self._async_compile_lock = None
+        self._async_loop = None
     
     @abstractmethod
-    def create_graph(self) -> StateGraph:
-        """Create the agent graph. Must be implemented by subclasses."""
+    def create_graph(self, use_async: bool = False) -> StateGraph:
+        """Create the agent graph, with async nodes if ``use_async``. Must be implemented by subclasses."""
         pass
     
-    def compile_graph(self, file_path: str = "data/langgraph_checkpoints.db") -> StateGraph:
-        """Compile the agent graph with SQLite checkpointer."""
-        if self.graph is None:
-            self.graph = self.create_graph()
+    def compile_graph(self, file_path: Optional[str] = None) -> StateGraph:
+        """Get the compiled agent graph, compiling it with a SQLite checkpointer on first use."""
+        if file_path and file_path != self.checkpoint_path:
+            # A different checkpoint database needs a fresh checkpointer
+            self.close()
+            self.checkpoint_path = file_path
+        
+        if self._compiled_graph is not None:
+            return self._compiled_graph
+        
+        with self._compile_lock:
+            if self._compiled_graph is None:
+                if self.graph is None:
+                    self.graph = self.create_graph()
+                self._compiled_graph = self.graph.compile(checkpointer=self._get_checkpointer())
+        return self._compiled_graph
+    
+    def _get_checkpointer(self):
+        """Create the shared checkpointer (one SQLite connection for all turns)."""
+        if self._checkpointer is not None:
+            return self._checkpointer
         
         # Use built-in SQLite checkpointer
         try:
-            # Create SQLite connection for checkpoints
-            conn = sqlite3.connect(file_path)
-            checkpointer = SqliteSaver(conn)
-            
-            return self.graph.compile(checkpointer=checkpointer)
-            
-        except ImportError:
-            checkpointer = InMemorySaver()
-            return self.graph.compile(checkpointer=checkpointer)
+            Path(self.checkpoint_path).parent.mkdir(parents=True, exist_ok=True)
+            # SqliteSaver serializes access with its own lock, so the connection can be shared
+            self._checkpoint_conn = sqlite3.connect(self.checkpoint_path, check_same_thread=False)
+            self._checkpointer = SqliteSaver(self._checkpoint_conn)
+        except (ImportError, sqlite3.Error):
+            self._checkpointer = InMemorySaver()
+        return self._checkpointer
+    
+    def recompile(self) -> StateGraph:
+        """Rebuild and recompile the graph (e.g. after a config change), keeping the checkpointers.
+        
+        The async graph is dropped too and rebuilt by the next ``acompile_graph()``, reusing its saver.
+        """
+        with self._compile_lock:
+            self.graph = None
+            self._compiled_graph = None
+            self._async_compiled_graph = None
+        return self.compile_graph()
+    
+    def close(self):
+        """Dispose of the compiled graph and close the checkpoint connection."""
+        with self._compile_lock:
+            self._compiled_graph = None
+            self._checkpointer = None
+            if self._checkpoint_conn is not None:
+                self._checkpoint_conn.close()
+                self._checkpoint_conn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _prepare_invocation(self, user_input: str, thread_id: Optional[str] = None, user_id: Optional[str] = None,
+                            email: Optional[str] = None, phone: Optional[str] = None,
+                            session_id: Optional[str] = None, **kwargs) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build graph inputs and config for one user turn."""
+        # Prepare input with thread_id and user_id in state
+        inputs = {
+            "messages": [HumanMessage(content=user_input)],
+            "thread_id": thread_id or "default_thread",
+            "user_id": user_id or "default_user"
+        }
+        
+        # Prepare config with all available parameters
+        config = {}
+        config["configurable"] = {}
+        
+        if thread_id:
+            config["configurable"]["thread_id"] = thread_id
+        if user_id:
+            config["configurable"]["user_id"] = user_id
+        if email:
+            config["configurable"]["email"] = email
+        if phone:
+            config["configurable"]["phone"] = phone
+        if session_id:
+            config["configurable"]["session_id"] = session_id
+        
+        # Add any additional kwargs to configurable
+        for key, value in kwargs.items():
+            config["configurable"][key] = value
+        
+        return inputs, config
+    
+    def _build_response(self, result: Dict[str, Any]) -> AgentResponse:
+        """Create an AgentResponse from the final graph state."""
+        intent_classification = result.get('intent_classification')
+        return AgentResponse(
+            success=True,
+            intent=intent_classification.intent if intent_classification else 'unknown',
+            confidence=intent_classification.confidence if intent_classification else 0.0,
+            response=result.get('messages', [{}])[-1].content if result.get('messages') else '',
+            language=intent_classification.language if intent_classification else 'en',
+            booking_info=result.get('booking_info', {})
+        )
+    
+    def _error_response(self, error: Exception) -> AgentResponse:
+        """Create an AgentResponse for a failed run."""
+        return AgentResponse(
+            success=False,
+            intent='error',
+            confidence=0.0,
+            response='',
+            error=str(error)
+        )
     
     def run(self, user_input: str, thread_id: Optional[str] = None, user_id: Optional[str] = None, 
             email: Optional[str] = None, phone: Optional[str] = None, session_id: Optional[str] = None,
             **kwargs) -> AgentResponse:
         """Run the agent with user input."""
         try:
-            # Compile graph if not already compiled
+            # Reuse the compiled graph across turns
             compiled_graph = self.compile_graph()
-            
-            # Prepare input with thread_id and user_id in state
-            inputs = {
-                "messages": [HumanMessage(content=user_input)],
-                "thread_id": thread_id or "default_thread",
-                "user_id": user_id or "default_user"
-            }
-            
-            # Prepare config with all available parameters
-            config = {}
-            config["configurable"] = {}
-            
-            if thread_id:
-                config["configurable"]["thread_id"] = thread_id
-            if user_id:
-                config["configurable"]["user_id"] = user_id
-            if email:
-                config["configurable"]["email"] = email
-            if phone:
-                config["configurable"]["phone"] = phone
-            if session_id:
-                config["configurable"]["session_id"] = session_id
-            
-            # Add any additional kwargs to configurable
-            for key, value in kwargs.items():
-                config["configurable"][key] = value
-            
-            # Run the graph with config to ensure checkpointing
-            if config:
-                result = compiled_graph.invoke(inputs, config=config)
-            else:
-                # If no config, still run but without checkpointing
-                result = compiled_graph.invoke(inputs)
-            
-            # Create response
-            intent_classification = result.get('intent_classification')
-            response = AgentResponse(
-                success=True,
-                intent=intent_classification.intent if intent_classification else 'unknown',
-                confidence=intent_classification.confidence if intent_classification else 0.0,
-                response=result.get('messages', [{}])[-1].content if result.get('messages') else '',
-                language=intent_classification.language if intent_classification else 'en',
-                booking_info=result.get('booking_info', {})
+            inputs, config = self._prepare_invocation(
+                user_input, thread_id, user_id, email, phone, session_id, **kwargs
             )
             
-            return response
+            # Run the graph with config to ensure checkpointing
+            result = compiled_graph.invoke(inputs, config=config)
+            return self._build_response(result)
             
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                intent='error',
-                confidence=0.0,
-                response='',
-                error=str(e)
-            )
+            return self._error_response(e)
     
     def stream(self, user_input: str, thread_id: Optional[str] = None, user_id: Optional[str] = None,
                email: Optional[str] = None, phone: Optional[str] = None, session_id: Optional[str] = None,
                **kwargs):
         """Stream the agent execution with custom data from get_stream_writer()."""
         try:
-            # Compile graph if not already compiled
+            # Reuse the compiled graph across turns
             compiled_graph = self.compile_graph()
-            
-            # Prepare input with thread_id and user_id in state
-            inputs = {
-                "messages": [HumanMessage(content=user_input)],
-                "thread_id": thread_id or "default_thread",
-                "user_id": user_id or "default_user"
-            }
-            
-            # Prepare config with all available parameters
-            config = {}
-            config["configurable"] = {}
-            
-            if thread_id:
-                config["configurable"]["thread_id"] = thread_id
-            if user_id:
-                config["configurable"]["user_id"] = user_id
-            if email:
-                config["configurable"]["email"] = email
-            if phone:
-                config["configurable"]["phone"] = phone
-            if session_id:
-                config["configurable"]["session_id"] = session_id
-            
-            # Add any additional kwargs to configurable
-            for key, value in kwargs.items():
-                config["configurable"][key] = value
+            inputs, config = self._prepare_invocation(
+                user_input, thread_id, user_id, email, phone, session_id, **kwargs
+            )
             
             # Stream the graph execution with custom mode
-            if config:
-                return compiled_graph.stream(inputs, config=config, stream_mode="custom")
-            else:
-                return compiled_graph.stream(inputs, stream_mode="custom")
+            return compiled_graph.stream(inputs, config=config, stream_mode="custom")
             
         except Exception as e:
             # Return a generator that yields the error
+            message = str(e)
+            
             def error_generator():
                 yield {
                     "type": "error",
-                    "message": str(e),
+                    "message": message,
                     "success": False
                 }
             return error_generator()
     
+    async def acompile_graph(self) -> StateGraph:
+        """Get the async graph, compiled with an AsyncSqliteSaver bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_compiled_graph is not None and self._async_loop is loop:
+            return self._async_compiled_graph
+        
+        if self._async_compile_lock is None or self._async_loop is not loop:
+            # A new event loop (e.g. another asyncio.run) needs its own connection
+            await self.aclose()
+            self._async_compile_lock = asyncio.Lock()
+            self._async_loop = loop
+        
+        async with self._async_compile_lock:
+            if self._async_compiled_graph is None:
+                if self._async_checkpointer is None:
+                    Path(self.checkpoint_path).parent.mkdir(parents=True, exist_ok=True)
+                    # The saver opens the aiosqlite connection lazily on first use
+                    self._async_checkpointer = AsyncSqliteSaver(aiosqlite.connect(self.checkpoint_path))
+                self._async_compiled_graph = self.create_graph(use_async=True).compile(
+                    checkpointer=self._async_checkpointer
+                )
+        return self._async_compiled_graph
+    
+    async def arun(self, user_input: str, thread_id: Optional[str] = None, user_id: Optional[str] = None,
+                   email: Optional[str] = None, phone: Optional[str] = None, session_id: Optional[str] = None,
+                   **kwargs) -> AgentResponse:
+        """Run the agent asynchronously; many conversations can share one event loop."""
+        try:
+            compiled_graph = await self.acompile_graph()
+            inputs, config = self._prepare_invocation(
+                user_input, thread_id, user_id, email, phone, session_id, **kwargs
+            )
+            
+            result = await compiled_graph.ainvoke(inputs, config=config)
+            return self._build_response(result)
+            
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def astream(self, user_input: str, thread_id: Optional[str] = None, user_id: Optional[str] = None,
+                      email: Optional[str] = None, phone: Optional[str] = None, session_id: Optional[str] = None,
+                      **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Asynchronously stream custom data from get_stream_writer()."""
+        try:
+            compiled_graph = await self.acompile_graph()
+            inputs, config = self._prepare_invocation(
+                user_input, thread_id, user_id, email, phone, session_id, **kwargs
+            )
+            
+            async for chunk in compiled_graph.astream(inputs, config=config, stream_mode="custom"):
+                yield chunk
+                
+        except Exception as e:
+            yield {
+                "type": "error",
+                "message": str(e),
+                "success": False
+            }
+    
+    async def aclose(self):
+        """Dispose of the async graph and close its checkpoint connection."""
+        checkpointer = self._async_checkpointer
+        self._async_compiled_graph = None
+        self._async_checkpointer = None
+        if checkpointer is not None and checkpointer.conn.is_alive():
+            await checkpointer.conn.close()
+    
     def get_available_tools(self) -> List[str]:
         """Get list of available tool names."""
         return [tool.name for tool in self.tools]
     
     def get_tool_by_name(self, tool_name: str):
         """Get a specific tool by name."""
-        for tool in self.tools:
-            if tool.name == tool_name:
-                return tool
-        return None
+        return self.tool_registry.get(tool_name)
     
     def preprocess_input(self, user_input: str) -> str:
         """Preprocess user input."""
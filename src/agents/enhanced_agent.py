@@ -2,8 +2,8 @@
 Enhanced Flight Booking Agent with advanced features
 """
 
-from typing import Literal
-from langchain_core.messages import AIMessage, HumanMessage
+from typing import Literal, Optional
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage, message_chunk_to_message
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import JsonOutputParser
 from langgraph.graph import StateGraph, START, END
@@ -15,10 +15,18 @@ from src.config import settings
 from src.utils import (
     FlightBookingState, 
     IntentClassification, 
-    BookingInformation
+    BookingInformation,
+    IntentExtraction
 )
 from src.utils.conversation_service import conversation_service
+from src.utils.conversation_memory import conversation_memory
+from src.utils.summary_worker import summary_worker
+from src.utils.intent_rules import intent_rules, pending_booking_field
+from src.utils.booking_extractor import booking_extractor
+from src.utils.tool_executor import tool_executor
+from src.utils.stream_emitter import StreamEmitter
 from langchain_core.prompts import ChatPromptTemplate
+import asyncio
 import logging
 from src.utils.models import QuestionTemplates
 from datetime import datetime
@@ -29,129 +37,9 @@ DEFAULT_SYSTEM_PROMPT = """You are Tebby, a helpful flight booking assistant. An
 booking, or travel in general. Be friendly and informative. If they want to book or search for flights,
 guide them through the process."""
 
-def chunk_text(text: str, n: int = 8):
-    """Chia text thành mảnh nhỏ để stream (theo ký tự)."""
-    for i in range(0, len(text), n):
-        yield text[i:i+n]
-
-class FlightAgent(BaseAgent):
-    """Enhanced flight booking agent with advanced features."""
-    
-    def __init__(self):
-        super().__init__()
-        self.intent_parser = JsonOutputParser(pydantic_object=IntentClassification)
-        self.booking_parser = JsonOutputParser(pydantic_object=BookingInformation)
-    
-    def save_conversation(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
-        """Save conversation entry to storage."""
-        try:
-            messages = state.get("messages", [])
-            
-            # Lấy các giá trị từ RunnableConfig
-            thread_id = None
-            user_id = None
-            email = None
-            phone = None
-            session_id = None
-            
-            if config and "configurable" in config:
-                configurable = config["configurable"]
-                thread_id = configurable.get("thread_id")
-                user_id = configurable.get("user_id")
-                email = configurable.get("email")
-                phone = configurable.get("phone")
-                session_id = configurable.get("session_id")
-            
-            
-            # Get the latest user message and assistant response
-            user_input = ""
-            assistant_response = ""
-            
-            # Find the latest user message and assistant response pair
-            for i in range(len(messages) - 1, -1, -1):
-                msg = messages[i]
-                if isinstance(msg, HumanMessage):
-                    if isinstance(msg.content, list) and msg.content:
-                        user_input = msg.content[0]['text']
-                    elif isinstance(msg.content, str):
-                        user_input = msg.content
-                    
-                    # Look for assistant response after this user message
-                    if i + 1 < len(messages):
-                        next_msg = messages[i + 1]
-                        if isinstance(next_msg, AIMessage):
-                            assistant_response = next_msg.content
-                    break
-            
-            if user_input:
-                # Add conversation entry với metadata đầy đủ
-                success = conversation_service.add_conversation_entry(
-                    thread_id=thread_id,
-                    user_input=user_input,
-                    assistant_response=assistant_response,
-                    user_id=user_id,
-                    session_id=session_id,
-                    metadata={
-                        "email": email,
-                        "phone": phone,
-                        "message_count": len(messages),
-                        "timestamp": str(datetime.now()),
-                        "source": "langgraph_node"
-                    }
-                )
-                
-                if success:
-                    logger.info(f"Conversation entry saved for thread {thread_id} (user: {user_id})")
-                else:
-                    logger.warning(f"Failed to save conversation entry for thread {thread_id}")
-            
-            # Return state without intent_classification and booking_info to avoid conflicts
-            return {
-                "messages": state.get("messages", []),
-                "conversation_history": state.get("conversation_history"),
-                "current_step": state.get("current_step", ""),
-                "data": state.get("data", ""),
-                "action": state.get("action", {}),
-                "thread_id": state.get("thread_id", ""),
-                "user_id": state.get("user_id", "")
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in save_conversation: {e}")
-            # Return state without intent_classification and booking_info to avoid conflicts
-            return {
-                "messages": state.get("messages", []),
-                "conversation_history": state.get("conversation_history"),
-                "current_step": state.get("current_step", ""),
-                "data": state.get("data", ""),
-                "action": state.get("action", {}),
-                "thread_id": state.get("thread_id", ""),
-                "user_id": state.get("user_id", "")
-            }
-    
-    def classify_intent(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
-        """Enhanced intent classification with confidence scoring."""
-        messages = state.get("messages", [])
-        
-        # logger.info(f"Messages: {messages}")
-        recent_messages = []
-        for msg in messages[-10:]:
-            if isinstance(msg, HumanMessage) and isinstance(msg.content, list) and msg.content:                
-                recent_messages.append("User: " + msg.content[0]['text'])
-            elif isinstance(msg, HumanMessage) and isinstance(msg.content, str):
-                recent_messages.append("User: " + msg.content)
-            elif isinstance(msg, AIMessage):
-                recent_messages.append("Assistant: " + msg.content)
-            else:
-                continue
-                
-        logger.info(f"Recent messages for intent classification: {recent_messages}")
-        
-        # Combine all recent messages for context
-        combined_text = " ".join(recent_messages) if recent_messages else ""
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert intent classifier for a flight booking system. 
+# Prompts and parsers are built once at import; per-turn values are template variables
+INTENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert intent classifier for a flight booking system. 
             Analyze the user's conversation history and classify their intent with high accuracy.
             
             Intent categories:
@@ -173,53 +61,52 @@ class FlightAgent(BaseAgent):
             }}
             
             Do not include any other text, explanations, or formatting outside the JSON object."""),
-            ("user", "Classify the intent from this conversation: {combined_text}")
-        ])
-        
-        chain = prompt | self.processed_llm | self.intent_parser
-        
-        try:
-            result = chain.invoke({"combined_text": combined_text})
-            logger.info(f"Intent classification result: {result}")
-            return {
-                "intent_classification": IntentClassification(
-                    intent=result["intent"],
-                    confidence=result["confidence"],
-                    reasoning=result["reasoning"],
-                    language=result.get("language", "en")  # Default to English if not detected
-                ),
-                "messages": state["messages"]
-            }
-        except Exception as e:
-            logger.error(f"Intent classification failed: {e}")
-            return {
-                "intent_classification": IntentClassification(
-                    intent="general_inquiry",
-                    confidence=0.5,
-                    reasoning="Intent classification failed, defaulting to general inquiry",
-                    language="en"  # Default to English on error
-                ),
-                "messages": state["messages"]
-            }
-    
-    def collect_booking_info(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
-        """Intelligently extract and request missing booking information with streaming."""
-        # logger.info(f"Collecting booking info for state: {state}")
+    ("user", "Classify the intent from this conversation: {combined_text}")
+])
 
-        intent_classification = state.get("intent_classification")
-        intent = intent_classification.intent if intent_classification else ""
-        user_intent_expansion = intent_classification.reasoning if intent_classification else ""
-        # logger.info(f"User intent expansion: {user_intent_expansion}")
+FUSED_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert intent classifier and booking information extractor for a flight booking system. 
+            Analyze the user's conversation history, classify their intent and extract booking details in one step.
+            
+            Intent categories:
+            - 'book_flight': User wants to book a flight or provides booking information in response to questions
+            - 'search_flights': User wants to search for flights
+            - 'check_weather': User wants weather information
+            - 'flight_status': User wants flight status
+            - 'booking_info': User wants to look up booking information
+            - 'cancel_booking': User wants to cancel a booking
+            - 'general_inquiry': General questions about flights, booking, policies, etc.
+            - 'greeting': Simple greetings or casual conversation
+            
+            Current booking information: {current_info}
+            
+            For 'book_flight' and 'search_flights', put every booking field the user explicitly provided in "booking_info"
+            (departure_city, arrival_city, date, round_trip, return_date, passenger_name, email, passengers, class_type).
+            Omit fields the user did not mention. For other intents leave "booking_info" empty.
+            
+            Special handling for round_trip:
+            - If user mentions "round trip", "return", "two-way", "khứ hồi", set round_trip to true
+            - If user mentions "one way", "single", "một chiều", set round_trip to false
+            - For return_date, extract date after "return", "back", "về", etc.
+            
+            You MUST respond with ONLY a valid JSON object in this exact format:
+            {{
+                "intent": "the_classified_intent",
+                "confidence": float_number_between_0_and_1,
+                "reasoning": "Text summarizes the user's request and MUST have all booking details user explicitly provided",
+                "language": "Detected language of the user input, eg: vi, en",
+                "booking_info": {{
+                    "field_name": "extracted_value",
+                    ...
+                }}
+            }}
+            
+            Do not include any other text, explanations, or formatting outside the JSON object."""),
+    ("user", "Classify the intent and extract booking information from this conversation: {combined_text}")
+])
 
-        current_info = state.get("booking_info", {})
-        required_fields = settings.booking.required_fields.get(intent, [])
-        missing_fields = [field for field in required_fields if not current_info.get(field)]
-        # logger.info(f"current_info: {current_info}")
-        # logger.info(f"missing_fields: {missing_fields}")
-        
-        # Use LLM to extract booking information from user's latest message
-        extraction_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at extracting flight booking information. 
+EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert at extracting flight booking information. 
             Extract any missing booking information mentioned in the user's intent expansion and update the current booking info.
             
             Current booking information: {current_info}
@@ -243,28 +130,418 @@ class FlightAgent(BaseAgent):
             }}
             
             Do not include any other text, explanations, or formatting outside the JSON object."""),
-            ("user", "Extract booking information from the user intent expansion. User intent expansion: {user_intent_expansion}")
-        ])
+    ("user", "Extract booking information from the user intent expansion. User intent expansion: {user_intent_expansion}")
+])
+
+EXTRACTION_PARSER = JsonOutputParser()
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert at summarizing conversations. Update the concise summary of the flight booking conversation with its latest messages.\n\nFocus on:\n1. User's main intent and what they wanted to accomplish\n2. Key booking information provided (dates, cities, passengers, etc.)\n3. Current status of the booking process\n4. Any important decisions or preferences mentioned\n\nKeep the summary concise but informative. Write in a natural, conversational tone."""),
+    ("user", "Previous summary:\n{summary}\n\nNew messages:\n{conversation_text}\n\nReturn the updated summary.")
+])
+
+BOOKING_SYSTEM_PROMPTS = {
+    "book_flight": """You are a helpful flight booking assistant. The user wants to book a flight.
+            
+Current booking information:
+- Departure: {departure_city}
+- Destination: {arrival_city}
+- Date: {date}
+- Round Trip: {round_trip}
+- Return Date: {return_date}
+- Passenger: {passenger_name}
+- Email: {email}
+- Passengers: {passengers}
+- Class: {class_type}
+
+Use the available tools to help the user complete their booking. First search for flights, then help them book if they choose one.""",
+    
+    "search_flights": """You are a flight search assistant. Help the user find available flights.
+
+Search criteria:
+- Departure: {departure_city}
+- Destination: {arrival_city}
+- Date: {date}
+- Round Trip: {round_trip}
+- Return Date: {return_date}
+- Passengers: {passengers}
+- Class: {class_type}
+
+Use the search_flights tool to find flights based on their requirements.
+If there is no suitable direct flight, use the search_connecting_flights tool to find itineraries with connections.
+If the user's dates are flexible or they want the cheapest day, use the fare_calendar tool.""",
+    
+    "check_weather": """You are a travel assistant. Help the user get weather information for their destination.
+Use the get_weather tool to provide weather updates.""",
+    
+    "flight_status": """You are a flight status assistant. Help the user check the status of their flight.
+Use the get_flight_status tool to provide current flight information.""",
+    
+    "booking_info": """You are a booking information assistant. Help the user get information about their booking.
+Use the get_booking_info tool to provide booking details.""",
+    
+    "cancel_booking": """You are a booking cancellation assistant. Help the user cancel their flight booking.
+Use the cancel_booking tool to process the cancellation."""
+}
+
+
+def booking_prompt(system_prompt: str) -> ChatPromptTemplate:
+    """Tool-enabled prompt: system prompt followed by the conversation."""
+    return ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        MessagesPlaceholder(variable_name="messages")
+    ])
+
+
+BOOKING_PROMPTS = {intent: booking_prompt(system_prompt) for intent, system_prompt in BOOKING_SYSTEM_PROMPTS.items()}
+DEFAULT_BOOKING_PROMPT = booking_prompt(DEFAULT_SYSTEM_PROMPT)
+
+
+class FlightAgent(BaseAgent):
+    """Enhanced flight booking agent with advanced features."""
+    
+    def __init__(self, fused: Optional[bool] = None):
+        super().__init__()
+        self.intent_parser = JsonOutputParser(pydantic_object=IntentClassification)
+        self.booking_parser = JsonOutputParser(pydantic_object=BookingInformation)
+        self.fused_parser = JsonOutputParser(pydantic_object=IntentExtraction)
+        # Fused mode classifies intent and extracts booking fields in one LLM call
+        self.fused = settings.agent.fused_intent_extraction if fused is None else fused
+        # Chains are built once per LLM and reused across turns
+        self._chains = {}
+    
+    def _chain(self, key, llm, build):
+        """Get a cached chain, rebuilding it if the LLM it was built on was replaced."""
+        cached = self._chains.get(key)
+        if cached is None or cached[0] is not llm:
+            cached = self._chains[key] = (llm, build(llm))
+        return cached[1]
+    
+    @staticmethod
+    def _message_text(msg) -> str:
+        """Get the plain text of a message whose content may be a list of parts."""
+        if isinstance(msg.content, list) and msg.content:
+            return msg.content[0]['text']
+        if isinstance(msg.content, str):
+            return msg.content
+        return ""
+    
+    def _build_conversation_entry(self, state: FlightBookingState, config: RunnableConfig = None):
+        """Build the conversation entry for the latest user/assistant pair, or None."""
+        messages = state.get("messages", [])
+        
+        # Lấy các giá trị từ RunnableConfig
+        thread_id = None
+        user_id = None
+        email = None
+        phone = None
+        session_id = None
+        
+        if config and "configurable" in config:
+            configurable = config["configurable"]
+            thread_id = configurable.get("thread_id")
+            user_id = configurable.get("user_id")
+            email = configurable.get("email")
+            phone = configurable.get("phone")
+            session_id = configurable.get("session_id")
+        
+        # Get the latest user message and assistant response
+        user_input = ""
+        assistant_response = ""
+        
+        # Find the latest user message and assistant response pair
+        for i in range(len(messages) - 1, -1, -1):
+            msg = messages[i]
+            if isinstance(msg, HumanMessage):
+                user_input = self._message_text(msg)
+                
+                # Look for assistant response after this user message
+                if i + 1 < len(messages):
+                    next_msg = messages[i + 1]
+                    if isinstance(next_msg, AIMessage):
+                        assistant_response = next_msg.content
+                break
         
-        extraction_parser = JsonOutputParser()
-        extraction_chain = extraction_prompt | self.processed_llm | extraction_parser
+        if not user_input:
+            return None
         
+        # Conversation entry với metadata đầy đủ
+        return {
+            "thread_id": thread_id,
+            "user_input": user_input,
+            "assistant_response": assistant_response,
+            "user_id": user_id,
+            "session_id": session_id,
+            "metadata": {
+                "email": email,
+                "phone": phone,
+                "message_count": len(messages),
+                "timestamp": str(datetime.now()),
+                "source": "langgraph_node"
+            }
+        }
+    
+    def _log_conversation_saved(self, success: bool, entry: dict):
+        """Log the outcome of saving a conversation entry."""
+        if success:
+            logger.info(f"Conversation entry saved for thread {entry['thread_id']} (user: {entry['user_id']})")
+        else:
+            logger.warning(f"Failed to save conversation entry for thread {entry['thread_id']}")
+    
+    def _save_conversation_update(self, state: FlightBookingState) -> FlightBookingState:
+        """State returned by save_conversation."""
+        # Return state without intent_classification and booking_info to avoid conflicts
+        return {
+            "messages": state.get("messages", []),
+            "conversation_history": state.get("conversation_history"),
+            "current_step": state.get("current_step", ""),
+            "data": state.get("data", ""),
+            "action": state.get("action", {}),
+            "thread_id": state.get("thread_id", ""),
+            "user_id": state.get("user_id", "")
+        }
+    
+    def save_conversation(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Save conversation entry to storage."""
         try:
-            extraction_result = extraction_chain.invoke({
-                "current_info": current_info,
-                "missing_fields": missing_fields,
-                "user_intent_expansion": user_intent_expansion
-            })
-            
-            logger.info(f"Extraction result: {extraction_result}")
-            
-            # Update current_info with extracted information
-            if extraction_result.get("updated_info"):
-                current_info.update(extraction_result["updated_info"])
-                logger.info(f"Updated booking info: {current_info}")
+            entry = self._build_conversation_entry(state, config)
+            if entry:
+                success = conversation_service.add_conversation_entry(**entry)
+                self._log_conversation_saved(success, entry)
+        except Exception as e:
+            logger.error(f"Error in save_conversation: {e}")
+        return self._save_conversation_update(state)
+    
+    async def asave_conversation(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of save_conversation."""
+        try:
+            entry = self._build_conversation_entry(state, config)
+            if entry:
+                success = await conversation_service.aadd_conversation_entry(**entry)
+                self._log_conversation_saved(success, entry)
+        except Exception as e:
+            logger.error(f"Error in save_conversation: {e}")
+        return self._save_conversation_update(state)
+    
+    def manage_memory(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Fold turns beyond the token-budgeted window into the running conversation summary."""
+        return conversation_memory.update(state, self.processed_llm)
+    
+    async def amanage_memory(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of manage_memory."""
+        return await conversation_memory.aupdate(state, self.processed_llm)
+    
+    def _intent_inputs(self, state: FlightBookingState) -> dict:
+        """Build the classifier input from the recent conversation."""
+        messages = state.get("messages", [])
+        
+        recent_messages = []
+        for msg in messages[-10:]:
+            if isinstance(msg, HumanMessage):
+                recent_messages.append("User: " + self._message_text(msg))
+            elif isinstance(msg, AIMessage):
+                recent_messages.append("Assistant: " + msg.content)
                 
+        logger.info(f"Recent messages for intent classification: {recent_messages}")
+        
+        # Combine all recent messages for context
+        combined_text = " ".join(recent_messages) if recent_messages else ""
+        return {"combined_text": combined_text}
+    
+    def _intent_chain(self):
+        """Get the intent classification chain."""
+        return self._chain("intent", self.processed_llm, lambda llm: INTENT_PROMPT | llm | self.intent_parser)
+    
+    def _intent_update(self, state: FlightBookingState, result: dict) -> FlightBookingState:
+        """State update for a successful classification."""
+        logger.info(f"Intent classification result: {result}")
+        return {
+            "intent_classification": IntentClassification(
+                intent=result["intent"],
+                confidence=result["confidence"],
+                reasoning=result["reasoning"],
+                language=result.get("language", "en")  # Default to English if not detected
+            ),
+            "messages": state["messages"]
+        }
+    
+    def _intent_fallback(self, state: FlightBookingState, error: Exception) -> FlightBookingState:
+        """State update when classification fails."""
+        logger.error(f"Intent classification failed: {error}")
+        return {
+            "intent_classification": IntentClassification(
+                intent="general_inquiry",
+                confidence=0.5,
+                reasoning="Intent classification failed, defaulting to general inquiry",
+                language="en"  # Default to English on error
+            ),
+            "messages": state["messages"]
+        }
+    
+    def _fast_intent(self, state: FlightBookingState, extract: bool = False):
+        """Try the rule-based classifier; None means the LLM must decide.
+        
+        With ``extract`` (the fused node) booking intents also need every
+        field parsed locally; the hit is only recorded once the LLM is skipped.
+        """
+        if not settings.agent.fast_intent_enabled:
+            return None
+        
+        messages = state.get("messages", [])
+        if not messages or not isinstance(messages[-1], HumanMessage):
+            return None
+        
+        result = intent_rules.classify(self._message_text(messages[-1]), state)
+        if result and result["confidence"] >= settings.agent.fast_intent_threshold:
+            update = self._intent_update(state, result)
+            if not extract or self._fast_extraction(state, update):
+                intent_rules.record(result["path"])
+                logger.info(f"Intent fast path ({result['path']}) hit")
+                return update
+        
+        intent_rules.record("llm_fallback")
+        return None
+    
+    def classify_intent(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Enhanced intent classification with confidence scoring."""
+        fast_update = self._fast_intent(state)
+        if fast_update is not None:
+            return fast_update
+        
+        try:
+            result = self._intent_chain().invoke(self._intent_inputs(state))
+            return self._intent_update(state, result)
         except Exception as e:
-            logger.error(f"Information extraction failed: {e}")
+            return self._intent_fallback(state, e)
+    
+    async def aclassify_intent(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of classify_intent."""
+        fast_update = self._fast_intent(state)
+        if fast_update is not None:
+            return fast_update
+        
+        try:
+            result = await self._intent_chain().ainvoke(self._intent_inputs(state))
+            return self._intent_update(state, result)
+        except Exception as e:
+            return self._intent_fallback(state, e)
+    
+    def _fused_inputs(self, state: FlightBookingState) -> dict:
+        """Build the fused classifier input: conversation plus current booking context."""
+        inputs = self._intent_inputs(state)
+        inputs["current_info"] = state.get("booking_info", {})
+        return inputs
+    
+    def _fused_chain(self):
+        """Get the fused intent classification and booking extraction chain."""
+        return self._chain("fused", self.processed_llm, lambda llm: FUSED_PROMPT | llm | self.fused_parser)
+    
+    def _fused_update(self, state: FlightBookingState, result: dict) -> FlightBookingState:
+        """State update for a successful fused classification and extraction."""
+        extraction = IntentExtraction.model_validate(result)
+        update = self._intent_update(state, result)
+        # Only fields the model actually returned, not BookingInformation defaults
+        update["extracted_booking_info"] = extraction.booking_info.model_dump(exclude_unset=True, exclude_none=True)
+        return update
+    
+    def _fast_extraction(self, state: FlightBookingState, update: FlightBookingState) -> bool:
+        """Add the locally parsed booking fields to a fused fast-path update; False if the LLM must extract."""
+        intent = update["intent_classification"].intent
+        booking_info = dict(state.get("booking_info", {}))
+        if intent in ["book_flight", "search_flights"] and not self._local_extraction(state, intent, booking_info):
+            return False
+        update["extracted_booking_info"] = booking_info if intent in ["book_flight", "search_flights"] else {}
+        return True
+    
+    def classify_and_extract(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Classify intent and extract booking fields with a single LLM call."""
+        fast_update = self._fast_intent(state, extract=True)
+        if fast_update is not None:
+            return fast_update
+        
+        try:
+            result = self._fused_chain().invoke(self._fused_inputs(state))
+            return self._fused_update(state, result)
+        except Exception as e:
+            update = self._intent_fallback(state, e)
+            update["extracted_booking_info"] = {}
+            return update
+    
+    async def aclassify_and_extract(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of classify_and_extract."""
+        fast_update = self._fast_intent(state, extract=True)
+        if fast_update is not None:
+            return fast_update
+        
+        try:
+            result = await self._fused_chain().ainvoke(self._fused_inputs(state))
+            return self._fused_update(state, result)
+        except Exception as e:
+            update = self._intent_fallback(state, e)
+            update["extracted_booking_info"] = {}
+            return update
+    
+    def _local_extraction(self, state: FlightBookingState, intent: str, current_info: dict) -> bool:
+        """Fill booking fields parseable without the LLM; True if the LLM call can be skipped."""
+        messages = state.get("messages", [])
+        if not settings.agent.local_extraction_enabled or not messages or not isinstance(messages[-1], HumanMessage):
+            return False
+        
+        pending_field = None
+        if state.get("current_step") == "collecting_info":
+            pending_field = pending_booking_field(current_info, intent)
+        
+        result = booking_extractor.extract(self._message_text(messages[-1]), pending_field,
+                                           departure_date=current_info.get("date"))
+        if result.fields:
+            logger.info(f"Local extraction result: {result.fields} (complete: {result.complete})")
+            if result.complete:
+                current_info.update(result.fields)
+            else:
+                # Partial parse ("Paris Hilton", "2.5 hours"): never overwrite what the user already gave
+                current_info.update({key: value for key, value in result.fields.items()
+                                     if key == pending_field or current_info.get(key) in (None, "")})
+        return result.complete
+    
+    def _extraction_request(self, state: FlightBookingState):
+        """Get the booking info to update and the inputs for the extraction chain (None if not needed)."""
+        intent_classification = state.get("intent_classification")
+        intent = intent_classification.intent if intent_classification else ""
+        user_intent_expansion = intent_classification.reasoning if intent_classification else ""
+
+        current_info = state.get("booking_info", {})
+        required_fields = settings.booking.required_fields.get(intent, [])
+        
+        # Deterministic stage first; the LLM only extracts what is still missing
+        if self._local_extraction(state, intent, current_info):
+            return current_info, None
+        missing_fields = [field for field in required_fields if not current_info.get(field)]
+        
+        return current_info, {
+            "current_info": current_info,
+            "missing_fields": missing_fields,
+            "user_intent_expansion": user_intent_expansion
+        }
+    
+    def _extraction_chain(self):
+        """Get the booking information extraction chain."""
+        # Use LLM to extract booking information from user's latest message
+        return self._chain("extraction", self.processed_llm, lambda llm: EXTRACTION_PROMPT | llm | EXTRACTION_PARSER)
+    
+    def _apply_extraction(self, current_info: dict, extraction_result: dict):
+        """Merge extracted values into the current booking info."""
+        logger.info(f"Extraction result: {extraction_result}")
+        
+        # Update current_info with extracted information
+        if extraction_result.get("updated_info"):
+            current_info.update(extraction_result["updated_info"])
+            logger.info(f"Updated booking info: {current_info}")
+    
+    def _next_booking_step(self, state: FlightBookingState, current_info: dict) -> FlightBookingState:
+        """Ask for the next missing field, or report that booking info is complete."""
+        intent_classification = state.get("intent_classification")
+        intent = intent_classification.intent if intent_classification else ""
+        required_fields = settings.booking.required_fields.get(intent, [])
         
         # Now determine what information is still missing using simple logic
         missing_fields = [field for field in required_fields if field not in current_info.keys()]
@@ -307,8 +584,9 @@ class FlightAgent(BaseAgent):
             }
 
             # Stream câu hỏi theo từng phần
-            for piece in chunk_text(question, n=4):
-                writer({"type": "question_chunk", "content": piece})
+            emitter = StreamEmitter(writer, "question_chunk")
+            emitter.write(question)
+            emitter.flush()
 
             return {
                 "booking_info": current_info,
@@ -324,8 +602,9 @@ class FlightAgent(BaseAgent):
         final_msg = question_templates.get_completion_message(detected_language)
         
         # Stream thông báo hoàn thành
-        for piece in chunk_text(final_msg, n=4):
-            writer({"type": "completion_chunk", "content": piece})
+        emitter = StreamEmitter(writer, "completion_chunk")
+        emitter.write(final_msg)
+        emitter.flush()
         
         return {
             "current_step": "info_complete",
@@ -333,96 +612,245 @@ class FlightAgent(BaseAgent):
             "messages": [AIMessage(content=final_msg)]
         }
     
-    def process_booking(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
-        """Enhanced main processing node with better tool handling and conversation flow."""
-        intent_classification = state.get("intent_classification")
-        intent = intent_classification.intent if intent_classification else ""
-        booking_info = state.get("booking_info", {})
-        
-        # Create context-aware system prompt
-        system_prompts = {
-            "book_flight": f"""You are a helpful flight booking assistant. The user wants to book a flight.
-            
-Current booking information:
-- Departure: {booking_info.get('departure_city', 'Not specified')}
-- Destination: {booking_info.get('arrival_city', 'Not specified')}
-- Date: {booking_info.get('date', 'Not specified')}
-- Round Trip: {'Yes' if booking_info.get('round_trip') else 'No' if booking_info.get('round_trip') is False else 'Not specified'}
-- Return Date: {booking_info.get('return_date', 'Not specified') if booking_info.get('round_trip') else 'N/A'}
-- Passenger: {booking_info.get('passenger_name', 'Not specified')}
-- Email: {booking_info.get('email', 'Not specified')}
-- Passengers: {booking_info.get('passengers', 1)}
-- Class: {booking_info.get('class_type', 'economy')}
-
-Use the available tools to help the user complete their booking. First search for flights, then help them book if they choose one.""",
-            
-            "search_flights": f"""You are a flight search assistant. Help the user find available flights.
-
-Search criteria:
-- Departure: {booking_info.get('departure_city', 'Not specified')}
-- Destination: {booking_info.get('arrival_city', 'Not specified')}
-- Date: {booking_info.get('date', 'Not specified')}
-- Round Trip: {'Yes' if booking_info.get('round_trip') else 'No' if booking_info.get('round_trip') is False else 'Not specified'}
-- Return Date: {booking_info.get('return_date', 'Not specified') if booking_info.get('round_trip') else 'N/A'}
-- Passengers: {booking_info.get('passengers', 1)}
-- Class: {booking_info.get('class_type', 'economy')}
-
-Use the search_flights tool to find flights based on their requirements.""",
-            
-            "check_weather": """You are a travel assistant. Help the user get weather information for their destination.
-Use the get_weather tool to provide weather updates.""",
-            
-            "flight_status": """You are a flight status assistant. Help the user check the status of their flight.
-Use the get_flight_status tool to provide current flight information.""",
-            
-            "booking_info": """You are a booking information assistant. Help the user get information about their booking.
-Use the get_booking_info tool to provide booking details.""",
-            
-            "cancel_booking": """You are a booking cancellation assistant. Help the user cancel their flight booking.
-Use the cancel_booking tool to process the cancellation."""
-        }
+    def collect_booking_info(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Intelligently extract and request missing booking information with streaming."""
+        current_info, extraction_inputs = self._extraction_request(state)
         
-        system_prompt = system_prompts.get(intent, DEFAULT_SYSTEM_PROMPT)
+        try:
+            if extraction_inputs is not None:
+                extraction_result = self._extraction_chain().invoke(extraction_inputs)
+                self._apply_extraction(current_info, extraction_result)
+        except Exception as e:
+            logger.error(f"Information extraction failed: {e}")
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            MessagesPlaceholder(variable_name="messages")
-        ])
+        return self._next_booking_step(state, current_info)
+    
+    async def acollect_booking_info(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of collect_booking_info."""
+        current_info, extraction_inputs = self._extraction_request(state)
         
-        # Create the chain with tools
-        chain = prompt | self.llm.bind_tools(self.tools)
+        try:
+            if extraction_inputs is not None:
+                extraction_result = await self._extraction_chain().ainvoke(extraction_inputs)
+                self._apply_extraction(current_info, extraction_result)
+        except Exception as e:
+            logger.error(f"Information extraction failed: {e}")
         
-        # Get response from LLM
-        response = chain.invoke({"messages": state["messages"]})
+        return self._next_booking_step(state, current_info)
+    
+    def collect_extracted_info(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Fused-mode collect_info: merge fields extracted by classify_and_extract, then ask for the next one."""
+        current_info = state.get("booking_info", {})
+        extracted_info = state.get("extracted_booking_info") or {}
+        self._apply_extraction(current_info, {"updated_info": extracted_info})
+        return self._next_booking_step(state, current_info)
+    
+    def _booking_context(self, state: FlightBookingState) -> dict:
+        """Template variables of the booking prompts."""
+        booking_info = state.get("booking_info", {})
+        round_trip = booking_info.get("round_trip")
+        return {
+            "departure_city": booking_info.get("departure_city", "Not specified"),
+            "arrival_city": booking_info.get("arrival_city", "Not specified"),
+            "date": booking_info.get("date", "Not specified"),
+            "round_trip": "Yes" if round_trip else "No" if round_trip is False else "Not specified",
+            "return_date": booking_info.get("return_date", "Not specified") if round_trip else "N/A",
+            "passenger_name": booking_info.get("passenger_name", "Not specified"),
+            "email": booking_info.get("email", "Not specified"),
+            "passengers": booking_info.get("passengers", 1),
+            "class_type": booking_info.get("class_type", "economy")
+        }
+    
+    def _booking_chain(self, state: FlightBookingState):
+        """Get the tool-enabled chain for the intent (context-aware system prompt filled from ``_booking_context``)."""
+        intent_classification = state.get("intent_classification")
+        intent = intent_classification.intent if intent_classification else ""
+        prompt_key = intent if intent in BOOKING_PROMPTS else None
         
-        # Handle tool calls if any
-        if response.tool_calls:
-            tool_results = []
+        # The intent's tools (bound once per intent); all tools when unsure of the intent
+        confidence = intent_classification.confidence if intent_classification else 0.0
+        toolset = settings.tool_selection.get_toolset(intent, confidence)
+        return self._chain(("booking", prompt_key, toolset), self.tool_registry.bound_llm(self.llm, toolset),
+                           lambda llm: BOOKING_PROMPTS.get(prompt_key, DEFAULT_BOOKING_PROMPT) | llm)
+    
+    def _format_tool_result(self, tool_name: str, result=None, error: Exception = None) -> str:
+        """Format one tool result for the reply."""
+        if error is not None:
+            return f"Error with {tool_name}: {str(error)}"
+        return f"📋 {tool_name.replace('_', ' ').title()}: {result}"
+    
+    def _tool_calls(self, response) -> list:
+        """Resolve the reply's tool calls to ``(tool, args)`` pairs, skipping unknown tools."""
+        calls = []
+        for tool_call in response.tool_calls:
+            tool = self.get_tool_by_name(tool_call["name"])
+            if tool:
+                calls.append((tool, tool_call["args"]))
+        return calls
+    
+    def _tool_messages(self, response, results: list) -> list:
+        """Answer every tool call of the reply with a ToolMessage (unknown tools get an error)."""
+        results = iter(results)
+        messages = []
+        for tool_call in response.tool_calls:
+            if self.get_tool_by_name(tool_call["name"]):
+                result = next(results)
+                content = str(result.result) if result.error is None else f"Error: {str(result.error)}"
+            else:
+                content = f"Error: unknown tool {tool_call['name']}"
+            messages.append(ToolMessage(content=content, tool_call_id=tool_call["id"], name=tool_call["name"]))
+        return messages
+    
+    @staticmethod
+    def _progress_writer():
+        """Stream writer of the running graph, or a no-op when called outside one."""
+        try:
+            return get_stream_writer()
+        except RuntimeError:
+            return lambda chunk: None
+    
+    @staticmethod
+    def _loop_tokens(response, messages: list) -> int:
+        """Tokens spent by one loop LLM call (usage metadata, else ~4 characters per token)."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            return usage.get("total_tokens", 0)
+        return sum(len(str(message.content)) for message in messages + [response]) // 4
+    
+    def _stream_tool_progress(self, writer, iteration: int, response, results: list = None):
+        """Stream ``tool_progress`` events before (no results) and after the tools of an iteration run."""
+        if results is None:
             for tool_call in response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                
-                # Find and execute the tool
-                tool = self.get_tool_by_name(tool_name)
-                if tool:
-                    try:
-                        result = tool.invoke(tool_args)
-                        tool_results.append(f"📋 {tool_name.replace('_', ' ').title()}: {result}")
-                    except Exception as e:
-                        tool_results.append(f"Error with {tool_name}: {str(e)}")
-            
-            # Combine response with tool results
-            final_response = f"{response.content}\n\n" + "\n".join(tool_results)
-        else:
-            final_response = response.content
+                writer({"type": "tool_progress", "iteration": iteration, "tool": tool_call["name"], "status": "started"})
+            return
+        for result in results:
+            writer({"type": "tool_progress", "iteration": iteration, "tool": result.name,
+                    "status": "done" if result.error is None else "error",
+                    "elapsed_ms": round(result.elapsed * 1000, 1)})
+    
+    def _start_tool_loop(self, state: FlightBookingState) -> dict:
+        """Per-turn state of the tool loop; one emitter streams everything the final reply will contain."""
+        writer = self._progress_writer()
+        return {
+            "state": state,
+            "chain": self._booking_chain(state),
+            "context": self._booking_context(state),
+            "writer": writer,
+            "emitter": StreamEmitter(writer, "answer_chunk"),
+            "messages": [],
+            "inputs": None,
+            "tokens": 0,
+            "answer": ""
+        }
+    
+    def _loop_inputs(self, loop: dict) -> dict:
+        """Chain inputs of the next loop LLM call: conversation, then this turn's replies and tool results."""
+        state = loop["state"]
+        messages = conversation_memory.summary_message(state) + state["messages"] + loop["messages"]
+        loop["inputs"] = messages
+        return {**loop["context"], "messages": messages}
+    
+    @staticmethod
+    def _reply_chunk(loop: dict, chunk, started: bool) -> bool:
+        """Stream the text of one LLM chunk as ``answer_chunk`` events and add it to the turn's answer.
         
-
+        Text written next to tool calls is kept in the answer too, since it has already been streamed;
+        replies are separated by a blank line. Returns whether this reply has streamed text yet.
+        """
+        if not chunk.content or not isinstance(chunk.content, str):
+            return started
+        text = chunk.content
+        if not started and loop["answer"]:
+            text = "\n\n" + text
+        loop["emitter"].write(text)
+        loop["answer"] += text
+        return True
+    
+    def _stream_reply(self, loop: dict):
+        """Call the booking chain, streaming answer tokens as they arrive; returns the complete message."""
+        reply, started = None, False
+        for chunk in loop["chain"].stream(self._loop_inputs(loop)):
+            started = self._reply_chunk(loop, chunk, started)
+            reply = chunk if reply is None else reply + chunk
+        loop["emitter"].flush()
+        return message_chunk_to_message(reply)
+    
+    async def _astream_reply(self, loop: dict):
+        """Async version of _stream_reply."""
+        reply, started = None, False
+        async for chunk in loop["chain"].astream(self._loop_inputs(loop)):
+            started = self._reply_chunk(loop, chunk, started)
+            reply = chunk if reply is None else reply + chunk
+        loop["emitter"].flush()
+        return message_chunk_to_message(reply)
+    
+    def _loop_continues(self, loop: dict, iteration: int, response, results: list) -> bool:
+        """Record an iteration's tool results; False when the token budget is spent."""
+        self._stream_tool_progress(loop["writer"], iteration, response, results)
+        loop["tokens"] += self._loop_tokens(response, loop["inputs"])
+        if loop["tokens"] >= settings.agent.tool_loop_token_budget:
+            logger.info(f"Tool loop stopped after {iteration} iterations: token budget spent ({loop['tokens']})")
+            return False
+        loop["messages"] += [response] + self._tool_messages(response, results)
+        return True
+    
+    def _booking_update(self, loop: dict, response, results: list) -> FlightBookingState:
+        """Final state update: the streamed answer, plus results of tools the loop could not feed back."""
+        if response.tool_calls:
+            # Streamed like the answer, so clients see exactly the reply that is stored
+            tool_results = [self._format_tool_result(r.name, r.result, r.error) for r in results]
+            loop["emitter"].write("\n\n" + "\n".join(tool_results))
+            loop["answer"] += "\n\n" + "\n".join(tool_results)
+            loop["emitter"].flush()
         
         return {
             "current_step": "completed",
-            "messages": [AIMessage(content=final_response)]
+            "messages": [AIMessage(content=loop["answer"] or response.content)]
         }
     
+    def process_booking(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Enhanced main processing node with better tool handling and conversation flow.
+        
+        Runs a bounded tool loop: tool results go back to the LLM as
+        ToolMessages until it answers without tools, ``max_tool_iterations``
+        LLM calls were made or ``tool_loop_token_budget`` is spent. Only the
+        final answer is added to the conversation state. Answer tokens are
+        streamed as ``answer_chunk`` events while the LLM generates them, and
+        the stored answer is exactly the streamed text.
+        """
+        loop = self._start_tool_loop(state)
+        results = []
+        
+        for iteration in range(1, settings.agent.max_tool_iterations + 1):
+            response = self._stream_reply(loop)
+            if not response.tool_calls:
+                break
+            
+            # Run the tool calls (independent ones concurrently), results in call order
+            self._stream_tool_progress(loop["writer"], iteration, response)
+            results = tool_executor.run(self._tool_calls(response))
+            if not self._loop_continues(loop, iteration, response, results):
+                break
+        
+        return self._booking_update(loop, response, results)
+    
+    async def aprocess_booking(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of process_booking."""
+        loop = self._start_tool_loop(state)
+        results = []
+        
+        for iteration in range(1, settings.agent.max_tool_iterations + 1):
+            response = await self._astream_reply(loop)
+            if not response.tool_calls:
+                break
+            
+            self._stream_tool_progress(loop["writer"], iteration, response)
+            results = await tool_executor.arun(self._tool_calls(response))
+            if not self._loop_continues(loop, iteration, response, results):
+                break
+        
+        return self._booking_update(loop, response, results)
+    
     def route_based_on_intent(self, state: FlightBookingState) -> Literal["collect_info", "process_booking", "end"]:
         """Enhanced routing based on intent, confidence, and current state."""
         intent_classification = state.get("intent_classification")
@@ -459,114 +887,111 @@ Use the cancel_booking tool to process the cancellation."""
         
         return "process_booking"
     
+    def _summary_request(self, state: FlightBookingState, config: RunnableConfig = None):
+        """Collect what summarization needs, or None if this turn should not be summarized."""
+        messages = state.get("messages", [])
+        if len(messages) < 5:
+            # Không đủ tin nhắn để tóm tắt, bỏ qua
+            return None
+        
+        # Get config values
+        thread_id = None
+        user_id = None
+        
+        if config and "configurable" in config:
+            configurable = config["configurable"]
+            thread_id = configurable.get("thread_id")
+            user_id = configurable.get("user_id")
+        
+        if not thread_id or not user_id:
+            logger.warning("Missing thread_id or user_id for conversation summary")
+            return None
+        
+        return {
+            "thread_id": thread_id,
+            "user_id": user_id,
+            "messages": messages,
+            "booking_info": state.get("booking_info", {}),
+            "summarize": self._summarize_incremental
+        }
+    
+    def _summary_chain(self):
+        """Get the conversation summary chain."""
+        return self._chain("summary", self.processed_llm, lambda llm: SUMMARY_PROMPT | llm)
+    
+    def _summarize_incremental(self, previous_summary: str, conversation_text: str) -> str:
+        """Update the previous summary with the new messages (one LLM call)."""
+        return self._summary_chain().invoke({
+            "summary": previous_summary or "(none)",
+            "conversation_text": conversation_text
+        }).content
+    
+    def _summary_update(self, state: FlightBookingState) -> FlightBookingState:
+        """State returned by summarize_conversation (unchanged)."""
+        return {
+            "messages": state.get("messages", []),
+            "thread_id": state.get("thread_id", ""),
+            "user_id": state.get("user_id", "")
+        }
+    
     def summarize_conversation(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
-        """Summarize the conversation and save to database if enough messages."""
+        """Queue the turn's new messages for the incremental background summary of the thread."""
         try:
-            messages = state.get("messages", [])
-            if len(messages) < 5:
-                # Không đủ tin nhắn để tóm tắt, bỏ qua
-                return {
-                    "messages": state.get("messages", []),
-                    "thread_id": state.get("thread_id", ""),
-                    "user_id": state.get("user_id", "")
-                }
-            intent_classification = state.get("intent_classification")
-            booking_info = state.get("booking_info", {})
-            
-            # Get config values
-            thread_id = None
-            user_id = None
-            
-            if config and "configurable" in config:
-                configurable = config["configurable"]
-                thread_id = configurable.get("thread_id")
-                user_id = configurable.get("user_id")
-            
-            if not thread_id or not user_id:
-                logger.warning("Missing thread_id or user_id for conversation summary")
-                return {
-                    "messages": state.get("messages", []),
-                    "thread_id": state.get("thread_id", ""),
-                    "user_id": state.get("user_id", "")
-                }
-            
-            # Create conversation text for summarization
-            conversation_text = ""
-            for msg in messages[-10:]:  # Last 10 messages
-                if isinstance(msg, HumanMessage):
-                    if isinstance(msg.content, list) and msg.content:
-                        conversation_text += f"User: {msg.content[0]['text']}\n"
-                    elif isinstance(msg.content, str):
-                        conversation_text += f"User: {msg.content}\n"
-                elif isinstance(msg, AIMessage):
-                    conversation_text += f"Assistant: {msg.content}\n"
-            
-            # Create simple summary prompt
-            summary_prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert at summarizing conversations. Create a concise summary of the flight booking conversation.\n\nFocus on:\n1. User's main intent and what they wanted to accomplish\n2. Key booking information provided (dates, cities, passengers, etc.)\n3. Current status of the booking process\n4. Any important decisions or preferences mentioned\n\nKeep the summary concise but informative. Write in a natural, conversational tone."""),
-                ("user", "Summarize this conversation:\n{conversation_text}")
-            ])
-            
-            try:
-                # Get simple text summary from LLM
-                summary_chain = summary_prompt | self.processed_llm
-                summary_text = summary_chain.invoke({"conversation_text": conversation_text})
-                
-                # Save summary to database
-                success = conversation_service.save_conversation_summary(
-                    thread_id=thread_id,
-                    user_id=user_id,
-                    summary_text=summary_text.content,
-                    key_points=None,
-                    intent_summary=None,
-                    booking_info=booking_info
-                )
-                
-                if success:
-                    logger.info(f"Conversation summary saved for thread {thread_id}")
+            request = self._summary_request(state, config)
+            if request is not None:
+                summary_worker.submit(**request)
+        except Exception as e:
+            logger.error(f"Error in summarize_conversation: {e}")
+        
+        # Return state unchanged
+        return self._summary_update(state)
+    
+    async def asummarize_conversation(self, state: FlightBookingState, config: RunnableConfig = None) -> FlightBookingState:
+        """Async version of summarize_conversation."""
+        try:
+            request = self._summary_request(state, config)
+            if request is not None:
+                if summary_worker.background:
+                    summary_worker.submit(**request)
                 else:
-                    logger.warning(f"Failed to save conversation summary for thread {thread_id}")
-                
-            except Exception as e:
-                logger.error(f"Failed to generate conversation summary: {e}")
-                # Save basic summary on error
-                conversation_service.save_conversation_summary(
-                    thread_id=thread_id,
-                    user_id=user_id,
-                    summary_text=f"Conversation summary generation failed: {str(e)}",
-                    key_points=None,
-                    intent_summary=None,
-                    booking_info=booking_info
-                )
-            
-            # Return state unchanged
-            return {
-                "messages": state.get("messages", []),
-                "thread_id": state.get("thread_id", ""),
-                "user_id": state.get("user_id", "")
-            }
+                    # Due summaries run inline, keep them off the event loop
+                    await asyncio.to_thread(summary_worker.submit, **request)
         except Exception as e:
             logger.error(f"Error in summarize_conversation: {e}")
-            return {
-                "messages": state.get("messages", []),
-                "thread_id": state.get("thread_id", ""),
-                "user_id": state.get("user_id", "")
-            }
+        
+        return self._summary_update(state)
     
-    def create_graph(self) -> StateGraph:
-        """Create the enhanced flight booking agent graph."""
+    def create_graph(self, use_async: bool = False, fused: Optional[bool] = None) -> StateGraph:
+        """Create the enhanced flight booking agent graph.
+        
+        With ``use_async`` the nodes are the async variants, for ``arun``/``astream``.
+        With ``fused`` (defaults to ``self.fused``) ``classify_intent`` also extracts booking
+        fields in the same LLM call and ``collect_info`` only merges them.
+        """
+        if fused is None:
+            fused = self.fused
         workflow = StateGraph(FlightBookingState)
         
         # Add nodes
-        workflow.add_node("save_conversation", self.save_conversation)
-        workflow.add_node("classify_intent", self.classify_intent)
-        workflow.add_node("collect_info", self.collect_booking_info)
-        workflow.add_node("process_booking", self.process_booking)
-        workflow.add_node("summarize_conversation", self.summarize_conversation)
-        
-        # Add edges - separate flows
-        workflow.add_edge(START, "save_conversation")
-        workflow.add_edge(START, "classify_intent")
+        if use_async:
+            workflow.add_node("manage_memory", self.amanage_memory)
+            workflow.add_node("save_conversation", self.asave_conversation)
+            workflow.add_node("classify_intent", self.aclassify_and_extract if fused else self.aclassify_intent)
+            workflow.add_node("collect_info", self.collect_extracted_info if fused else self.acollect_booking_info)
+            workflow.add_node("process_booking", self.aprocess_booking)
+            workflow.add_node("summarize_conversation", self.asummarize_conversation)
+        else:
+            workflow.add_node("manage_memory", self.manage_memory)
+            workflow.add_node("save_conversation", self.save_conversation)
+            workflow.add_node("classify_intent", self.classify_and_extract if fused else self.classify_intent)
+            workflow.add_node("collect_info", self.collect_extracted_info if fused else self.collect_booking_info)
+            workflow.add_node("process_booking", self.process_booking)
+            workflow.add_node("summarize_conversation", self.summarize_conversation)
+        
+        # Add edges - trim the message window first, then separate flows
+        workflow.add_edge(START, "manage_memory")
+        workflow.add_edge("manage_memory", "save_conversation")
+        workflow.add_edge("manage_memory", "classify_intent")
         
         # Save conversation goes to summarize only
         workflow.add_edge("save_conversation", "summarize_conversation")
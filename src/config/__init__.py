@@ -2,13 +2,20 @@
 Configuration module for Flight Booking Agent
 """
 
-from .settings import Settings, settings, LLMConfig, AgentConfig, BookingConfig, MockDataConfig
+from .settings import Settings, settings, LLMConfig, AgentConfig, DatabaseConfig, MemoryConfig, StreamingConfig, ServerConfig, ToolCacheConfig, ToolExecutionConfig, ToolSelectionConfig, BookingConfig, MockDataConfig
 
 __all__ = [
     "Settings",
     "settings", 
     "LLMConfig",
     "AgentConfig", 
+    "DatabaseConfig",
+    "MemoryConfig",
+    "StreamingConfig",
+    "ServerConfig",
+    "ToolCacheConfig",
+    "ToolExecutionConfig",
+    "ToolSelectionConfig",
     "BookingConfig",
     "MockDataConfig"
 ] 
\ No newline at end of file
@@ -3,7 +3,7 @@ Configuration settings for the Flight Booking Agent
 """
 
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
@@ -37,6 +37,14 @@ class LLMConfig:
     max_tokens: int = 1000
     api_key: str = None
     base_url: str = "https://api.openai.com/v1"
+    # "openai", or the offline backends "fake" (scripted from the prompts) and "replay" (recorded replies)
+    provider: str = "openai"
+    fake_latency_ms: float = 0.0  # mean latency to the first token
+    fake_latency_jitter_ms: float = 0.0
+    fake_latency_distribution: str = "constant"  # constant, uniform, normal or lognormal
+    fake_token_ms: float = 0.0  # latency per following streamed token
+    fake_seed: int = 0
+    replay_file: str = None  # JSONL of {"content": ..., "tool_calls": [...]} replies
 
 
 @dataclass
@@ -45,10 +53,168 @@ class AgentConfig:
     name: str = "Flight Booking Agent"
     version: str = "1.0.0"
     intent_confidence_threshold: float = 0.6
+    # Rule-based pre-classifier answered before the LLM when confident enough
+    fast_intent_enabled: bool = True
+    fast_intent_threshold: float = 0.85
+    # Regex/gazetteer booking field extraction before the LLM extraction call
+    local_extraction_enabled: bool = True
+    # One LLM call for intent + booking fields instead of classify then extract
+    fused_intent_extraction: bool = False
+    # Tool loop in process_booking: LLM calls per turn and tokens they may spend
+    max_tool_iterations: int = 5
+    tool_loop_token_budget: int = 12000
     default_passengers: int = 1
     default_class_type: str = "economy"
 
 
+@dataclass
+class DatabaseConfig:
+    """Conversation database configuration settings."""
+    pool_size: int = 5
+    pool_timeout: float = 30.0
+    health_check_interval: float = 60.0
+    # Storage profile applied to every new connection
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 268435456  # 256 MB
+    cache_size: int = -16000  # negative = KiB, i.e. ~16 MB
+    busy_timeout: int = 5000  # milliseconds
+    # Write-behind buffer for conversation entries
+    write_behind: bool = True
+    write_queue_size: int = 1000
+    write_batch_size: int = 50
+    write_flush_interval: float = 0.2  # seconds
+    write_enqueue_timeout: float = 1.0  # seconds before falling back to a synchronous write
+    
+    def get_pragmas(self) -> Dict[str, Any]:
+        """Get the SQLite pragmas for this storage profile, in application order."""
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "busy_timeout": self.busy_timeout
+        }
+
+
+@dataclass
+class MemoryConfig:
+    """Conversation window kept in state; older turns are folded into a running summary."""
+    enabled: bool = True
+    max_turns: int = 10  # turns kept verbatim (a turn starts at a user message)
+    max_tokens: int = 3000  # token budget of the verbatim window
+    keep_turns: int = 4  # turns left after folding, so folds do not happen every turn
+    summary_max_tokens: int = 400
+    # Stored conversation summary: updated incrementally every N turns or once the thread is idle
+    background_summaries: bool = True
+    summary_every_turns: int = 5
+    summary_idle_seconds: float = 30.0
+
+
+@dataclass
+class StreamingConfig:
+    """Coalescing of streamed text events (question, completion and answer chunks)."""
+    coalesce: bool = True
+    min_chunk_bytes: int = 24  # chunk size for a consumer that keeps up
+    max_chunk_bytes: int = 512  # chunk size for a slow consumer
+    flush_interval: float = 0.02  # seconds text may wait in the buffer
+    slow_emit_seconds: float = 0.002  # emit time above which the consumer counts as slow
+
+
+@dataclass
+class ServerConfig:
+    """HTTP/SSE server settings (limits apply per worker process)."""
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 1
+    max_concurrency: int = 16  # turns running at once
+    max_queue: int = 64  # turns waiting for a slot before requests are shed with 429
+    queue_timeout: float = 10.0  # seconds a turn may wait for a slot
+    drain_timeout: float = 30.0  # seconds shutdown waits for running turns
+
+
+@dataclass
+class ToolCacheConfig:
+    """Tool result cache configuration settings."""
+    enabled: bool = True
+    max_entries: int = 1024
+    # Seconds a result stays valid per tool; 0 disables caching for that tool
+    search_flights_ttl: float = 60.0
+    get_weather_ttl: float = 600.0
+    get_flight_status_ttl: float = 30.0
+    
+    def get_ttls(self) -> Dict[str, float]:
+        """Get the TTL of each cached tool."""
+        return {
+            "search_flights": self.search_flights_ttl,
+            "get_weather": self.get_weather_ttl,
+            "get_flight_status": self.get_flight_status_ttl
+        }
+
+
+@dataclass
+class ToolExecutionConfig:
+    """Tool call execution settings for process_booking."""
+    parallel: bool = True
+    max_workers: int = 8
+    default_timeout: float = 30.0  # seconds per call
+    timeouts: Dict[str, float] = None
+    # Tools that change state run alone, in the order the model asked for them
+    sequential_tools: List[str] = None
+    
+    def __post_init__(self):
+        if self.timeouts is None:
+            self.timeouts = {}
+        
+        if self.sequential_tools is None:
+            self.sequential_tools = [
+                "book_flight", "cancel_booking", "checkout_cart", "remove_order_from_cart",
+                "confirm_payment", "refund_payment", "cancel_pending_payment"
+            ]
+    
+    def get_timeout(self, tool_name: str) -> float:
+        """Get the timeout of a tool in seconds."""
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+
+def parse_timeouts(value: str) -> Dict[str, float]:
+    """Parse per-tool timeouts written as ``name=seconds,name=seconds``."""
+    timeouts = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, seconds = item.split("=", 1)
+            timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+@dataclass
+class ToolSelectionConfig:
+    """Tools bound to the LLM per intent in process_booking."""
+    enabled: bool = True
+    # Below this intent confidence the LLM gets every tool
+    min_confidence: float = 0.6
+    # Intents not listed get every tool
+    intent_tools: Dict[str, List[str]] = None
+    
+    def __post_init__(self):
+        if self.intent_tools is None:
+            self.intent_tools = {
+                "book_flight": ["search_flights", "search_connecting_flights", "fare_calendar", "book_flight",
+                                "get_cart_summary", "checkout_cart", "get_payment_methods"],
+                "search_flights": ["search_flights", "search_connecting_flights", "fare_calendar", "get_weather"],
+                "check_weather": ["get_weather"],
+                "flight_status": ["get_flight_status"],
+                "booking_info": ["get_booking_info"],
+                "cancel_booking": ["get_booking_info", "cancel_booking"]
+            }
+    
+    def get_toolset(self, intent: str, confidence: float = 1.0) -> Optional[str]:
+        """Intent whose toolset to bind, or None for the full set (disabled, unmapped or low confidence)."""
+        if not self.enabled or confidence < self.min_confidence or intent not in self.intent_tools:
+            return None
+        return intent
+
+
 @dataclass
 class BookingConfig:
     """Booking configuration settings."""
@@ -114,13 +280,84 @@ class Settings:
                 temperature=float(os.getenv("LLM_TEMPERATURE", "0")),
                 max_tokens=int(os.getenv("LLM_MAX_TOKENS", "1000")),
                 api_key=os.getenv("OPENAI_API_KEY"),
-                base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+                base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+                provider=os.getenv("LLM_PROVIDER", "openai").lower(),
+                fake_latency_ms=float(os.getenv("LLM_FAKE_LATENCY_MS", "0")),
+                fake_latency_jitter_ms=float(os.getenv("LLM_FAKE_LATENCY_JITTER_MS", "0")),
+                fake_latency_distribution=os.getenv("LLM_FAKE_LATENCY_DISTRIBUTION", "constant").lower(),
+                fake_token_ms=float(os.getenv("LLM_FAKE_TOKEN_MS", "0")),
+                fake_seed=int(os.getenv("LLM_FAKE_SEED", "0")),
+                replay_file=os.getenv("LLM_REPLAY_FILE")
             )
             self.agent = AgentConfig(
                 intent_confidence_threshold=float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.6")),
+                fast_intent_enabled=os.getenv("FAST_INTENT_ENABLED", "true").lower() == "true",
+                fast_intent_threshold=float(os.getenv("FAST_INTENT_THRESHOLD", "0.85")),
+                local_extraction_enabled=os.getenv("LOCAL_EXTRACTION_ENABLED", "true").lower() == "true",
+                fused_intent_extraction=os.getenv("FUSED_INTENT_EXTRACTION", "false").lower() == "true",
+                max_tool_iterations=int(os.getenv("MAX_TOOL_ITERATIONS", "5")),
+                tool_loop_token_budget=int(os.getenv("TOOL_LOOP_TOKEN_BUDGET", "12000")),
                 default_passengers=int(os.getenv("DEFAULT_PASSENGERS", "1")),
                 default_class_type=os.getenv("DEFAULT_CLASS_TYPE", "economy")
             )
+            self.database = DatabaseConfig(
+                pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+                pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                health_check_interval=float(os.getenv("DB_HEALTH_CHECK_INTERVAL", "60")),
+                journal_mode=os.getenv("DB_JOURNAL_MODE", "WAL"),
+                synchronous=os.getenv("DB_SYNCHRONOUS", "NORMAL"),
+                mmap_size=int(os.getenv("DB_MMAP_SIZE", "268435456")),
+                cache_size=int(os.getenv("DB_CACHE_SIZE", "-16000")),
+                busy_timeout=int(os.getenv("DB_BUSY_TIMEOUT", "5000")),
+                write_behind=os.getenv("DB_WRITE_BEHIND", "true").lower() == "true",
+                write_queue_size=int(os.getenv("DB_WRITE_QUEUE_SIZE", "1000")),
+                write_batch_size=int(os.getenv("DB_WRITE_BATCH_SIZE", "50")),
+                write_flush_interval=float(os.getenv("DB_WRITE_FLUSH_INTERVAL", "0.2")),
+                write_enqueue_timeout=float(os.getenv("DB_WRITE_ENQUEUE_TIMEOUT", "1.0"))
+            )
+            self.memory = MemoryConfig(
+                enabled=os.getenv("MEMORY_WINDOW_ENABLED", "true").lower() == "true",
+                max_turns=int(os.getenv("MEMORY_MAX_TURNS", "10")),
+                max_tokens=int(os.getenv("MEMORY_MAX_TOKENS", "3000")),
+                keep_turns=int(os.getenv("MEMORY_KEEP_TURNS", "4")),
+                summary_max_tokens=int(os.getenv("MEMORY_SUMMARY_MAX_TOKENS", "400")),
+                background_summaries=os.getenv("SUMMARY_BACKGROUND", "true").lower() == "true",
+                summary_every_turns=int(os.getenv("SUMMARY_EVERY_TURNS", "5")),
+                summary_idle_seconds=float(os.getenv("SUMMARY_IDLE_SECONDS", "30"))
+            )
+            self.streaming = StreamingConfig(
+                coalesce=os.getenv("STREAM_COALESCE", "true").lower() == "true",
+                min_chunk_bytes=int(os.getenv("STREAM_MIN_CHUNK_BYTES", "24")),
+                max_chunk_bytes=int(os.getenv("STREAM_MAX_CHUNK_BYTES", "512")),
+                flush_interval=float(os.getenv("STREAM_FLUSH_MS", "20")) / 1000,
+                slow_emit_seconds=float(os.getenv("STREAM_SLOW_EMIT_MS", "2")) / 1000
+            )
+            self.server = ServerConfig(
+                host=os.getenv("SERVER_HOST", "127.0.0.1"),
+                port=int(os.getenv("SERVER_PORT", "8000")),
+                workers=int(os.getenv("SERVER_WORKERS", "1")),
+                max_concurrency=int(os.getenv("SERVER_MAX_CONCURRENCY", "16")),
+                max_queue=int(os.getenv("SERVER_MAX_QUEUE", "64")),
+                queue_timeout=float(os.getenv("SERVER_QUEUE_TIMEOUT", "10")),
+                drain_timeout=float(os.getenv("SERVER_DRAIN_TIMEOUT", "30"))
+            )
+            self.tool_cache = ToolCacheConfig(
+                enabled=os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true",
+                max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1024")),
+                search_flights_ttl=float(os.getenv("TOOL_CACHE_SEARCH_FLIGHTS_TTL", "60")),
+                get_weather_ttl=float(os.getenv("TOOL_CACHE_GET_WEATHER_TTL", "600")),
+                get_flight_status_ttl=float(os.getenv("TOOL_CACHE_GET_FLIGHT_STATUS_TTL", "30"))
+            )
+            self.tool_execution = ToolExecutionConfig(
+                parallel=os.getenv("PARALLEL_TOOL_CALLS", "true").lower() == "true",
+                max_workers=int(os.getenv("TOOL_MAX_WORKERS", "8")),
+                default_timeout=float(os.getenv("TOOL_TIMEOUT", "30")),
+                timeouts=parse_timeouts(os.getenv("TOOL_TIMEOUTS", ""))
+            )
+            self.tool_selection = ToolSelectionConfig(
+                enabled=os.getenv("TOOL_SUBSETS_ENABLED", "true").lower() == "true",
+                min_confidence=float(os.getenv("TOOL_SUBSET_MIN_CONFIDENCE", "0.6"))
+            )
             self.booking = BookingConfig()
             self.mock_data = MockDataConfig()
             # Project paths
@@ -138,15 +375,57 @@ class Settings:
         """Validate the configuration."""
         errors = []
         
-        if not self.llm.api_key:
+        if self.llm.provider not in ["openai", "fake", "replay"]:
+            errors.append("LLM_PROVIDER must be one of openai, fake, replay")
+        
+        if self.llm.provider == "openai" and not self.llm.api_key:
             errors.append("OPENAI_API_KEY is required (set in .env file or environment)")
         
+        if self.llm.provider == "replay" and not self.llm.replay_file:
+            errors.append("LLM_REPLAY_FILE is required with LLM_PROVIDER=replay")
+        
+        if self.llm.fake_latency_distribution not in ["constant", "uniform", "normal", "lognormal"]:
+            errors.append("LLM_FAKE_LATENCY_DISTRIBUTION must be one of constant, uniform, normal, lognormal")
+        
         if not (0 <= self.llm.temperature <= 2):
             errors.append("LLM_TEMPERATURE must be between 0 and 2")
         
         if not (0 <= self.agent.intent_confidence_threshold <= 1):
             errors.append("INTENT_CONFIDENCE_THRESHOLD must be between 0 and 1")
         
+        if not (0 <= self.agent.fast_intent_threshold <= 1):
+            errors.append("FAST_INTENT_THRESHOLD must be between 0 and 1")
+        
+        if not (0 <= self.tool_selection.min_confidence <= 1):
+            errors.append("TOOL_SUBSET_MIN_CONFIDENCE must be between 0 and 1")
+        
+        if self.database.pool_size < 1:
+            errors.append("DB_POOL_SIZE must be at least 1")
+        
+        if self.agent.max_tool_iterations < 1:
+            errors.append("MAX_TOOL_ITERATIONS must be at least 1")
+        
+        if not (1 <= self.memory.keep_turns <= self.memory.max_turns):
+            errors.append("MEMORY_KEEP_TURNS must be between 1 and MEMORY_MAX_TURNS")
+        
+        if self.memory.summary_every_turns < 1:
+            errors.append("SUMMARY_EVERY_TURNS must be at least 1")
+        
+        if not (1 <= self.streaming.min_chunk_bytes <= self.streaming.max_chunk_bytes):
+            errors.append("STREAM_MIN_CHUNK_BYTES must be between 1 and STREAM_MAX_CHUNK_BYTES")
+        
+        if self.server.max_concurrency < 1 or self.server.workers < 1:
+            errors.append("SERVER_MAX_CONCURRENCY and SERVER_WORKERS must be at least 1")
+        
+        if self.tool_execution.max_workers < 1:
+            errors.append("TOOL_MAX_WORKERS must be at least 1")
+        
+        if self.tool_cache.max_entries < 1:
+            errors.append("TOOL_CACHE_MAX_ENTRIES must be at least 1")
+        
+        if self.database.synchronous.upper() not in ["OFF", "NORMAL", "FULL", "EXTRA"]:
+            errors.append("DB_SYNCHRONOUS must be one of OFF, NORMAL, FULL, EXTRA")
+        
         if errors:
             print("❌ Configuration validation failed:")
             for error in errors:
@@ -0,0 +1,11 @@
+"""
+Server module for Flight Booking Agent
+"""
+
+from .app import AgentServer, ConcurrencyLimiter, create_app
+
+__all__ = [
+    "AgentServer",
+    "ConcurrencyLimiter",
+    "create_app"
+]
@@ -0,0 +1,302 @@
+"""
+ASGI HTTP/SSE server for Flight Booking Agent
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from ..config import settings, ServerConfig
+
+logger = logging.getLogger(__name__)
+
+THREAD_ROUTE = re.compile(r"^/threads/([^/]+)/(run|stream)$")
+MAX_BODY_BYTES = 64 * 1024
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot get a slot (queue full or queue timeout)."""
+
+
+class ConcurrencyLimiter:
+    """At most ``max_concurrency`` turns run at once; at most ``max_queue`` wait.
+
+    Requests wait for a slot, or before that for the previous turn of their
+    thread (``queue``); both count against ``max_queue``. A request arriving
+    with the queue full, or waiting longer than ``queue_timeout``, raises
+    ``Overloaded`` (answered with 429).
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def queue(self, primitive, waiting_for: str, busy: Optional[bool] = None):
+        """Acquire an asyncio lock or semaphore, queueing if it is ``busy`` (default: ``locked()``)."""
+        if not (primitive.locked() if busy is None else busy):
+            # Free: acquired at once, without a wait_for task that would let others see it free too
+            await primitive.acquire()
+            return
+        if self.waiting >= self.max_queue:
+            raise Overloaded("request queue is full")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(primitive.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise Overloaded(f"timed out waiting for {waiting_for}")
+        finally:
+            self.waiting -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of the block."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self.queue(self._semaphore, "a slot")
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+
+class AgentServer:
+    """ASGI application serving ``FlightAgent`` turns over HTTP.
+
+    Routes:
+        GET  /health                      liveness plus running/queued turns
+        GET  /stats                       request counters and p50/p99 latency
+        POST /threads/{thread_id}/run     one turn, answered with the AgentResponse as JSON
+        POST /threads/{thread_id}/stream  one turn as Server-Sent Events (the ``{"type": ...}``
+                                          events of ``astream``, then ``{"type": "done"}``)
+
+    The body is ``{"message": ..., "user_id": ..., "email": ..., "phone": ..., "session_id": ...}``
+    (only ``message`` is required). Turns of the same thread run one at a
+    time, in arrival order; a turn waiting for its thread holds no
+    concurrency slot but counts against the queue. Failed turns are answered with 500 (an ``error``
+    event once a stream has started). On shutdown new requests get 503 while running
+    turns are given ``drain_timeout`` seconds to finish.
+    """
+
+    def __init__(self, agent=None, config: Optional[ServerConfig] = None):
+        self.agent = agent
+        self.config = config or settings.server
+        self.limiter = ConcurrencyLimiter(self.config.max_concurrency, self.config.max_queue,
+                                          self.config.queue_timeout)
+        self.draining = False
+        self._thread_locks: Dict[str, List[Any]] = {}  # thread_id -> [lock, holders]
+        self.stats = {"requests": 0, "completed": 0, "shed": 0, "errors": 0, "disconnects": 0}
+        self.latencies = deque(maxlen=1000)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.agent is None:
+                    from ..agents import FlightAgent
+                    self.agent = FlightAgent()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.drain()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def drain(self) -> bool:
+        """Refuse new turns and wait for running ones; False if ``drain_timeout`` expired."""
+        self.draining = True
+        deadline = time.monotonic() + self.config.drain_timeout
+        while self.limiter.active or self.limiter.waiting or self._thread_locks:
+            if time.monotonic() >= deadline:
+                logger.warning(f"Drain timed out with {self.limiter.active} turns running")
+                return False
+            await asyncio.sleep(0.05)
+        if self.agent is not None:
+            await self.agent.aclose()
+        logger.info("Server drained")
+        return True
+
+    @asynccontextmanager
+    async def _thread_turn(self, thread_id: str):
+        """Serialize the turns of one thread; waiting for the previous turn counts as queued."""
+        entry = self._thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            await self.limiter.queue(entry[0], "the previous turn of the thread", busy=entry[1] > 1)
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._thread_locks[thread_id]
+
+    # HTTP plumbing
+
+    @staticmethod
+    async def _send_json(send, status: int, payload: Dict[str, Any], headers: List[Tuple[bytes, bytes]] = None):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        await send({"type": "http.response.start", "status": status, "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(body)).encode())
+        ] + (headers or [])})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        """Request body, or None if it exceeds ``MAX_BODY_BYTES``."""
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_BYTES:
+                return None
+            if not message.get("more_body", False):
+                return body
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counters, running/queued turns and p50/p99 latency in ms."""
+        latencies = sorted(self.latencies)
+        percentile = lambda p: round(latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000, 1) if latencies else 0.0
+        return {
+            **self.stats,
+            "running": self.limiter.active,
+            "queued": self.limiter.waiting,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99)
+        }
+
+    async def _http(self, scope, receive, send):
+        path, method = scope["path"], scope["method"]
+        if path == "/health" and method == "GET":
+            await self._send_json(send, 503 if self.draining else 200, {
+                "status": "draining" if self.draining else "ok",
+                "running": self.limiter.active,
+                "queued": self.limiter.waiting
+            })
+            return
+        if path == "/stats" and method == "GET":
+            await self._send_json(send, 200, self.get_stats())
+            return
+
+        match = THREAD_ROUTE.match(path)
+        if match is None:
+            await self._send_json(send, 404, {"error": "not found"})
+            return
+        if method != "POST":
+            await self._send_json(send, 405, {"error": "method not allowed"}, [(b"allow", b"POST")])
+            return
+        if self.draining:
+            await self._send_json(send, 503, {"error": "server is shutting down"})
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            await self._send_json(send, 413, {"error": "request body too large"})
+            return
+        try:
+            request = json.loads(body or b"{}")
+            message = request.get("message")
+            if not isinstance(message, str) or not message.strip():
+                raise ValueError("message must be a non-empty string")
+        except (ValueError, AttributeError) as e:
+            await self._send_json(send, 400, {"error": f"invalid request: {e}"})
+            return
+
+        thread_id, action = match.group(1), match.group(2)
+        kwargs = {
+            "thread_id": thread_id,
+            "user_id": request.get("user_id") or "default_user",
+            "email": request.get("email"),
+            "phone": request.get("phone"),
+            "session_id": request.get("session_id")
+        }
+        self.stats["requests"] += 1
+        start = time.perf_counter()
+        started = False
+
+        async def tracked_send(event):
+            nonlocal started
+            started = started or event["type"] == "http.response.start"
+            await send(event)
+
+        try:
+            # Queued turns of the same thread wait here, without holding a concurrency slot
+            async with self._thread_turn(thread_id):
+                async with self.limiter.slot():
+                    if action == "run":
+                        await self._run(tracked_send, message, kwargs)
+                    else:
+                        await self._stream(tracked_send, receive, message, kwargs)
+        except Overloaded as e:
+            self.stats["shed"] += 1
+            await self._send_json(send, 429, {"error": f"server overloaded: {e}"}, [(b"retry-after", b"1")])
+            return
+        except Exception as e:
+            logger.exception(f"Turn on thread {thread_id} failed")
+            self.stats["errors"] += 1
+            if not started:
+                await self._send_json(send, 500, {"error": f"internal error: {e}"})
+            else:
+                # Headers are already out: end the event stream with an error event
+                event = {"type": "error", "message": str(e), "success": False}
+                await send({"type": "http.response.body",
+                            "body": f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8")})
+        self.latencies.append(time.perf_counter() - start)
+
+    async def _run(self, send, message: str, kwargs: Dict[str, Any]):
+        response = await self.agent.arun(message, **kwargs)
+        self.stats["completed" if response.success else "errors"] += 1
+        await self._send_json(send, 200 if response.success else 500, response.model_dump())
+
+    async def _stream(self, send, receive, message: str, kwargs: Dict[str, Any]):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no")
+        ]})
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        failed = False
+        try:
+            async for event in self.agent.astream(message, **kwargs):
+                if disconnected.is_set():
+                    self.stats["disconnects"] += 1
+                    return
+                failed = failed or event.get("type") == "error"
+                await send({"type": "http.response.body", "more_body": True,
+                            "body": f"data: {json.dumps(event, ensure_ascii=False, default=str)}\n\n".encode("utf-8")})
+            await send({"type": "http.response.body",
+                        "body": f"data: {json.dumps({'type': 'done', 'thread_id': kwargs['thread_id']})}\n\n".encode("utf-8")})
+            self.stats["errors" if failed else "completed"] += 1
+        finally:
+            watcher.cancel()
+
+
+def create_app(agent=None, config: Optional[ServerConfig] = None) -> AgentServer:
+    """Create the ASGI app (a ``FlightAgent`` is built at startup when no agent is given)."""
+    return AgentServer(agent, config)
@@ -3,8 +3,10 @@ Tools module for Flight Booking Agent
 """
 
 from .flight_tools import flight_tools, FlightTools
+from .tool_registry import ToolRegistry
 
 __all__ = [
     "flight_tools",
-    "FlightTools"
+    "FlightTools",
+    "ToolRegistry"
 ] 
\ No newline at end of file
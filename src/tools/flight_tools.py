@@ -3,21 +3,38 @@ Flight booking tools for the agent
 """
 
 import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from langchain_core.tools import tool
-from ..config import settings
 from ..utils.cart_service import cart_service
+from ..utils.fare_calendar import FareCalendar
+from ..utils.flight_inventory import FlightInventory, InventoryError, flight_inventory
+from ..utils.itinerary_search import ItinerarySearch, itinerary_search
 from ..utils.payment_service import PaymentMethod
+from ..utils.tool_cache import tool_cache, route_tag
 from ..utils.models import OrderStatus, PaymentStatus
 
 
+CLASS_PRICE_MULTIPLIERS = {
+    "economy": 1.0,
+    "business": 2.5,
+    "first": 4.0
+}
+
+
 class FlightTools:
     """Collection of flight booking tools."""
     
-    def __init__(self):
+    def __init__(self, inventory: Optional[FlightInventory] = None):
+        self.inventory = inventory or flight_inventory
+        self.itineraries = itinerary_search if self.inventory is flight_inventory else ItinerarySearch(self.inventory)
+        self.fares = FareCalendar(self.inventory)
         self.mock_flights_db = self._initialize_mock_flights()
         self.mock_weather_db = self._initialize_mock_weather()
-        self.mock_bookings_db = {}
+        
+        # Seed the shared inventory with the mock routes (existing schedules are kept)
+        self.inventory.add_schedules(
+            flight for flights in self.mock_flights_db["routes"].values() for flight in flights
+        )
     
     def _initialize_mock_flights(self) -> Dict[str, List[Dict[str, Any]]]:
         """Initialize mock flight database."""
@@ -89,52 +106,34 @@ class FlightTools:
         """Generate route key for flight lookup."""
         return f"{departure}-{arrival}"
     
-    def _generate_flight_number(self) -> str:
-        """Generate a unique flight number."""
-        return f"FL{random.randint(100, 999)}"
-    
     def _calculate_price(self, base_price: float, passengers: int, class_type: str) -> float:
         """Calculate total price based on passengers and class type."""
-        multipliers = {
-            "economy": 1.0,
-            "business": 2.5,
-            "first": 4.0
-        }
-        return base_price * passengers * multipliers.get(class_type, 1.0)
+        return base_price * passengers * CLASS_PRICE_MULTIPLIERS.get(class_type, 1.0)
+
+
+# Shared by all tools so routes, seat counts and bookings persist across calls
+shared_tools = FlightTools()
+
+# Search results show seat counts: a booking or cancellation drops the cached searches of its route and date
+shared_tools.inventory.add_seat_listener(
+    lambda departure, arrival, flight_date: tool_cache.invalidate("search_flights", route_tag(departure, arrival, flight_date))
+)
+
+
+def _search_key(departure_city: str, arrival_city: str, date: str, passengers: int, class_type: str) -> tuple:
+    return departure_city.strip().casefold(), arrival_city.strip().casefold(), date.strip(), int(passengers), class_type.strip().lower()
+
+
+def _search_tags(departure_city: str, arrival_city: str, date: str, **_) -> list:
+    return [route_tag(departure_city, arrival_city, date)]
 
 
 @tool
+@tool_cache.cached("search_flights", key=_search_key, tags=_search_tags)
 def search_flights(departure_city: str, arrival_city: str, date: str, passengers: int = 1, class_type: str = "economy") -> str:
     """Search for available flights between cities on a specific date."""
-    tools = FlightTools()
-    
-    route_key = tools._get_route_key(departure_city, arrival_city)
-    flights = tools.mock_flights_db["routes"].get(route_key, [])
-    
-    if not flights:
-        # Generate mock flights for new routes
-        flights = [
-            {
-                "flight_number": tools._generate_flight_number(),
-                "departure": departure_city,
-                "arrival": arrival_city,
-                "departure_time": "08:00",
-                "arrival_time": "10:30",
-                "price": random.randint(200, 600),
-                "airline": random.choice(settings.mock_data.airlines),
-                "available_seats": random.randint(20, 50)
-            },
-            {
-                "flight_number": tools._generate_flight_number(),
-                "departure": departure_city,
-                "arrival": arrival_city,
-                "departure_time": "14:30",
-                "arrival_time": "17:00",
-                "price": random.randint(200, 600),
-                "airline": random.choice(settings.mock_data.airlines),
-                "available_seats": random.randint(20, 50)
-            }
-        ]
+    tools = shared_tools
+    flights = tools.inventory.search_flights(departure_city, arrival_city, date)
     
     result = f"Found {len(flights)} flights from {departure_city} to {arrival_city} on {date} ({class_type} class):\n\n"
     
@@ -149,31 +148,78 @@ def search_flights(departure_city: str, arrival_city: str, date: str, passengers
 
 
 @tool
-def book_flight(flight_number: str, passenger_name: str, email: str, passengers: int = 1, class_type: str = "economy", 
-                user_id: str = None) -> str:
-    """Book a specific flight for a passenger and create order in cart (payment to be processed separately)."""
-    tools = FlightTools()
+def search_connecting_flights(departure_city: str, arrival_city: str, date: str, max_stops: int = 1,
+                              sort_by: str = "price", passengers: int = 1, class_type: str = "economy") -> str:
+    """Search for itineraries with connecting flights (up to max_stops stops), sorted by "price" or "duration"."""
+    tools = shared_tools
+    sort_by = sort_by if sort_by in ("price", "duration") else "price"
+    itineraries = tools.itineraries.search(departure_city, arrival_city, date, max_legs=max(0, max_stops) + 1,
+                                           objective=sort_by, passengers=passengers)
+    
+    if not itineraries:
+        return f"No itineraries found from {departure_city} to {arrival_city} on {date} with up to {max_stops} stop(s)."
+    
+    result = f"Found {len(itineraries)} itineraries from {departure_city} to {arrival_city} on {date} (by {sort_by}, {class_type} class):\n\n"
+    
+    for i, itinerary in enumerate(itineraries, 1):
+        total_price = tools._calculate_price(itinerary['total_price'], passengers, class_type)
+        hours, minutes = divmod(itinerary['duration_minutes'], 60)
+        stops = f"{itinerary['stops']} stop(s) via {', '.join(itinerary['connections'])}" if itinerary['stops'] else "Direct"
+        result += f"{i}. {stops} | Total time: {hours}h{minutes:02d}m | Arrives: {itinerary['arrival_date']}\n"
+        for leg in itinerary['legs']:
+            result += f"   {leg['airline']} {leg['flight_number']} on {leg['flight_date']}: {leg['departure']} {leg['departure_time']} → {leg['arrival']} {leg['arrival_time']}\n"
+        result += f"   Base Price: ${itinerary['total_price']} | Total ({passengers} pax, {class_type}): ${total_price:.2f}\n\n"
     
-    # Generate booking reference
-    booking_ref = f"BK{flight_number}{hash(email) % 10000:04d}"
+    return result
+
+
+@tool
+def fare_calendar(departure_city: str, arrival_city: str, start_date: str, days: int = 7, passengers: int = 1,
+                  class_type: str = "economy") -> str:
+    """Find the cheapest flight for each day in a date window (flexible dates), and the cheapest day overall."""
+    tools = shared_tools
+    calendar = tools.fares.calendar(departure_city, arrival_city, start_date, days=min(max(days, 1), 60),
+                                    passengers=passengers, class_type=class_type,
+                                    price_multipliers=CLASS_PRICE_MULTIPLIERS)
+    cheapest = calendar['cheapest']
+    
+    result = f"Fare calendar {departure_city} → {arrival_city} from {start_date} ({passengers} pax, {class_type} class):\n\n"
+    
+    for day in calendar['days']:
+        if day['flight'] is None:
+            status = "Sold out" if day['status'] == "sold_out" else "No flights"
+            result += f"   {day['date']}: {status}\n"
+            continue
+        flight = day['flight']
+        marker = "⭐" if cheapest and day['date'] == cheapest['date'] else "  "
+        result += f"{marker} {day['date']}: ${day['total_price']:.2f} - {flight['airline']} {flight['flight_number']} "
+        result += f"{flight['departure_time']}-{flight['arrival_time']} ({day['available_flights']}/{day['flights']} flights available)\n"
+    
+    if cheapest:
+        result += f"\nCheapest day: {cheapest['date']} on {cheapest['flight']['flight_number']} for ${cheapest['total_price']:.2f}"
+    else:
+        result += "\nNo bookable flights in this window."
     
-    # Mock pricing calculation
-    base_price = random.randint(200, 600)
-    total_price = tools._calculate_price(base_price, passengers, class_type)
+    return result
+
+
+@tool
+def book_flight(flight_number: str, passenger_name: str, email: str, passengers: int = 1, class_type: str = "economy", 
+                user_id: str = None, date: str = None) -> str:
+    """Book a specific flight for a passenger and create order in cart (payment to be processed separately)."""
+    tools = shared_tools
     
-    # Store booking in mock database
-    booking_data = {
-        "flight_number": flight_number,
-        "passenger_name": passenger_name,
-        "email": email,
-        "passengers": passengers,
-        "class_type": class_type,
-        "total_price": total_price,
-        "booking_ref": booking_ref,
-        "status": "confirmed"
-    }
+    # Reserve seats and store the booking in the shared inventory
+    try:
+        booking_data = tools.inventory.book(
+            flight_number, passenger_name, email, passengers, class_type,
+            flight_date=date, price_multipliers=CLASS_PRICE_MULTIPLIERS
+        )
+    except InventoryError as e:
+        return f"❌ Booking failed: {e}"
     
-    tools.mock_bookings_db[booking_ref] = booking_data
+    booking_ref = booking_data["booking_ref"]
+    total_price = booking_data["total_price"]
     
     # Auto-generate user_id if not provided
     if not user_id:
@@ -211,7 +257,7 @@ Next steps:
 
     return f"""✅ Flight booking confirmed!
 
-Flight: {flight_number}
+Flight: {flight_number} on {booking_data['flight_date']}
 Passenger: {passenger_name}
 Email: {email}
 Passengers: {passengers}
@@ -223,9 +269,10 @@ Your booking confirmation has been sent to {email}."""
 
 
 @tool
+@tool_cache.cached("get_weather", key=lambda city: (city.strip().casefold(),))
 def get_weather(city: str) -> str:
     """Get weather information for a city."""
-    tools = FlightTools()
+    tools = shared_tools
     
     weather_data = tools.mock_weather_db.get(city)
     
@@ -242,6 +289,7 @@ def get_weather(city: str) -> str:
 
 
 @tool
+@tool_cache.cached("get_flight_status", key=lambda flight_number: (flight_number.strip().upper(),))
 def get_flight_status(flight_number: str) -> str:
     """Get the current status of a flight."""
     statuses = ["On time", "Delayed by 15 minutes", "Delayed by 30 minutes", "Cancelled"]
@@ -259,14 +307,14 @@ def get_flight_status(flight_number: str) -> str:
 @tool
 def get_booking_info(booking_reference: str) -> str:
     """Get information about a specific booking."""
-    tools = FlightTools()
+    tools = shared_tools
     
-    booking = tools.mock_bookings_db.get(booking_reference)
+    booking = tools.inventory.get_booking(booking_reference)
     
     if booking:
         return f"""Booking Information:
 Reference: {booking['booking_ref']}
-Flight: {booking['flight_number']}
+Flight: {booking['flight_number']} on {booking['flight_date']}
 Passenger: {booking['passenger_name']}
 Email: {booking['email']}
 Passengers: {booking['passengers']}
@@ -280,18 +328,13 @@ Status: {booking['status']}"""
 @tool
 def cancel_booking(booking_reference: str, email: str) -> str:
     """Cancel a flight booking."""
-    tools = FlightTools()
-    
-    booking = tools.mock_bookings_db.get(booking_reference)
+    tools = shared_tools
     
-    if not booking:
-        return f"Booking reference {booking_reference} not found."
-    
-    if booking['email'] != email:
-        return "Email does not match booking. Cannot cancel."
-    
-    # Update booking status
-    booking['status'] = "cancelled"
+    # Mark the booking cancelled and release its seats
+    try:
+        booking = tools.inventory.cancel(booking_reference, email)
+    except InventoryError as e:
+        return str(e)
     
     return f"""✅ Booking cancelled successfully!
 
@@ -677,6 +720,8 @@ The payment for this order has been cancelled. You can re-initiate payment later
 # Export all tools
 flight_tools = [
     search_flights,
+    search_connecting_flights,
+    fare_calendar,
     book_flight,
     get_weather,
     get_flight_status,
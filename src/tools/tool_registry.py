@@ -0,0 +1,59 @@
+"""
+Tool registry for Flight Booking Agent
+"""
+
+import threading
+from typing import Optional, Dict, List, Any
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ToolRegistry:
+    """Name → tool lookup and per-intent tool subsets, built once per agent.
+
+    Subsets come from ``settings.tool_selection.intent_tools`` unless given;
+    ``bound_llm(llm, intent)`` binds each intent's subset to the LLM on first
+    use and reuses the bound model afterwards, so every request sends only
+    the schemas its intent needs and ``bind_tools`` is not recomputed per
+    turn. Bindings are rebuilt when the agent's LLM is replaced.
+    """
+
+    def __init__(self, tools: List[Any], intent_tools: Optional[Dict[str, List[str]]] = None):
+        self.tools = list(tools)
+        self._by_name = {tool.name: tool for tool in self.tools}
+        self.intent_tools = settings.tool_selection.intent_tools if intent_tools is None else intent_tools
+        self._subsets = {}
+        for intent, names in self.intent_tools.items():
+            unknown = [name for name in names if name not in self._by_name]
+            if unknown:
+                logger.warning(f"Unknown tools for intent {intent}: {unknown}")
+            self._subsets[intent] = [self._by_name[name] for name in names if name in self._by_name]
+        self._bound: Dict[Optional[str], Any] = {}
+        self._bound_llm = None
+        self._lock = threading.Lock()
+
+    def get(self, tool_name: str):
+        """Get a tool by name (None if unknown)."""
+        return self._by_name.get(tool_name)
+
+    def __contains__(self, tool_name: str) -> bool:
+        return tool_name in self._by_name
+
+    def tools_for(self, intent: Optional[str] = None) -> List[Any]:
+        """Tools offered for an intent (all tools for unmapped intents)."""
+        return self._subsets.get(intent, self.tools)
+
+    def bound_llm(self, llm, intent: Optional[str] = None):
+        """LLM with the intent's tools bound, cached per intent."""
+        key = intent if intent in self._subsets else None
+        with self._lock:
+            if llm is not self._bound_llm:
+                self._bound = {}
+                self._bound_llm = llm
+            bound = self._bound.get(key)
+            if bound is None:
+                bound = self._bound[key] = llm.bind_tools(self.tools_for(key))
+            return bound
@@ -5,6 +5,7 @@ Utils module for Flight Booking Agent
 from .models import (
     IntentClassification,
     BookingInformation,
+    IntentExtraction,
     FlightBookingState,
     FlightData,
     BookingData,
@@ -16,10 +17,17 @@ from .models import (
 )
 from .conversation_service import conversation_service
 from .database import db_manager
+from .intent_rules import intent_rules
+from .booking_extractor import booking_extractor
+from .flight_inventory import flight_inventory
+from .itinerary_search import itinerary_search
+from .conversation_memory import conversation_memory
+from .summary_worker import summary_worker
 
 __all__ = [
     "IntentClassification",
     "BookingInformation", 
+    "IntentExtraction",
     "FlightBookingState",
     "FlightData",
     "BookingData",
@@ -29,5 +37,11 @@ __all__ = [
     "ConversationHistory",
     "ConversationEntry",
     "conversation_service",
-    "db_manager"
+    "db_manager",
+    "intent_rules",
+    "booking_extractor",
+    "flight_inventory",
+    "itinerary_search",
+    "conversation_memory",
+    "summary_worker"
 ] 
\ No newline at end of file
@@ -0,0 +1,357 @@
+"""
+Deterministic booking field extraction for Flight Booking Agent
+"""
+
+import functools
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from ..config import settings
+from .intent_rules import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Vietnamese/alternate spellings for the mock cities
+CITY_ALIASES = {
+    "nyc": "New York",
+    "new york city": "New York",
+    "niu oóc": "New York",
+    "luân đôn": "London",
+    "pa ri": "Paris",
+    "pa-ri": "Paris",
+    "tô-ky-ô": "Tokyo",
+    "xít-ni": "Sydney",
+    "hán thành": "Seoul",
+    "xơ-un": "Seoul",
+    "bá linh": "Berlin",
+    "béc-lin": "Berlin",
+    "la mã": "Rome",
+}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "một": 1, "hai": 2, "ba": 3, "bốn": 4, "năm": 5, "sáu": 6, "bảy": 7, "tám": 8, "chín": 9, "mười": 10,
+}
+NUMBER = r"(\d{1,2}|" + "|".join(NUMBER_WORDS) + r")"
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+MONTH = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4, "saturday": 5, "sunday": 6,
+    "thứ hai": 0, "thứ ba": 1, "thứ tư": 2, "thứ năm": 3, "thứ sáu": 4, "thứ bảy": 5, "chủ nhật": 6,
+}
+RELATIVE_DAYS = {"today": 0, "hôm nay": 0, "tomorrow": 1, "ngày mai": 1, "ngày kia": 2}
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+ISO_DATE_PATTERN = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+NUMERIC_DATE_PATTERN = re.compile(r"\b(\d{1,2})[/.](\d{1,2})(?:[/.](\d{2,4}))?\b")
+DAY_MONTH_PATTERN = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?(?: of)? " + MONTH + r"\b(?:,? (\d{4}))?")
+MONTH_DAY_PATTERN = re.compile(r"\b" + MONTH + r" (\d{1,2})(?:st|nd|rd|th)?\b(?:,? (\d{4}))?")
+VI_DATE_PATTERN = re.compile(r"\bngày (\d{1,2}) tháng (\d{1,2})(?: năm (\d{4}))?")
+RELATIVE_DAY_PATTERN = re.compile(r"\b(today|tomorrow)\b|hôm nay|ngày mai|ngày kia")
+IN_DAYS_PATTERN = re.compile(r"\bin " + NUMBER + r" days?\b|(?:sau )?" + NUMBER + r" ngày (?:nữa|tới)")
+WEEKDAY_PATTERN = re.compile(
+    r"\b(?:next |this |on )?(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b|"
+    r"(thứ hai|thứ ba|thứ tư|thứ năm|thứ sáu|thứ bảy|chủ nhật)(?: (?:tới|này|tuần sau|tuần tới))?"
+)
+RETURN_MARKER = re.compile(r"(return(?:ing)?|back|coming back|về|quay lại|quay về)\W+(?:\w+\W+){0,2}$")
+
+PASSENGER_PATTERN = re.compile(
+    NUMBER + r" (?:adults?|passengers?|people|persons?|pax|travell?ers?|tickets?|người(?: lớn)?|hành khách|khách|vé)\b"
+)
+BARE_COUNT_PATTERN = re.compile(r"^" + NUMBER + r"$")
+SOLO_PATTERN = re.compile(r"\b(just me|only me|myself|alone)\b|một mình|mình tôi")
+
+CLASS_PATTERN = re.compile(
+    r"\b(economy|business|first class|premium economy)\b|phổ thông|thương gia|hạng nhất|hạng thương gia|hạng phổ thông"
+)
+CLASS_VALUES = {
+    "economy": "economy", "premium economy": "economy", "phổ thông": "economy", "hạng phổ thông": "economy",
+    "business": "business", "thương gia": "business", "hạng thương gia": "business",
+    "first class": "first", "hạng nhất": "first", "first": "first",
+}
+
+ROUND_TRIP_PATTERN = re.compile(r"\b(round[ -]?trip|return ticket|two[ -]?way)\b|khứ hồi")
+ONE_WAY_PATTERN = re.compile(r"\b(one[ -]?way|single ticket)\b|một chiều")
+YES_PATTERN = re.compile(r"^(yes|yeah|yep|sure|có|vâng|dạ có|ừ)\b")
+NO_PATTERN = re.compile(r"^(no|nope|không|dạ không)\b")
+
+FROM_MARKER = re.compile(r"(?:\bfrom|\bleaving|\bdepart(?:ing)?(?: from)?|từ|khởi hành từ)\s+$")
+TO_MARKER = re.compile(r"(?:\bto|\bfor|\barrive in|\bgoing to|đi|đến|tới|sang|ra|vào)\s+$")
+
+NAME_PREFIX = re.compile(r"^(?:my name is|name is|i am|i'm|it's|tên tôi là|tên là|tôi tên là|tôi là)\s+", re.IGNORECASE)
+NAME_PATTERN = re.compile(r"^[^\W\d_]+(?:\s+[^\W\d_]+){0,4}$")
+
+# Words that carry no booking value; a message made only of these and extracted spans needs no LLM
+FILLER_WORDS = set("""
+a an the i i'd i'm me my we us our please pls thanks thank you ok okay yes yeah yep no want would like to book
+booking reserve need get flight flights ticket tickets trip a for from on in at of and with it is it's be will
+going fly flying leave leaving depart departing travel traveling travelling date class seat seats just only
+next this let's lets can could you return returning back coming
+tôi mình muốn cần đặt vé chuyến bay bay cho từ đi đến tới ngày vào lúc và với nhé nha ạ dạ vâng ơi là hạng
+giúp em anh chị được không có sang ra về quay lại
+""".split())
+
+
+@dataclass
+class ExtractionResult:
+    """Fields parsed locally and whether the message was fully explained by them."""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    complete: bool = False
+    residual: str = ""
+
+
+class BookingFieldExtractor:
+    """Regex and gazetteer extractor for booking fields in English and Vietnamese.
+
+    Parses emails, ISO/numeric/named/relative dates, passenger counts, class,
+    round trip and mock-data cities without an LLM. ``pending_field`` (the
+    question the agent just asked) lets bare answers such as "2" or "yes" be
+    attributed to the right field.
+    """
+
+    def __init__(self, cities: Optional[List[str]] = None):
+        self.cities = {normalize_text(city): city for city in (cities or settings.mock_data.cities)}
+        self.cities.update(CITY_ALIASES)
+        names = sorted(self.cities, key=len, reverse=True)
+        self.city_pattern = re.compile(r"(?<!\w)(" + "|".join(re.escape(name) for name in names) + r")(?!\w)")
+        self._lock = threading.Lock()
+        self._stats = {"messages": 0, "complete": 0, "fields": 0}
+
+    def extract(self, text: str, pending_field: Optional[str] = None, today: Optional[date] = None,
+                departure_date: Optional[str] = None) -> ExtractionResult:
+        """Extract booking fields from a user message.
+
+        Return weekdays and dates without a year are resolved from the
+        outbound date: the one in the message, else ``departure_date`` (the
+        ISO date already collected).
+        """
+        today = today or date.today()
+        normalized = normalize_text(text)
+        fields: Dict[str, Any] = {}
+        spans: List[Tuple[int, int]] = []
+
+        email = EMAIL_PATTERN.search(text)
+        if email:
+            fields["email"] = email.group(0)
+            # Mask the address so its parts are not read as dates or names
+            masked = EMAIL_PATTERN.search(normalized)
+            if masked:
+                spans.append(masked.span())
+                normalized = normalized[:masked.start()] + " " * (masked.end() - masked.start()) + normalized[masked.end():]
+
+        self._extract_dates(normalized, pending_field, today, self._parse_iso(departure_date), fields, spans)
+        self._extract_passengers(normalized, pending_field, fields, spans)
+        self._extract_class(normalized, pending_field, fields, spans)
+        self._extract_round_trip(normalized, pending_field, fields, spans)
+        self._extract_cities(normalized, pending_field, fields, spans)
+
+        if pending_field == "passenger_name" and not fields:
+            name = NAME_PREFIX.sub("", text.strip().strip(".!")).strip()
+            if NAME_PATTERN.match(name) and len(name.split()) >= 2:
+                fields["passenger_name"] = name.title() if name.islower() else name
+                spans.append((0, len(normalized)))
+
+        residual = self._residual(normalized, spans)
+        result = ExtractionResult(fields=fields, complete=bool(fields) and not residual, residual=residual)
+        with self._lock:
+            self._stats["messages"] += 1
+            self._stats["complete"] += result.complete
+            self._stats["fields"] += len(fields)
+        return result
+
+    def _extract_dates(self, normalized: str, pending_field: Optional[str], today: date, departure: Optional[date],
+                       fields: Dict[str, Any], spans: List[Tuple[int, int]]):
+        # Each match resolves against a base date: today for the outbound date, the outbound date for the return
+        found = []
+        for match in ISO_DATE_PATTERN.finditer(normalized):
+            value = self._make_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            found.append((match.span(), lambda base, value=value: value))
+        for match in VI_DATE_PATTERN.finditer(normalized):
+            year = int(match.group(3)) if match.group(3) else None
+            found.append((match.span(), functools.partial(self._future_date, month=int(match.group(2)),
+                                                          day=int(match.group(1)), year=year)))
+        for match in NUMERIC_DATE_PATTERN.finditer(normalized):
+            # Day first, as in Vietnamese and European usage
+            year = int(match.group(3)) if match.group(3) else None
+            if year is not None and year < 100:
+                year += 2000
+            found.append((match.span(), functools.partial(self._future_date, month=int(match.group(2)),
+                                                          day=int(match.group(1)), year=year)))
+        for match in DAY_MONTH_PATTERN.finditer(normalized):
+            year = int(match.group(3)) if match.group(3) else None
+            found.append((match.span(), functools.partial(self._future_date, month=MONTHS[match.group(2)[:3]],
+                                                          day=int(match.group(1)), year=year)))
+        for match in MONTH_DAY_PATTERN.finditer(normalized):
+            year = int(match.group(3)) if match.group(3) else None
+            found.append((match.span(), functools.partial(self._future_date, month=MONTHS[match.group(1)[:3]],
+                                                          day=int(match.group(2)), year=year)))
+        for match in RELATIVE_DAY_PATTERN.finditer(normalized):
+            value = today + timedelta(days=RELATIVE_DAYS[match.group(0)])
+            found.append((match.span(), lambda base, value=value: value))
+        for match in IN_DAYS_PATTERN.finditer(normalized):
+            value = today + timedelta(days=self._number(match.group(1) or match.group(2)))
+            found.append((match.span(), lambda base, value=value: value))
+        for match in WEEKDAY_PATTERN.finditer(normalized):
+            weekday = WEEKDAYS[match.group(1) or match.group(2)]
+            found.append((match.span(), lambda base, weekday=weekday:
+                          base + timedelta(days=(weekday - base.weekday() - 1) % 7 + 1)))
+
+        dates = []
+        for span, resolve in sorted(found, key=lambda item: item[0][0]):
+            # Overlapping matches (e.g. "ngày 20 tháng 7" and "20") keep the first, longest one
+            if resolve(today) is None or any(start < span[1] and span[0] < end for start, end in spans):
+                continue
+            spans.append(span)
+            is_return = bool(RETURN_MARKER.search(normalized[:span[0]]))
+            dates.append((span, is_return, resolve))
+
+        if not dates:
+            return
+        if len(dates) == 1 and not dates[0][1]:
+            if pending_field == "return_date":
+                self._set_return_date(dates[0], departure or today, departure, fields, spans)
+            else:
+                fields["date"] = dates[0][2](today).isoformat()
+            return
+        # The first date without a return marker is the outbound one
+        outbound = next((resolve(today) for _, is_return, resolve in dates if not is_return), None) or departure
+        for item in dates:
+            if item[1] or "date" in fields:
+                self._set_return_date(item, outbound or today, outbound, fields, spans)
+            else:
+                fields["date"] = item[2](today).isoformat()
+
+    @staticmethod
+    def _set_return_date(item: Tuple, base: date, outbound: Optional[date],
+                         fields: Dict[str, Any], spans: List[Tuple[int, int]]):
+        """Set the return date unless one is set or it falls before ``outbound`` (then the match is left unparsed)."""
+        span, _, resolve = item
+        value = resolve(base)
+        if outbound is not None and value < outbound:
+            spans.remove(span)
+            return
+        fields.setdefault("return_date", value.isoformat())
+
+    def _extract_passengers(self, normalized: str, pending_field: Optional[str],
+                            fields: Dict[str, Any], spans: List[Tuple[int, int]]):
+        match = PASSENGER_PATTERN.search(normalized)
+        if match:
+            fields["passengers"] = self._number(match.group(1))
+            spans.append(match.span())
+            return
+        match = SOLO_PATTERN.search(normalized)
+        if match:
+            fields["passengers"] = 1
+            spans.append(match.span())
+            return
+        if pending_field == "passengers":
+            match = BARE_COUNT_PATTERN.match(normalized.strip(" .!"))
+            if match:
+                fields["passengers"] = self._number(match.group(1))
+                spans.append((0, len(normalized)))
+
+    def _extract_class(self, normalized: str, pending_field: Optional[str],
+                       fields: Dict[str, Any], spans: List[Tuple[int, int]]):
+        match = CLASS_PATTERN.search(normalized)
+        if match:
+            fields["class_type"] = CLASS_VALUES[match.group(0)]
+            spans.append(match.span())
+        elif pending_field == "class_type" and normalized.strip(" .!") == "first":
+            fields["class_type"] = "first"
+            spans.append((0, len(normalized)))
+
+    def _extract_round_trip(self, normalized: str, pending_field: Optional[str],
+                            fields: Dict[str, Any], spans: List[Tuple[int, int]]):
+        round_trip = ROUND_TRIP_PATTERN.search(normalized)
+        one_way = ONE_WAY_PATTERN.search(normalized)
+        if round_trip and not one_way:
+            fields["round_trip"] = True
+            spans.append(round_trip.span())
+        elif one_way and not round_trip:
+            fields["round_trip"] = False
+            spans.append(one_way.span())
+        elif pending_field == "round_trip":
+            yes, no = YES_PATTERN.match(normalized), NO_PATTERN.match(normalized)
+            if yes or no:
+                fields["round_trip"] = bool(yes)
+                spans.append((yes or no).span())
+
+    def _extract_cities(self, normalized: str, pending_field: Optional[str],
+                        fields: Dict[str, Any], spans: List[Tuple[int, int]]):
+        unmarked = []
+        for match in self.city_pattern.finditer(normalized):
+            city = self.cities[match.group(1)]
+            before = normalized[:match.start()]
+            spans.append(match.span())
+            if FROM_MARKER.search(before):
+                fields.setdefault("departure_city", city)
+            elif TO_MARKER.search(before):
+                fields.setdefault("arrival_city", city)
+            else:
+                unmarked.append(city)
+
+        if not unmarked:
+            return
+        if len(unmarked) == 1 and pending_field in ["departure_city", "arrival_city", "city"]:
+            fields.setdefault(pending_field, unmarked[0])
+            return
+        # "Paris Tokyo" or "Paris - Tokyo": departure then arrival
+        for city in unmarked:
+            key = "departure_city" if "departure_city" not in fields else "arrival_city"
+            fields.setdefault(key, city)
+
+    def _residual(self, normalized: str, spans: List[Tuple[int, int]]) -> str:
+        """Text left after removing extracted spans and filler words."""
+        chars = list(normalized)
+        for start, end in spans:
+            for i in range(start, min(end, len(chars))):
+                chars[i] = " "
+        words = re.findall(r"[^\W_]+(?:'[^\W_]+)?", "".join(chars))
+        return " ".join(word for word in words if word not in FILLER_WORDS)
+
+    @staticmethod
+    def _number(token: str) -> int:
+        return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+    @staticmethod
+    def _parse_iso(value: Optional[str]) -> Optional[date]:
+        try:
+            return date.fromisoformat(value) if value else None
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _make_date(year: int, month: int, day: int) -> Optional[date]:
+        try:
+            return date(year, month, day)
+        except ValueError:
+            return None
+
+    def _future_date(self, today: date, month: int, day: int, year: Optional[int]) -> Optional[date]:
+        """Date for day/month; without a year, the next occurrence from today."""
+        if year is not None:
+            return self._make_date(year, month, day)
+        value = self._make_date(today.year, month, day)
+        if value is not None and value < today:
+            value = self._make_date(today.year + 1, month, day)
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get message/field counts and the share of messages needing no LLM extraction."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["llm_skip_rate"] = stats["complete"] / stats["messages"] if stats["messages"] else 0.0
+        return stats
+
+
+# Global instance
+booking_extractor = BookingFieldExtractor()
@@ -0,0 +1,185 @@
+"""
+Thread-safe SQLite connection pool for Flight Booking Agent
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of SQLite connections with per-thread reuse.
+
+    A thread that already holds a connection gets the same connection back on
+    nested checkouts, so helper methods calling each other share one connection
+    instead of opening a second one.
+    """
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection], pool_size: int = 5,
+                 timeout: float = 30.0, health_check_interval: float = 60.0):
+        """Initialize the pool.
+
+        Args:
+            factory: Callable creating a new, fully configured connection.
+            pool_size: Maximum number of open connections.
+            timeout: Seconds to wait for a free connection before failing.
+            health_check_interval: Idle seconds after which a connection is
+                pinged with ``SELECT 1`` before being handed out.
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+
+        self._factory = factory
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        # LIFO keeps recently used (warm) connections at the front
+        self._idle: "queue.LifoQueue[tuple]" = queue.LifoQueue(maxsize=pool_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "reused_in_thread": 0,
+            "connections_created": 0,
+            "health_check_failures": 0,
+            "wait_timeouts": 0
+        }
+
+    def _create(self) -> sqlite3.Connection:
+        """Create a new connection through the factory."""
+        conn = self._factory()
+        self._bump("connections_created")
+        return conn
+
+    def _bump(self, counter: str):
+        """Increment a usage counter."""
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Check that a connection is still usable."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection, release_slot: bool = True):
+        """Close a connection and optionally release its slot in the pool."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        if release_slot:
+            with self._lock:
+                self._created -= 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, open a new one, or wait for a free slot."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.pool_size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._create()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                conn, last_used = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                self._bump("wait_timeouts")
+                raise PoolTimeoutError(
+                    f"No database connection available after {self.timeout}s (pool_size={self.pool_size})"
+                )
+
+        if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+            logger.warning("Discarding unhealthy pooled database connection")
+            self._bump("health_check_failures")
+            # Keep the slot and reuse it for the replacement connection
+            self._discard(conn, release_slot=False)
+            try:
+                return self._create()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool."""
+        if self._closed:
+            self._discard(conn)
+            return
+        if conn.in_transaction:
+            # Never hand out a connection with half-finished work
+            conn.rollback()
+        self._idle.put_nowait((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of a ``with`` block.
+
+        Nested checkouts in the same thread reuse the outer connection. If the
+        outermost block raises, any open transaction is rolled back.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._bump("reused_in_thread")
+            yield held
+            return
+
+        conn = self._acquire()
+        self._bump("checkouts")
+        self._local.conn = conn
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close(self):
+        """Close all idle connections; checked-out ones close on release."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        logger.info("Connection pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage counters."""
+        stats = dict(self._stats)
+        stats.update({
+            "pool_size": self.pool_size,
+            "open_connections": self._created,
+            "idle_connections": self._idle.qsize()
+        })
+        return stats
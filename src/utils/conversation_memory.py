@@ -0,0 +1,174 @@
+"""
+Token-budgeted conversation window with rolling summary memory for Flight Booking Agent
+"""
+
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from ..config import settings, MemoryConfig
+
+logger = logging.getLogger(__name__)
+
+MEMORY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You maintain the memory of a flight booking conversation.
+Merge the earlier summary and the older messages below into one concise summary of at most {max_words} words.
+Keep booking details (cities, dates, passengers, class, names, emails, flight numbers, booking references),
+decisions the user made and questions still open. Write in the language of the conversation."""),
+    ("user", "Earlier summary:\n{summary}\n\nOlder messages:\n{conversation_text}")
+])
+
+
+def message_text(message) -> str:
+    """Plain text of a message whose content may be a list of parts."""
+    if isinstance(message.content, list):
+        return " ".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in message.content)
+    return str(message.content)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class ConversationMemory:
+    """Keeps the last turns of ``messages`` verbatim and folds older ones into ``conversation_summary``.
+
+    A turn starts at a user message. When the window exceeds ``max_turns``
+    or ``max_tokens``, the oldest turns are folded into the summary until
+    ``keep_turns`` turns remain and the rest fits the budget (the latest turn
+    is always kept), so folding happens every few turns rather than every
+    turn. Folded messages are removed from the checkpointed state with
+    ``RemoveMessage``, which keeps prompt and checkpoint size bounded.
+    """
+
+    def __init__(self, config: Optional[MemoryConfig] = None):
+        self.config = config or settings.memory
+        self.stats = {"folds": 0, "folded_messages": 0, "fallbacks": 0}
+
+    @staticmethod
+    def split_turns(messages: List[Any]) -> List[List[Any]]:
+        """Group messages into turns, each starting at a user message."""
+        turns = []
+        for message in messages:
+            if isinstance(message, HumanMessage) or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+        return turns
+
+    @staticmethod
+    def count_tokens(messages: List[Any]) -> int:
+        """Approximate tokens of a list of messages."""
+        return sum(estimate_tokens(message_text(message)) for message in messages)
+
+    def plan(self, messages: List[Any]) -> Optional[Tuple[List[Any], List[Any]]]:
+        """Split messages into ``(to_fold, kept)``, or None when the window is within limits."""
+        if not self.config.enabled:
+            return None
+        turns = self.split_turns(messages)
+        tokens = [self.count_tokens(turn) for turn in turns]
+        if len(turns) <= self.config.max_turns and sum(tokens) <= self.config.max_tokens:
+            return None
+
+        start = max(0, len(turns) - self.config.keep_turns)
+        while start < len(turns) - 1 and sum(tokens[start:]) > self.config.max_tokens:
+            start += 1
+        if start == 0:
+            return None
+        return [message for turn in turns[:start] for message in turn], [message for turn in turns[start:] for message in turn]
+
+    @staticmethod
+    def conversation_text(messages: List[Any]) -> str:
+        """Messages as ``User:``/``Assistant:`` lines."""
+        lines = []
+        for message in messages:
+            if isinstance(message, HumanMessage):
+                lines.append(f"User: {message_text(message)}")
+            elif isinstance(message, AIMessage) and message.content:
+                lines.append(f"Assistant: {message_text(message)}")
+        return "\n".join(lines)
+
+    def _inputs(self, summary: str, messages: List[Any]) -> Dict[str, Any]:
+        return {
+            "summary": summary or "(none)",
+            "conversation_text": self.conversation_text(messages),
+            "max_words": self.config.summary_max_tokens * 3 // 4
+        }
+
+    def _cap(self, summary: str) -> str:
+        """Keep the summary within ``summary_max_tokens`` (most recent part)."""
+        limit = self.config.summary_max_tokens * 4
+        return summary if len(summary) <= limit else "…" + summary[-limit:]
+
+    def _fallback(self, summary: str, messages: List[Any]) -> str:
+        """Extractive summary used when the LLM is unavailable."""
+        self.stats["fallbacks"] += 1
+        return self._cap("\n".join(part for part in [summary, self.conversation_text(messages)] if part))
+
+    def _update(self, to_fold: List[Any], summary: str) -> Dict[str, Any]:
+        self.stats["folds"] += 1
+        self.stats["folded_messages"] += len(to_fold)
+        logger.info(f"Folded {len(to_fold)} messages into the conversation summary")
+        return {
+            "messages": [RemoveMessage(id=message.id) for message in to_fold],
+            "conversation_summary": summary
+        }
+
+    def _foldable(self, state: Dict[str, Any]) -> Optional[List[Any]]:
+        planned = self.plan(state.get("messages", []))
+        if planned is None:
+            return None
+        to_fold = planned[0]
+        if any(message.id is None for message in to_fold):
+            # Only checkpointed messages (which carry ids) can be removed from state
+            return None
+        return to_fold
+
+    def fold(self, summary: str, messages: List[Any], llm=None) -> str:
+        """Merge messages into the summary with the LLM (extractive fallback on failure or without LLM)."""
+        if llm is None:
+            return self._fallback(summary, messages)
+        try:
+            return self._cap((MEMORY_PROMPT | llm).invoke(self._inputs(summary, messages)).content.strip())
+        except Exception as e:
+            logger.error(f"Conversation summary fold failed: {e}")
+            return self._fallback(summary, messages)
+
+    async def afold(self, summary: str, messages: List[Any], llm=None) -> str:
+        """Async version of fold."""
+        if llm is None:
+            return self._fallback(summary, messages)
+        try:
+            return self._cap((await (MEMORY_PROMPT | llm).ainvoke(self._inputs(summary, messages))).content.strip())
+        except Exception as e:
+            logger.error(f"Conversation summary fold failed: {e}")
+            return self._fallback(summary, messages)
+
+    def update(self, state: Dict[str, Any], llm=None) -> Dict[str, Any]:
+        """State update trimming the window (empty when nothing needs folding)."""
+        to_fold = self._foldable(state)
+        if to_fold is None:
+            return {}
+        return self._update(to_fold, self.fold(state.get("conversation_summary", ""), to_fold, llm))
+
+    async def aupdate(self, state: Dict[str, Any], llm=None) -> Dict[str, Any]:
+        """Async version of update."""
+        to_fold = self._foldable(state)
+        if to_fold is None:
+            return {}
+        return self._update(to_fold, await self.afold(state.get("conversation_summary", ""), to_fold, llm))
+
+    @staticmethod
+    def summary_message(state: Dict[str, Any]) -> List[Any]:
+        """System message carrying the summary of trimmed turns (empty list if none)."""
+        summary = state.get("conversation_summary")
+        if not summary:
+            return []
+        return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}")]
+
+
+# Global instance
+conversation_memory = ConversationMemory()
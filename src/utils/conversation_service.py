@@ -2,12 +2,15 @@
 Conversation History Service for Flight Booking Agent (SQLite)
 """
 
+import asyncio
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 import logging
 
+from ..config import settings
 from .models import ConversationHistory, ConversationEntry
 from .database import db_manager
+from .write_buffer import ConversationWriteBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,15 @@ class ConversationService:
     def __init__(self):
         """Initialize the conversation service."""
         self.db = db_manager
+        self.write_buffer = None
+        if settings.database.write_behind:
+            self.write_buffer = ConversationWriteBuffer(
+                self.db,
+                max_queue_size=settings.database.write_queue_size,
+                batch_size=settings.database.write_batch_size,
+                flush_interval=settings.database.write_flush_interval,
+                enqueue_timeout=settings.database.write_enqueue_timeout
+            )
         logger.info("Conversation service initialized with SQLite database")
     
     def save_conversation(self, conversation: ConversationHistory) -> bool:
@@ -99,16 +111,30 @@ class ConversationService:
     def add_conversation_entry(self, thread_id: str, user_input: str, user_id: str, 
                              assistant_response: str = None,
                              session_id: str = None, metadata: Dict[str, Any] = None) -> bool:
-        """Add a new entry to an existing conversation."""
+        """Add a new entry to an existing conversation.
+        
+        With write-behind enabled the entry is queued and committed in a later
+        batch; call ``flush()`` when it must be visible to readers immediately.
+        """
         try:
-            success = self.db.add_conversation_entry(
-                thread_id=thread_id,
-                user_id=user_id,
-                user_input=user_input,
-                assistant_response=assistant_response,
-                session_id=session_id,
-                metadata=metadata
-            )
+            if self.write_buffer is not None:
+                success = self.write_buffer.add({
+                    "thread_id": thread_id,
+                    "user_id": user_id,
+                    "user_input": user_input,
+                    "assistant_response": assistant_response,
+                    "session_id": session_id,
+                    "metadata": metadata
+                })
+            else:
+                success = self.db.add_conversation_entry(
+                    thread_id=thread_id,
+                    user_id=user_id,
+                    user_input=user_input,
+                    assistant_response=assistant_response,
+                    session_id=session_id,
+                    metadata=metadata
+                )
             
             if success:
                 logger.info(f"Conversation entry added for thread {thread_id}")
@@ -121,6 +147,32 @@ class ConversationService:
             logger.error(f"Failed to add conversation entry for thread {thread_id}: {e}")
             return False
     
+    async def aadd_conversation_entry(self, thread_id: str, user_input: str, user_id: str,
+                                      assistant_response: str = None,
+                                      session_id: str = None, metadata: Dict[str, Any] = None) -> bool:
+        """Async version of ``add_conversation_entry`` that never blocks the event loop."""
+        return await asyncio.to_thread(
+            self.add_conversation_entry, thread_id, user_input, user_id,
+            assistant_response, session_id, metadata
+        )
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all buffered entries are written to the database."""
+        if self.write_buffer is None:
+            return True
+        return self.write_buffer.flush(timeout)
+    
+    def close(self):
+        """Flush buffered entries and stop the background writer."""
+        if self.write_buffer is not None:
+            self.write_buffer.close()
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Get write-behind queue depth and flush latency counters."""
+        if self.write_buffer is None:
+            return {"write_behind": False}
+        return {"write_behind": True, **self.write_buffer.get_stats()}
+    
     def get_conversation_summary(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """Get a summary of a conversation."""
         return self.db.get_conversation_summary(thread_id)
@@ -154,6 +206,16 @@ class ConversationService:
             thread_id, user_id, summary_text, key_points, intent_summary, booking_info
         )
     
+    async def asave_conversation_summary(self, thread_id: str, user_id: str, summary_text: str,
+                                         key_points: Optional[List[str]] = None,
+                                         intent_summary: Optional[str] = None,
+                                         booking_info: Optional[Dict[str, Any]] = None) -> bool:
+        """Async version of ``save_conversation_summary`` (runs on a worker thread)."""
+        return await asyncio.to_thread(
+            self.save_conversation_summary, thread_id, user_id, summary_text,
+            key_points, intent_summary, booking_info
+        )
+    
     def get_conversation_summary_detailed(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed conversation summary including AI-generated summary."""
         return self.db.get_conversation_summary_detailed(thread_id)
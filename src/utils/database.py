@@ -4,102 +4,164 @@ Database management for Flight Booking Agent
 
 import sqlite3
 import json
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator
 from pathlib import Path
 import logging
 
+from ..config import settings, DatabaseConfig
+from .connection_pool import SQLiteConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Insert a conversation or touch the existing row; unlike INSERT OR REPLACE this keeps created_at
+UPSERT_CONVERSATION_SQL = """
+    INSERT INTO conversations (thread_id, user_id, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT (thread_id) DO UPDATE SET
+        user_id = excluded.user_id,
+        updated_at = CURRENT_TIMESTAMP
+"""
 
-class DatabaseManager:
-    """Database manager for conversation history."""
+
+class SQLiteStore:
+    """Pooled SQLite database with the configured storage profile."""
     
-    def __init__(self, db_path: str = "data/conversations.db"):
-        """Initialize database manager."""
+    def __init__(self, db_path: str, pool_size: Optional[int] = None,
+                 pool_timeout: Optional[float] = None, config: Optional[DatabaseConfig] = None):
+        """Open the connection pool and create tables."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.config = config or settings.database
+        self.pool = SQLiteConnectionPool(
+            self.get_connection,
+            pool_size=pool_size or self.config.pool_size,
+            timeout=pool_timeout or self.config.pool_timeout,
+            health_check_interval=self.config.health_check_interval
+        )
         self.init_database()
-        logger.info(f"Database initialized at: {self.db_path}")
+    
+    def init_database(self):
+        """Create tables and indexes. Implemented by subclasses."""
+        pass
     
     def get_connection(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
+        """Open a new database connection (used by the pool)."""
+        # Pooled connections are handed between threads, never shared concurrently
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Enable dict-like access
+        
+        # Apply storage profile (WAL, synchronous, mmap, cache, busy timeout)
+        for pragma, value in self.config.get_pragmas().items():
+            conn.execute(f"PRAGMA {pragma}={value}")
         return conn
     
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, e.g. ``with db_manager.connection() as conn:``."""
+        with self.pool.connection() as conn:
+            yield conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block of writes as one transaction (joins an already open one)."""
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            # Take the write lock up front so concurrent writers wait on busy_timeout
+            # instead of failing on a read -> write lock upgrade
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics."""
+        return self.pool.get_stats()
+
+
+class DatabaseManager(SQLiteStore):
+    """Database manager for conversation history."""
+    
+    def __init__(self, db_path: str = "data/conversations.db", pool_size: Optional[int] = None,
+                 pool_timeout: Optional[float] = None, config: Optional[DatabaseConfig] = None):
+        """Initialize database manager."""
+        super().__init__(db_path, pool_size=pool_size, pool_timeout=pool_timeout, config=config)
+        logger.info(f"Database initialized at: {self.db_path}")
+    
     def init_database(self):
         """Initialize database tables."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        # Create conversations table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                thread_id TEXT UNIQUE NOT NULL,
-                user_id TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+            # Create conversations table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thread_id TEXT UNIQUE NOT NULL,
+                    user_id TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
         
-        # Create conversation_entries table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversation_entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                thread_id TEXT NOT NULL,
-                user_id TEXT NOT NULL,
-                session_id TEXT,
-                user_input TEXT NOT NULL,
-                assistant_response TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                metadata TEXT,  -- JSON string
-                FOREIGN KEY (thread_id) REFERENCES conversations (thread_id)
-            )
-        """)
+            # Create conversation_entries table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thread_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT,
+                    user_input TEXT NOT NULL,
+                    assistant_response TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    metadata TEXT,  -- JSON string
+                    FOREIGN KEY (thread_id) REFERENCES conversations (thread_id)
+                )
+            """)
         
-        # Create conversation_summaries table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversation_summaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                thread_id TEXT UNIQUE NOT NULL,
-                user_id TEXT NOT NULL,
-                summary_text TEXT NOT NULL,
-                key_points TEXT,  -- JSON string of key points
-                intent_summary TEXT,  -- Summary of user intents
-                booking_info TEXT,  -- JSON string of booking information
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (thread_id) REFERENCES conversations (thread_id)
-            )
-        """)
+            # Create conversation_summaries table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thread_id TEXT UNIQUE NOT NULL,
+                    user_id TEXT NOT NULL,
+                    summary_text TEXT NOT NULL,
+                    key_points TEXT,  -- JSON string of key points
+                    intent_summary TEXT,  -- Summary of user intents
+                    booking_info TEXT,  -- JSON string of booking information
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (thread_id) REFERENCES conversations (thread_id)
+                )
+            """)
         
-        # Create indexes for better performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_thread_id ON conversations (thread_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_user_id ON conversations (user_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_thread_id ON conversation_entries (thread_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_user_id ON conversation_entries (user_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON conversation_entries (timestamp)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_summaries_thread_id ON conversation_summaries (thread_id)")
+            # Create indexes for better performance
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_thread_id ON conversations (thread_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_user_id ON conversations (user_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_thread_id ON conversation_entries (thread_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_user_id ON conversation_entries (user_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON conversation_entries (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_summaries_thread_id ON conversation_summaries (thread_id)")
         
-        conn.commit()
-        conn.close()
-        logger.info("Database tables initialized successfully")
+            conn.commit()
+            logger.info("Database tables initialized successfully")
     
     def create_conversation(self, thread_id: str, user_id: str) -> bool:
         """Create a new conversation."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO conversations (thread_id, user_id, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            """, (thread_id, user_id))
+            with self.transaction() as conn:
+                self._upsert_conversation(conn, thread_id, user_id)
             
-            conn.commit()
-            conn.close()
             logger.info(f"Conversation created: {thread_id}")
             return True
             
@@ -107,35 +169,26 @@ class DatabaseManager:
             logger.error(f"Failed to create conversation {thread_id}: {e}")
             return False
     
+    def _upsert_conversation(self, conn: sqlite3.Connection, thread_id: str, user_id: str):
+        """Insert a conversation row or touch the existing one, keeping its created_at."""
+        conn.execute(UPSERT_CONVERSATION_SQL, (thread_id, user_id))
+    
     def add_conversation_entry(self, thread_id: str, user_id: str, user_input: str, 
                               assistant_response: Optional[str] = None,
                               session_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Add a new conversation entry."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Ensure conversation exists
-            self.create_conversation(thread_id, user_id)
-            
-            # Add entry
             metadata_json = json.dumps(metadata) if metadata else None
             
-            cursor.execute("""
-                INSERT INTO conversation_entries 
-                (thread_id, user_id, session_id, user_input, assistant_response, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (thread_id, user_id, session_id, user_input, assistant_response, metadata_json))
-            
-            # Update conversation timestamp
-            cursor.execute("""
-                UPDATE conversations 
-                SET updated_at = CURRENT_TIMESTAMP 
-                WHERE thread_id = ?
-            """, (thread_id,))
+            # Ensure conversation exists (and bump updated_at) and add entry in one transaction
+            with self.transaction() as conn:
+                self._upsert_conversation(conn, thread_id, user_id)
+                conn.execute("""
+                    INSERT INTO conversation_entries 
+                    (thread_id, user_id, session_id, user_input, assistant_response, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (thread_id, user_id, session_id, user_input, assistant_response, metadata_json))
             
-            conn.commit()
-            conn.close()
             logger.info(f"Conversation entry added for thread {thread_id}")
             return True
             
@@ -143,42 +196,79 @@ class DatabaseManager:
             logger.error(f"Failed to add conversation entry for thread {thread_id}: {e}")
             return False
     
+    def add_conversation_entries(self, entries: List[Dict[str, Any]]) -> bool:
+        """Add a batch of conversation entries in one transaction.
+        
+        Each entry is a dict with the keyword arguments of ``add_conversation_entry``
+        plus an optional ``timestamp`` (``YYYY-MM-DD HH:MM:SS``, UTC).
+        """
+        if not entries:
+            return True
+        
+        try:
+            # Latest user_id wins for each thread, same as row-by-row upserts
+            conversations = {entry["thread_id"]: entry["user_id"] for entry in entries}
+            rows = [
+                (
+                    entry["thread_id"],
+                    entry["user_id"],
+                    entry.get("session_id"),
+                    entry["user_input"],
+                    entry.get("assistant_response"),
+                    entry.get("timestamp"),
+                    json.dumps(entry["metadata"]) if entry.get("metadata") else None
+                )
+                for entry in entries
+            ]
+            
+            with self.transaction() as conn:
+                conn.executemany(UPSERT_CONVERSATION_SQL, list(conversations.items()))
+                conn.executemany("""
+                    INSERT INTO conversation_entries 
+                    (thread_id, user_id, session_id, user_input, assistant_response, timestamp, metadata)
+                    VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
+                """, rows)
+            
+            logger.info(f"Added {len(rows)} conversation entries for {len(conversations)} threads")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to add batch of {len(entries)} conversation entries: {e}")
+            return False
+    
     def get_conversation(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """Get conversation with all entries."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Get conversation info
-            cursor.execute("""
-                SELECT * FROM conversations WHERE thread_id = ?
-            """, (thread_id,))
+            with self.connection() as conn:
+                cursor = conn.cursor()
             
-            conversation_row = cursor.fetchone()
-            if not conversation_row:
-                conn.close()
-                return None
+                # Get conversation info
+                cursor.execute("""
+                    SELECT * FROM conversations WHERE thread_id = ?
+                """, (thread_id,))
             
-            # Get all entries
-            cursor.execute("""
-                SELECT * FROM conversation_entries 
-                WHERE thread_id = ? 
-                ORDER BY timestamp ASC
-            """, (thread_id,))
+                conversation_row = cursor.fetchone()
+                if not conversation_row:
+                    return None
             
-            entries = []
-            for row in cursor.fetchall():
-                entry = dict(row)
-                if entry['metadata']:
-                    entry['metadata'] = json.loads(entry['metadata'])
-                entries.append(entry)
+                # Get all entries
+                cursor.execute("""
+                    SELECT * FROM conversation_entries 
+                    WHERE thread_id = ? 
+                    ORDER BY timestamp ASC
+                """, (thread_id,))
             
-            conn.close()
+                entries = []
+                for row in cursor.fetchall():
+                    entry = dict(row)
+                    if entry['metadata']:
+                        entry['metadata'] = json.loads(entry['metadata'])
+                    entries.append(entry)
             
-            conversation = dict(conversation_row)
-            conversation['entries'] = entries
+                conversation = dict(conversation_row)
+                conversation['entries'] = entries
             
-            return conversation
+                return conversation
             
         except Exception as e:
             logger.error(f"Failed to get conversation {thread_id}: {e}")
@@ -187,29 +277,28 @@ class DatabaseManager:
     def get_conversation_entries(self, thread_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get conversation entries for a thread."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.connection() as conn:
+                cursor = conn.cursor()
             
-            query = """
-                SELECT * FROM conversation_entries 
-                WHERE thread_id = ? 
-                ORDER BY timestamp DESC
-            """
+                query = """
+                    SELECT * FROM conversation_entries 
+                    WHERE thread_id = ? 
+                    ORDER BY timestamp DESC
+                """
             
-            if limit:
-                query += f" LIMIT {limit}"
+                if limit:
+                    query += f" LIMIT {limit}"
             
-            cursor.execute(query, (thread_id,))
+                cursor.execute(query, (thread_id,))
             
-            entries = []
-            for row in cursor.fetchall():
-                entry = dict(row)
-                if entry['metadata']:
-                    entry['metadata'] = json.loads(entry['metadata'])
-                entries.append(entry)
+                entries = []
+                for row in cursor.fetchall():
+                    entry = dict(row)
+                    if entry['metadata']:
+                        entry['metadata'] = json.loads(entry['metadata'])
+                    entries.append(entry)
             
-            conn.close()
-            return entries
+                return entries
             
         except Exception as e:
             logger.error(f"Failed to get conversation entries for {thread_id}: {e}")
@@ -218,36 +307,35 @@ class DatabaseManager:
     def list_conversations(self, user_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """List conversations, optionally filtered by user_id."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.connection() as conn:
+                cursor = conn.cursor()
             
-            query = """
-                SELECT c.*, 
-                       COUNT(e.id) as entry_count,
-                       MAX(e.timestamp) as last_message_time
-                FROM conversations c
-                LEFT JOIN conversation_entries e ON c.thread_id = e.thread_id
-            """
+                query = """
+                    SELECT c.*, 
+                           COUNT(e.id) as entry_count,
+                           MAX(e.timestamp) as last_message_time
+                    FROM conversations c
+                    LEFT JOIN conversation_entries e ON c.thread_id = e.thread_id
+                """
             
-            params = []
-            if user_id:
-                query += " WHERE c.user_id = ?"
-                params.append(user_id)
+                params = []
+                if user_id:
+                    query += " WHERE c.user_id = ?"
+                    params.append(user_id)
             
-            query += " GROUP BY c.thread_id ORDER BY c.updated_at DESC"
+                query += " GROUP BY c.thread_id ORDER BY c.updated_at DESC"
             
-            if limit:
-                query += f" LIMIT {limit}"
+                if limit:
+                    query += f" LIMIT {limit}"
             
-            cursor.execute(query, params)
+                cursor.execute(query, params)
             
-            conversations = []
-            for row in cursor.fetchall():
-                conversation = dict(row)
-                conversations.append(conversation)
+                conversations = []
+                for row in cursor.fetchall():
+                    conversation = dict(row)
+                    conversations.append(conversation)
             
-            conn.close()
-            return conversations
+                return conversations
             
         except Exception as e:
             logger.error(f"Failed to list conversations: {e}")
@@ -256,47 +344,44 @@ class DatabaseManager:
     def get_conversation_summary(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """Get conversation summary."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Get conversation info with entry count
-            cursor.execute("""
-                SELECT c.*, 
-                       COUNT(e.id) as entry_count,
-                       MAX(e.timestamp) as last_message_time
-                FROM conversations c
-                LEFT JOIN conversation_entries e ON c.thread_id = e.thread_id
-                WHERE c.thread_id = ?
-                GROUP BY c.thread_id
-            """, (thread_id,))
-            
-            conversation_row = cursor.fetchone()
-            if not conversation_row:
-                conn.close()
-                return None
-            
-            # Get recent entries for summary
-            cursor.execute("""
-                SELECT user_input, timestamp 
-                FROM conversation_entries 
-                WHERE thread_id = ? 
-                ORDER BY timestamp DESC 
-                LIMIT 5
-            """, (thread_id,))
-            
-            recent_entries = []
-            for row in cursor.fetchall():
-                recent_entries.append({
-                    'user_input': row['user_input'][:100] + "..." if len(row['user_input']) > 100 else row['user_input'],
-                    'timestamp': row['timestamp']
-                })
-            
-            conn.close()
-            
-            summary = dict(conversation_row)
-            summary['recent_entries'] = recent_entries
-            
-            return summary
+            with self.connection() as conn:
+                cursor = conn.cursor()
+            
+                # Get conversation info with entry count
+                cursor.execute("""
+                    SELECT c.*, 
+                           COUNT(e.id) as entry_count,
+                           MAX(e.timestamp) as last_message_time
+                    FROM conversations c
+                    LEFT JOIN conversation_entries e ON c.thread_id = e.thread_id
+                    WHERE c.thread_id = ?
+                    GROUP BY c.thread_id
+                """, (thread_id,))
+            
+                conversation_row = cursor.fetchone()
+                if not conversation_row:
+                    return None
+            
+                # Get recent entries for summary
+                cursor.execute("""
+                    SELECT user_input, timestamp 
+                    FROM conversation_entries 
+                    WHERE thread_id = ? 
+                    ORDER BY timestamp DESC 
+                    LIMIT 5
+                """, (thread_id,))
+            
+                recent_entries = []
+                for row in cursor.fetchall():
+                    recent_entries.append({
+                        'user_input': row['user_input'][:100] + "..." if len(row['user_input']) > 100 else row['user_input'],
+                        'timestamp': row['timestamp']
+                    })
+            
+                summary = dict(conversation_row)
+                summary['recent_entries'] = recent_entries
+            
+                return summary
             
         except Exception as e:
             logger.error(f"Failed to get conversation summary for {thread_id}: {e}")
@@ -308,24 +393,27 @@ class DatabaseManager:
                                 booking_info: Optional[Dict[str, Any]] = None) -> bool:
         """Save a conversation summary."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO conversation_summaries 
-                (thread_id, user_id, summary_text, key_points, intent_summary, booking_info, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """, (
-                thread_id, 
-                user_id, 
-                summary_text,
-                json.dumps(key_points) if key_points else None,
-                intent_summary,
-                json.dumps(booking_info) if booking_info else None
-            ))
+            with self.transaction() as conn:
+                conn.execute("""
+                    INSERT INTO conversation_summaries 
+                    (thread_id, user_id, summary_text, key_points, intent_summary, booking_info, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (thread_id) DO UPDATE SET
+                        user_id = excluded.user_id,
+                        summary_text = excluded.summary_text,
+                        key_points = excluded.key_points,
+                        intent_summary = excluded.intent_summary,
+                        booking_info = excluded.booking_info,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (
+                    thread_id, 
+                    user_id, 
+                    summary_text,
+                    json.dumps(key_points) if key_points else None,
+                    intent_summary,
+                    json.dumps(booking_info) if booking_info else None
+                ))
             
-            conn.commit()
-            conn.close()
             logger.info(f"Conversation summary saved for thread {thread_id}")
             return True
             
@@ -336,29 +424,27 @@ class DatabaseManager:
     def get_conversation_summary_detailed(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed conversation summary including AI-generated summary."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT * FROM conversation_summaries 
-                WHERE thread_id = ?
-            """, (thread_id,))
+                cursor.execute("""
+                    SELECT * FROM conversation_summaries 
+                    WHERE thread_id = ?
+                """, (thread_id,))
             
-            summary_row = cursor.fetchone()
-            if not summary_row:
-                conn.close()
-                return None
+                summary_row = cursor.fetchone()
+                if not summary_row:
+                    return None
             
-            summary = dict(summary_row)
+                summary = dict(summary_row)
             
-            # Parse JSON fields
-            if summary.get('key_points'):
-                summary['key_points'] = json.loads(summary['key_points'])
-            if summary.get('booking_info'):
-                summary['booking_info'] = json.loads(summary['booking_info'])
+                # Parse JSON fields
+                if summary.get('key_points'):
+                    summary['key_points'] = json.loads(summary['key_points'])
+                if summary.get('booking_info'):
+                    summary['booking_info'] = json.loads(summary['booking_info'])
             
-            conn.close()
-            return summary
+                return summary
             
         except Exception as e:
             logger.error(f"Failed to get detailed conversation summary for {thread_id}: {e}")
@@ -367,20 +453,19 @@ class DatabaseManager:
     def delete_conversation(self, thread_id: str) -> bool:
         """Delete a conversation and all its entries."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.connection() as conn:
+                cursor = conn.cursor()
             
-            # Delete entries first (due to foreign key constraint)
-            cursor.execute("DELETE FROM conversation_entries WHERE thread_id = ?", (thread_id,))
+                # Delete entries first (due to foreign key constraint)
+                cursor.execute("DELETE FROM conversation_entries WHERE thread_id = ?", (thread_id,))
             
-            # Delete conversation
-            cursor.execute("DELETE FROM conversations WHERE thread_id = ?", (thread_id,))
+                # Delete conversation
+                cursor.execute("DELETE FROM conversations WHERE thread_id = ?", (thread_id,))
             
-            conn.commit()
-            conn.close()
+                conn.commit()
             
-            logger.info(f"Conversation deleted: {thread_id}")
-            return True
+                logger.info(f"Conversation deleted: {thread_id}")
+                return True
             
         except Exception as e:
             logger.error(f"Failed to delete conversation {thread_id}: {e}")
@@ -389,29 +474,28 @@ class DatabaseManager:
     def cleanup_old_conversations(self, days_old: int = 30) -> int:
         """Clean up conversations older than specified days."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Delete old conversations and their entries
-            cursor.execute("""
-                DELETE FROM conversation_entries 
-                WHERE thread_id IN (
-                    SELECT thread_id FROM conversations 
+            with self.connection() as conn:
+                cursor = conn.cursor()
+            
+                # Delete old conversations and their entries
+                cursor.execute("""
+                    DELETE FROM conversation_entries 
+                    WHERE thread_id IN (
+                        SELECT thread_id FROM conversations 
+                        WHERE updated_at < datetime('now', '-{} days')
+                    )
+                """.format(days_old))
+            
+                cursor.execute("""
+                    DELETE FROM conversations 
                     WHERE updated_at < datetime('now', '-{} days')
-                )
-            """.format(days_old))
-            
-            cursor.execute("""
-                DELETE FROM conversations 
-                WHERE updated_at < datetime('now', '-{} days')
-            """.format(days_old))
+                """.format(days_old))
             
-            deleted_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+                deleted_count = cursor.rowcount
+                conn.commit()
             
-            logger.info(f"Cleaned up {deleted_count} old conversations")
-            return deleted_count
+                logger.info(f"Cleaned up {deleted_count} old conversations")
+                return deleted_count
             
         except Exception as e:
             logger.error(f"Failed to cleanup old conversations: {e}")
@@ -420,37 +504,35 @@ class DatabaseManager:
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Total conversations
-            cursor.execute("SELECT COUNT(*) as total_conversations FROM conversations")
-            total_conversations = cursor.fetchone()['total_conversations']
-            
-            # Total entries
-            cursor.execute("SELECT COUNT(*) as total_entries FROM conversation_entries")
-            total_entries = cursor.fetchone()['total_entries']
-            
-            # Unique users
-            cursor.execute("SELECT COUNT(DISTINCT user_id) as unique_users FROM conversations")
-            unique_users = cursor.fetchone()['unique_users']
-            
-            # Recent activity (last 7 days)
-            cursor.execute("""
-                SELECT COUNT(*) as recent_entries 
-                FROM conversation_entries 
-                WHERE timestamp > datetime('now', '-7 days')
-            """)
-            recent_entries = cursor.fetchone()['recent_entries']
-            
-            conn.close()
-            
-            return {
-                'total_conversations': total_conversations,
-                'total_entries': total_entries,
-                'unique_users': unique_users,
-                'recent_entries_7_days': recent_entries
-            }
+            with self.connection() as conn:
+                cursor = conn.cursor()
+            
+                # Total conversations
+                cursor.execute("SELECT COUNT(*) as total_conversations FROM conversations")
+                total_conversations = cursor.fetchone()['total_conversations']
+            
+                # Total entries
+                cursor.execute("SELECT COUNT(*) as total_entries FROM conversation_entries")
+                total_entries = cursor.fetchone()['total_entries']
+            
+                # Unique users
+                cursor.execute("SELECT COUNT(DISTINCT user_id) as unique_users FROM conversations")
+                unique_users = cursor.fetchone()['unique_users']
+            
+                # Recent activity (last 7 days)
+                cursor.execute("""
+                    SELECT COUNT(*) as recent_entries 
+                    FROM conversation_entries 
+                    WHERE timestamp > datetime('now', '-7 days')
+                """)
+                recent_entries = cursor.fetchone()['recent_entries']
+            
+                return {
+                    'total_conversations': total_conversations,
+                    'total_entries': total_entries,
+                    'unique_users': unique_users,
+                    'recent_entries_7_days': recent_entries
+                }
             
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
@@ -0,0 +1,88 @@
+"""
+Flexible-date fare calendar for Flight Booking Agent
+"""
+
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+import numpy as np
+
+from .flight_inventory import FlightInventory, FLIGHT_COLUMNS, flight_inventory
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [name.strip() for name in FLIGHT_COLUMNS.split(",")]
+FLIGHT_DATE, PRICE, AVAILABLE_SEATS = (COLUMNS.index(name) for name in ("flight_date", "price", "available_seats"))
+
+
+class FareCalendar:
+    """Cheapest fare per day for a route over a date window.
+
+    All flights of the window come from one indexed range query; the price,
+    seat and date columns are lifted into arrays and priced in one NumPy pass: total = price x passengers x class
+    multiplier, masked where fewer than ``passengers`` seats are left, then
+    reduced per day with a scatter-min (no sort) and overall.
+    """
+
+    def __init__(self, inventory: Optional[FlightInventory] = None):
+        self.inventory = inventory or flight_inventory
+
+    def calendar(self, departure: str, arrival: str, start_date: str, days: int = 7, passengers: int = 1,
+                 class_type: str = "economy", price_multipliers: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Cheapest bookable flight for each day from ``start_date`` and the overall minimum."""
+        start = date.fromisoformat(start_date.strip())
+        dates = [(start + timedelta(days=offset)).isoformat() for offset in range(max(days, 1))]
+        rows = self.inventory.route_flights(departure, arrival, dates)
+        multiplier = (price_multipliers or {}).get(class_type, 1.0)
+        calendar = self.price_days(rows, dates, passengers, multiplier)
+
+        priced = [entry for entry in calendar if entry["total_price"] is not None]
+        return {
+            "departure": departure,
+            "arrival": arrival,
+            "passengers": passengers,
+            "class_type": class_type,
+            "days": calendar,
+            "cheapest": min(priced, key=lambda entry: entry["total_price"]) if priced else None
+        }
+
+    def price_days(self, rows: List[Tuple], dates: List[str], passengers: int = 1,
+                   multiplier: float = 1.0) -> List[Dict[str, Any]]:
+        """Vectorized pass over ``FLIGHT_COLUMNS`` rows: cheapest bookable flight per date."""
+        # Only the numeric columns are converted; the row tuples stay as they are
+        position = {flight_date: offset for offset, flight_date in enumerate(dates)}
+        prices = np.fromiter(map(itemgetter(PRICE), rows), np.float64, len(rows))
+        seats = np.fromiter(map(itemgetter(AVAILABLE_SEATS), rows), np.int64, len(rows))
+        day_index = np.fromiter(map(position.__getitem__, map(itemgetter(FLIGHT_DATE), rows)), np.int64, len(rows))
+
+        totals = prices * (passengers * multiplier)
+        bookable = seats >= passengers
+
+        # Cheapest per day: scatter-min the bookable totals, then take each day's first row at that minimum
+        masked = np.where(bookable, totals, np.inf)
+        day_min = np.full(len(dates), np.inf)
+        np.minimum.at(day_min, day_index, masked)
+        candidates = np.flatnonzero(bookable & (masked == day_min[day_index]))
+        days_found, first = np.unique(day_index[candidates], return_index=True)
+        counts = np.bincount(day_index, minlength=len(dates))
+        available = np.bincount(day_index, weights=bookable, minlength=len(dates))
+
+        best = dict(zip(days_found.tolist(), candidates[first].tolist()))
+        calendar = []
+        for offset, flight_date in enumerate(dates):
+            entry = {
+                "date": flight_date,
+                "flights": int(counts[offset]),
+                "available_flights": int(available[offset]),
+                "status": "available" if offset in best else "sold_out" if counts[offset] else "no_flights",
+                "flight": None,
+                "total_price": None
+            }
+            if offset in best:
+                i = best[offset]
+                entry["flight"] = dict(zip(COLUMNS, rows[i]))
+                entry["total_price"] = round(float(totals[i]), 2)
+            calendar.append(entry)
+        return calendar
@@ -0,0 +1,492 @@
+"""
+Shared, persistent flight inventory for Flight Booking Agent
+"""
+
+import random
+import sqlite3
+import uuid
+import zlib
+from datetime import date
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple
+import logging
+
+from ..config import settings, DatabaseConfig
+from .database import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+FLIGHT_COLUMNS = (
+    "flight_number, flight_date, departure, arrival, departure_time, arrival_time, price, airline, available_seats"
+)
+
+# Secondary indexes on flights, rebuilt once after a bulk load
+FLIGHT_INDEXES = {
+    "idx_flights_route_date": "CREATE INDEX IF NOT EXISTS idx_flights_route_date ON flights (departure, arrival, flight_date)",
+    "idx_flights_date": "CREATE INDEX IF NOT EXISTS idx_flights_date ON flights (flight_date, departure)",
+}
+
+# Departure/arrival times for routes without a seeded schedule
+GENERATED_DEPARTURES = [("08:00", "10:30"), ("14:30", "17:00")]
+
+# Operating days of a schedule as weekday digits (Monday = 0)
+EVERY_DAY = "0123456"
+
+
+def weekday_of(flight_date: str) -> str:
+    """Weekday digit of an ISO date; "" (matching every schedule) if the date cannot be parsed."""
+    try:
+        return str(date.fromisoformat(flight_date).weekday())
+    except ValueError:
+        return ""
+
+
+class InventoryError(Exception):
+    """Raised when a booking cannot be made or changed."""
+    pass
+
+
+class FlightInventory(SQLiteStore):
+    """Flight schedules, dated flight instances with seat counts, and bookings.
+
+    ``schedules`` holds recurring flights and the weekdays they operate on;
+    ``flights`` holds one row per flight and operating date, materialized
+    from the schedule on first search and indexed on
+    (departure, arrival, flight_date), so route lookups are B-tree seeks.
+    ``flight_dates`` lists the bulk-loaded days, whose schedule is complete;
+    whole-network (connection) searches materialize other days without
+    adding them, since routes first searched later still get schedules there.
+    Seat changes are conditional UPDATEs inside one write transaction, so
+    concurrent bookings can never oversell a flight.
+    """
+
+    def __init__(self, db_path: str = "data/flight_inventory.db", pool_size: Optional[int] = None,
+                 pool_timeout: Optional[float] = None, config: Optional[DatabaseConfig] = None):
+        """Initialize the flight inventory."""
+        super().__init__(db_path, pool_size=pool_size, pool_timeout=pool_timeout, config=config)
+        self._seat_listeners: List[Callable[[str, str, str], None]] = []
+        self._flights_listeners: List[Callable[[str], None]] = []
+        logger.info(f"Flight inventory initialized at: {self.db_path}")
+
+    def add_seat_listener(self, callback: Callable[[str, str, str], None]):
+        """Call ``callback(departure, arrival, flight_date)`` after a booking or cancellation changes seats."""
+        self._seat_listeners.append(callback)
+
+    def _notify_seats(self, departure: str, arrival: str, flight_date: str):
+        for callback in self._seat_listeners:
+            try:
+                callback(departure, arrival, flight_date)
+            except Exception as e:
+                logger.error(f"Seat listener failed: {e}")
+
+    def add_flights_listener(self, callback: Callable[[str], None]):
+        """Call ``callback(flight_date)`` after flights are inserted for a date."""
+        self._flights_listeners.append(callback)
+
+    def _notify_flights(self, flight_dates: Iterable[str]):
+        for flight_date in flight_dates:
+            for callback in self._flights_listeners:
+                try:
+                    callback(flight_date)
+                except Exception as e:
+                    logger.error(f"Flights listener failed: {e}")
+
+    def init_database(self):
+        """Initialize inventory tables."""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+
+            # Recurring schedule, one row per flight number
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schedules (
+                    flight_number TEXT PRIMARY KEY,
+                    departure TEXT NOT NULL COLLATE NOCASE,
+                    arrival TEXT NOT NULL COLLATE NOCASE,
+                    departure_time TEXT NOT NULL,
+                    arrival_time TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    airline TEXT NOT NULL,
+                    seats INTEGER NOT NULL,
+                    weekdays TEXT NOT NULL DEFAULT '0123456'
+                )
+            """)
+            # Inventories created before operating weekdays were stored fly every day
+            if "weekdays" not in {row[1] for row in cursor.execute("PRAGMA table_info(schedules)")}:
+                cursor.execute(f"ALTER TABLE schedules ADD COLUMN weekdays TEXT NOT NULL DEFAULT '{EVERY_DAY}'")
+
+            # Dated flight instances with remaining seats
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS flights (
+                    flight_number TEXT NOT NULL,
+                    flight_date TEXT NOT NULL,
+                    departure TEXT NOT NULL COLLATE NOCASE,
+                    arrival TEXT NOT NULL COLLATE NOCASE,
+                    departure_time TEXT NOT NULL,
+                    arrival_time TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    airline TEXT NOT NULL,
+                    available_seats INTEGER NOT NULL CHECK (available_seats >= 0),
+                    PRIMARY KEY (flight_number, flight_date)
+                ) WITHOUT ROWID
+            """)
+
+            # Days whose flights are complete (bulk loaded or materialized from all schedules)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS flight_dates (
+                    flight_date TEXT PRIMARY KEY
+                ) WITHOUT ROWID
+            """)
+
+            # Provenance of generated data (generator seed, start date, horizon)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS inventory_metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bookings (
+                    booking_ref TEXT PRIMARY KEY,
+                    flight_number TEXT NOT NULL,
+                    flight_date TEXT NOT NULL,
+                    passenger_name TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    passengers INTEGER NOT NULL,
+                    class_type TEXT NOT NULL,
+                    total_price REAL NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_schedules_route ON schedules (departure, arrival)")
+            for index_sql in FLIGHT_INDEXES.values():
+                cursor.execute(index_sql)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_email ON bookings (email)")
+
+            conn.commit()
+            logger.info("Flight inventory tables initialized successfully")
+
+    def add_schedules(self, schedules: Iterable[Dict[str, Any]]) -> int:
+        """Insert schedules that do not exist yet; returns the number added.
+
+        ``weekdays`` (weekday numbers, Monday = 0) defaults to every day.
+        """
+        rows = [
+            (s["flight_number"], s["departure"], s["arrival"], s["departure_time"], s["arrival_time"],
+             float(s["price"]), s["airline"], int(s["available_seats"]),
+             "".join(str(day) for day in sorted(s.get("weekdays", range(7)))))
+            for s in schedules
+        ]
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO schedules
+                (flight_number, departure, arrival, departure_time, arrival_time, price, airline, seats, weekdays)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            return conn.total_changes - before
+
+    def add_flights(self, flights: Iterable[Tuple], batch_size: int = 50000) -> int:
+        """Bulk insert dated flight rows ordered as ``FLIGHT_COLUMNS``; existing rows are kept."""
+        batch = []
+        dates = set()
+        with self.transaction() as conn:
+            before = conn.total_changes
+            for row in flights:
+                batch.append(row)
+                dates.add(row[1])
+                if len(batch) >= batch_size:
+                    conn.executemany(f"INSERT OR IGNORE INTO flights ({FLIGHT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                    batch.clear()
+            if batch:
+                conn.executemany(f"INSERT OR IGNORE INTO flights ({FLIGHT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            added = conn.total_changes - before
+        if added:
+            self._notify_flights(sorted(dates))
+        return added
+
+    def bulk_load(self, schedules: Iterable[Dict[str, Any]], flights: Iterable[Tuple],
+                  batch_size: int = 50000) -> Dict[str, int]:
+        """Load generated schedules and flights in one transaction, building the indexes once at the end.
+
+        The loaded dates are recorded as complete: a generated schedule that
+        does not operate on a loaded day has no flight that day.
+        """
+        dates = set()
+
+        def track_dates(rows):
+            for row in rows:
+                dates.add(row[1])
+                yield row
+
+        with self.transaction() as conn:
+            # Maintaining the indexes row by row is slower than one sorted build each
+            for name in FLIGHT_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            added_schedules = self.add_schedules(schedules)
+            added_flights = self.add_flights(track_dates(flights), batch_size=batch_size)
+            conn.executemany("INSERT OR IGNORE INTO flight_dates (flight_date) VALUES (?)",
+                             [(flight_date,) for flight_date in sorted(dates)])
+            for index_sql in FLIGHT_INDEXES.values():
+                conn.execute(index_sql)
+        # add_flights ran inside this transaction; notify again now that it is committed
+        if added_flights:
+            self._notify_flights(sorted(dates))
+        return {"schedules": added_schedules, "flights": added_flights}
+
+    def set_metadata(self, values: Dict[str, Any]):
+        """Record key/value metadata about the loaded data, replacing earlier values."""
+        with self.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO inventory_metadata (key, value) VALUES (?, ?)",
+                             [(key, str(value)) for key, value in values.items()])
+
+    def get_metadata(self) -> Dict[str, str]:
+        """Get the recorded metadata."""
+        with self.connection() as conn:
+            return {row[0]: row[1] for row in conn.execute("SELECT key, value FROM inventory_metadata")}
+
+    def materialize_date(self, flight_date: str) -> int:
+        """Create every flight scheduled on a date not bulk loaded; returns the number of flights added.
+
+        The date is not recorded in ``flight_dates``: routes without a
+        schedule yet are still generated when ``search_flights`` asks for them.
+        """
+        with self.connection() as conn:
+            if conn.execute("SELECT 1 FROM flight_dates WHERE flight_date = ?", (flight_date,)).fetchone():
+                return 0
+
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.execute(f"""
+                INSERT OR IGNORE INTO flights ({FLIGHT_COLUMNS})
+                SELECT flight_number, ?, departure, arrival, departure_time, arrival_time, price, airline, seats
+                FROM schedules WHERE instr(weekdays, ?) > 0
+            """, (flight_date, weekday_of(flight_date)))
+            added = conn.total_changes - before
+        if added:
+            self._notify_flights([flight_date])
+        return added
+
+    def flights_on(self, flight_date: str) -> List[Tuple]:
+        """All flights on a date as ``FLIGHT_COLUMNS`` tuples."""
+        with self.connection() as conn:
+            return [tuple(row) for row in conn.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights WHERE flight_date = ?",
+                                                       (flight_date,))]
+
+    def search_flights(self, departure: str, arrival: str, flight_date: str) -> List[Dict[str, Any]]:
+        """Get flights for a route and date, creating them from the schedule on first request.
+
+        A bulk-loaded date (in ``flight_dates``) is complete: no flights there
+        means the route does not operate that day.
+        """
+        departure, arrival, flight_date = departure.strip(), arrival.strip(), flight_date.strip()
+        flights = self._find_flights(departure, arrival, flight_date)
+        if flights:
+            return flights
+
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM flight_dates WHERE flight_date = ?", (flight_date,)).fetchone():
+                return []
+            if not conn.execute("SELECT 1 FROM schedules WHERE departure = ? AND arrival = ? LIMIT 1",
+                                (departure, arrival)).fetchone():
+                self._generate_schedules(conn, departure, arrival)
+            added = conn.execute(f"""
+                INSERT OR IGNORE INTO flights ({FLIGHT_COLUMNS})
+                SELECT flight_number, ?, departure, arrival, departure_time, arrival_time, price, airline, seats
+                FROM schedules WHERE departure = ? AND arrival = ? AND instr(weekdays, ?) > 0
+            """, (flight_date, departure, arrival, weekday_of(flight_date))).rowcount
+        if added:
+            self._notify_flights([flight_date])
+        return self._find_flights(departure, arrival, flight_date)
+
+    def route_flights(self, departure: str, arrival: str, flight_dates: List[str]) -> List[Tuple]:
+        """Flights on a route over several dates as ``FLIGHT_COLUMNS`` tuples, in one range scan.
+
+        Dates that are neither bulk loaded nor searched yet are materialized
+        first, exactly as ``search_flights`` would.
+        """
+        departure, arrival = departure.strip(), arrival.strip()
+        first, last = min(flight_dates), max(flight_dates)
+        with self.connection() as conn:
+            known = {row[0] for row in conn.execute("""
+                SELECT DISTINCT flight_date FROM flights WHERE departure = ? AND arrival = ? AND flight_date BETWEEN ? AND ?
+            """, (departure, arrival, first, last))}
+            known.update(row[0] for row in conn.execute(
+                "SELECT flight_date FROM flight_dates WHERE flight_date BETWEEN ? AND ?", (first, last)))
+
+        for flight_date in flight_dates:
+            if flight_date not in known:
+                self.search_flights(departure, arrival, flight_date)
+
+        with self.connection() as conn:
+            return [tuple(row) for row in conn.execute(f"""
+                SELECT {FLIGHT_COLUMNS} FROM flights
+                WHERE departure = ? AND arrival = ? AND flight_date BETWEEN ? AND ?
+            """, (departure, arrival, first, last))]
+
+    def _find_flights(self, departure: str, arrival: str, flight_date: str) -> List[Dict[str, Any]]:
+        with self.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {FLIGHT_COLUMNS} FROM flights
+                WHERE departure = ? AND arrival = ? AND flight_date = ?
+                ORDER BY departure_time
+            """, (departure, arrival, flight_date)).fetchall()
+        return [dict(row) for row in rows]
+
+    def _generate_schedules(self, conn: sqlite3.Connection, departure: str, arrival: str):
+        """Create a stable schedule for a route with no seeded flights."""
+        # Seed from the route so the same route always gets the same flights
+        rng = random.Random(zlib.crc32(f"{departure.lower()}-{arrival.lower()}".encode()))
+        number = rng.randint(1000, 9999)
+        for departure_time, arrival_time in GENERATED_DEPARTURES:
+            # Skip flight numbers already taken by another route
+            while conn.execute("SELECT 1 FROM schedules WHERE flight_number = ?", (f"FL{number}",)).fetchone():
+                number = 1000 + (number - 999) % 9000
+            conn.execute("""
+                INSERT INTO schedules
+                (flight_number, departure, arrival, departure_time, arrival_time, price, airline, seats)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (f"FL{number}", departure, arrival, departure_time, arrival_time,
+                  rng.randint(200, 600), rng.choice(settings.mock_data.airlines), rng.randint(20, 50)))
+
+    def get_flight(self, flight_number: str, flight_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a flight instance; without a date, the earliest one with seats left."""
+        with self.connection() as conn:
+            if flight_date:
+                row = conn.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights WHERE flight_number = ? AND flight_date = ?",
+                                   (flight_number, flight_date)).fetchone()
+            else:
+                row = conn.execute(f"""
+                    SELECT {FLIGHT_COLUMNS} FROM flights WHERE flight_number = ?
+                    ORDER BY available_seats = 0, flight_date LIMIT 1
+                """, (flight_number,)).fetchone()
+        return dict(row) if row else None
+
+    def book(self, flight_number: str, passenger_name: str, email: str, passengers: int = 1,
+             class_type: str = "economy", flight_date: Optional[str] = None,
+             price_multipliers: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Reserve seats and record the booking atomically; raises InventoryError on failure."""
+        if passengers < 1:
+            raise InventoryError("Number of passengers must be at least 1.")
+
+        multipliers = price_multipliers or {}
+        materialized = False
+        with self.transaction() as conn:
+            if flight_date:
+                flight = conn.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights WHERE flight_number = ? AND flight_date = ?",
+                                      (flight_number, flight_date)).fetchone()
+                if flight is None:
+                    # Searched flights are materialized; a known schedule can still be booked on its operating
+                    # days, unless the date is complete (its missing flights do not exist)
+                    schedule = conn.execute("""
+                        SELECT * FROM schedules WHERE flight_number = ? AND instr(weekdays, ?) > 0
+                        AND NOT EXISTS (SELECT 1 FROM flight_dates WHERE flight_date = ?)
+                    """, (flight_number, weekday_of(flight_date), flight_date)).fetchone()
+                    if schedule is not None:
+                        conn.execute(f"""
+                            INSERT INTO flights ({FLIGHT_COLUMNS})
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """, (flight_number, flight_date, schedule["departure"], schedule["arrival"],
+                              schedule["departure_time"], schedule["arrival_time"], schedule["price"],
+                              schedule["airline"], schedule["seats"]))
+                        materialized = True
+                        flight = conn.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights WHERE flight_number = ? AND flight_date = ?",
+                                              (flight_number, flight_date)).fetchone()
+            else:
+                flight = conn.execute(f"""
+                    SELECT {FLIGHT_COLUMNS} FROM flights WHERE flight_number = ? AND available_seats >= ?
+                    ORDER BY flight_date LIMIT 1
+                """, (flight_number, passengers)).fetchone()
+
+            if flight is None:
+                raise InventoryError(f"Flight {flight_number} not found. Please search for flights first.")
+
+            # Conditional decrement: succeeds only if enough seats remain at commit time
+            updated = conn.execute("""
+                UPDATE flights SET available_seats = available_seats - ?
+                WHERE flight_number = ? AND flight_date = ? AND available_seats >= ?
+            """, (passengers, flight["flight_number"], flight["flight_date"], passengers)).rowcount
+            if not updated:
+                raise InventoryError(
+                    f"Not enough seats on {flight_number} ({flight['flight_date']}): "
+                    f"{flight['available_seats']} left, {passengers} requested."
+                )
+
+            booking = {
+                "booking_ref": f"BK{uuid.uuid4().hex[:8].upper()}",
+                "flight_number": flight["flight_number"],
+                "flight_date": flight["flight_date"],
+                "passenger_name": passenger_name,
+                "email": email,
+                "passengers": passengers,
+                "class_type": class_type,
+                "total_price": flight["price"] * passengers * multipliers.get(class_type, 1.0),
+                "status": "confirmed"
+            }
+            conn.execute("""
+                INSERT INTO bookings
+                (booking_ref, flight_number, flight_date, passenger_name, email, passengers, class_type, total_price, status)
+                VALUES (:booking_ref, :flight_number, :flight_date, :passenger_name, :email, :passengers,
+                        :class_type, :total_price, :status)
+            """, booking)
+
+        if materialized:
+            self._notify_flights([flight["flight_date"]])
+        self._notify_seats(flight["departure"], flight["arrival"], flight["flight_date"])
+        logger.info(f"Booking {booking['booking_ref']} confirmed on {flight_number} ({booking['flight_date']})")
+        return booking
+
+    def get_booking(self, booking_ref: str) -> Optional[Dict[str, Any]]:
+        """Get a booking by reference."""
+        with self.connection() as conn:
+            row = conn.execute("""
+                SELECT booking_ref, flight_number, flight_date, passenger_name, email, passengers,
+                       class_type, total_price, status, created_at, updated_at
+                FROM bookings WHERE booking_ref = ?
+            """, (booking_ref.strip().upper(),)).fetchone()
+        return dict(row) if row else None
+
+    def cancel(self, booking_ref: str, email: str) -> Dict[str, Any]:
+        """Cancel a booking and release its seats; raises InventoryError on failure."""
+        with self.transaction() as conn:
+            booking = conn.execute("SELECT * FROM bookings WHERE booking_ref = ?",
+                                   (booking_ref.strip().upper(),)).fetchone()
+            if booking is None:
+                raise InventoryError(f"Booking reference {booking_ref} not found.")
+            if booking["email"].lower() != email.strip().lower():
+                raise InventoryError("Email does not match booking. Cannot cancel.")
+            if booking["status"] == "cancelled":
+                raise InventoryError(f"Booking {booking_ref} is already cancelled.")
+
+            conn.execute("""
+                UPDATE bookings SET status = 'cancelled', updated_at = CURRENT_TIMESTAMP WHERE booking_ref = ?
+            """, (booking["booking_ref"],))
+            conn.execute("""
+                UPDATE flights SET available_seats = available_seats + ?
+                WHERE flight_number = ? AND flight_date = ?
+            """, (booking["passengers"], booking["flight_number"], booking["flight_date"]))
+            flight = conn.execute("SELECT departure, arrival FROM flights WHERE flight_number = ? AND flight_date = ?",
+                                  (booking["flight_number"], booking["flight_date"])).fetchone()
+
+        if flight is not None:
+            self._notify_seats(flight["departure"], flight["arrival"], booking["flight_date"])
+        logger.info(f"Booking {booking['booking_ref']} cancelled")
+        return {**dict(booking), "status": "cancelled"}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get inventory statistics."""
+        with self.connection() as conn:
+            schedules = conn.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
+            flights = conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+            bookings = conn.execute("SELECT status, COUNT(*) FROM bookings GROUP BY status").fetchall()
+        return {
+            "schedules": schedules,
+            "flights": flights,
+            "bookings": {row[0]: row[1] for row in bookings}
+        }
+
+
+# Global instance
+flight_inventory = FlightInventory()
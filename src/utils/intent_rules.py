@@ -0,0 +1,243 @@
+"""
+Rule-based fast-path intent classifier for Flight Booking Agent
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Vietnamese-only letters (lowercase, NFC); any of them marks the text as Vietnamese
+VIETNAMESE_CHARS = re.compile(
+    r"[ăâđêôơưáàảãạấầẩẫậắằẳẵặéèẻẽẹếềểễệíìỉĩịóòỏõọốồổỗộớờởỡợúùủũụứừửữựýỳỷỹỵ]"
+)
+
+GREETING_PATTERN = re.compile(
+    r"^(hi|hello|hey|hiya|yo|good (morning|afternoon|evening)|thanks?( you)?( so much)?|thank you very much|"
+    r"ok(ay)?|bye|goodbye|see you|xin chào|chào( bạn| em| anh| chị)?|alo|cảm ơn( bạn| em)?|cám ơn( bạn| em)?|"
+    r"tạm biệt|hẹn gặp lại)"
+    r"(\s+(there|tebby|bạn|em|nhé|nha|ạ|nhiều))*[\s!.,?]*$"
+)
+
+# (intent, pattern, confidence)
+KEYWORD_RULES: List[Tuple[str, "re.Pattern", float]] = [
+    ("check_weather", re.compile(
+        r"\b(weather|forecast|temperature|rain(ing)?|sunny)\b|thời tiết|nhiệt độ|có mưa"
+    ), 0.92),
+    ("flight_status", re.compile(
+        r"\bflight status\b|\bstatus of (my |the )?flight\b|\b(is|was) (flight )?\w*\d+\w* (on time|delayed|late)\b|"
+        r"\b(delayed|on time)\b|tình trạng chuyến bay|trạng thái chuyến bay|chuyến bay .*(trễ|hoãn|đúng giờ)"
+    ), 0.9),
+    ("cancel_booking", re.compile(
+        r"\bcancel(l?ing|l?ed)?\b.*\b(booking|reservation|ticket|flight)\b|"
+        r"\b(booking|reservation|ticket)\b.*\bcancel|(hủy|huỷ) .*(vé|đặt chỗ|chuyến|booking)"
+    ), 0.93),
+    ("booking_info", re.compile(
+        r"\b(booking|reservation) (info(rmation)?|details?|reference|status)\b|\bmy (booking|reservation)\b|"
+        r"\blook ?up\b.*\b(booking|reservation)\b|\bbk[a-z0-9]{4,}\b|"
+        r"mã đặt chỗ|tra cứu (vé|đặt chỗ|booking)|thông tin đặt (vé|chỗ)"
+    ), 0.88)
+]
+
+FLIGHT_NUMBER_PATTERN = re.compile(r"\b[a-z]{2}\d{2,4}\b")
+
+EMAIL_PATTERN = re.compile(r"^[\w.+-]+@[\w-]+(\.[\w-]+)+$")
+DATE_PATTERN = re.compile(
+    r"\b\d{4}-\d{1,2}-\d{1,2}\b|\b\d{1,2}[/.-]\d{1,2}([/.-]\d{2,4})?\b|"
+    r"\b(today|tomorrow|tonight|next (week|month|mon(day)?|tue(sday)?|wed(nesday)?|thu(rsday)?|fri(day)?|sat(urday)?|sun(day)?))\b|"
+    r"\b(jan(uary)?|feb(ruary)?|mar(ch)?|apr(il)?|may|jun(e)?|jul(y)?|aug(ust)?|sep(tember)?|oct(ober)?|nov(ember)?|dec(ember)?)\b|"
+    r"hôm nay|ngày mai|ngày kia|tuần (sau|tới)|tháng (sau|tới)|\bngày \d{1,2}|thứ (hai|ba|tư|năm|sáu|bảy)|chủ nhật"
+)
+COUNT_PATTERN = re.compile(
+    r"^(\d{1,2}|one|two|three|four|five|six|seven|eight|nine|ten|một|hai|ba|bốn|năm|sáu|bảy|tám|chín|mười)"
+    r"(\s+(people|persons?|passengers?|pax|adults?|of us|người|hành khách|vé|khách))?$"
+)
+YES_NO_PATTERN = re.compile(
+    r"^(yes|yeah|yep|no|nope|round[ -]?trip|one[ -]?way|return|có|không|khứ hồi|một chiều|vâng|dạ có|dạ không)"
+    r"(\s+(please|thanks|ạ|nhé))?[\s.!]*$"
+)
+CLASS_PATTERN = re.compile(
+    r"^(economy|business|first( class)?|premium economy|phổ thông|thương gia|hạng nhất)(\s+class)?[\s.!]*$"
+)
+NAME_PATTERN = re.compile(r"^[^\W\d_]+(\s+[^\W\d_]+){1,4}$")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, NFC-normalize and collapse whitespace."""
+    text = unicodedata.normalize("NFC", text or "").lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def looks_vietnamese(text: str) -> bool:
+    """Whether the text has Vietnamese diacritics or common unaccented Vietnamese words."""
+    normalized = normalize_text(text)
+    return bool(VIETNAMESE_CHARS.search(normalized) or re.search(r"\b(toi|ban|chuyen bay|ve may bay)\b", normalized))
+
+
+def detect_language(text: str, default: str = "en") -> str:
+    """Detect English vs Vietnamese from diacritics and common words."""
+    normalized = normalize_text(text)
+    if looks_vietnamese(normalized):
+        return "vi"
+    if re.search(r"[a-z]", normalized):
+        return "en"
+    return default
+
+
+def pending_booking_field(booking_info: Dict[str, Any], intent: str) -> Optional[str]:
+    """Get the field the agent asks for next (first missing required field)."""
+    booking_info = booking_info or {}
+    required_fields = settings.booking.required_fields.get(intent, [])
+    missing_fields = [name for name in required_fields if name not in booking_info]
+    if not missing_fields and booking_info.get("round_trip") is True and "return_date" not in booking_info:
+        missing_fields.append("return_date")
+    return missing_fields[0] if missing_fields else None
+
+
+class RuleBasedIntentClassifier:
+    """Deterministic pre-classifier that answers easy turns without an LLM call.
+
+    Handles greetings/thanks, keyword intents (weather, status, cancel, booking
+    lookup) and short replies to the question asked while ``current_step`` is
+    ``collecting_info``. Each result carries a confidence; callers fall back to
+    the LLM below ``settings.agent.fast_intent_threshold``.
+    """
+
+    def __init__(self):
+        self.cities = {normalize_text(city): city for city in settings.mock_data.cities}
+        self._lock = threading.Lock()
+        self._stats = {
+            "greeting": 0,
+            "keyword": 0,
+            "pending_answer": 0,
+            "llm_fallback": 0
+        }
+
+    def classify(self, text: str, state: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Classify a user message.
+
+        Returns a dict with ``intent``, ``confidence``, ``reasoning``,
+        ``language`` and ``path``, or None when no rule applies.
+        """
+        state = state or {}
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+
+        previous = state.get("intent_classification")
+        language = detect_language(text, default=previous.language if previous else "en")
+
+        # A reply to the pending booking question keeps the booking intent
+        if state.get("current_step") == "collecting_info" and previous is not None:
+            result = self._classify_pending_answer(text, normalized, state, previous)
+            if result:
+                # Names, cities and emails are often plain ASCII: only Vietnamese text changes the language
+                result["language"] = "vi" if looks_vietnamese(text) else previous.language
+                return result
+
+        if GREETING_PATTERN.match(normalized):
+            return {
+                "intent": "greeting",
+                "confidence": 0.95,
+                "reasoning": f"Greeting or small talk: {text.strip()}",
+                "language": language,
+                "path": "greeting"
+            }
+
+        matches = [(intent, confidence) for intent, pattern, confidence in KEYWORD_RULES if pattern.search(normalized)]
+        if not matches:
+            return None
+
+        if len(matches) > 1 and any(intent == "cancel_booking" for intent, _ in matches):
+            # "cancel my booking BK..." also mentions the booking itself
+            matches = [match for match in matches if match[0] != "booking_info"]
+
+        intent, confidence = matches[0]
+        if len(matches) > 1:
+            # Conflicting keywords: let the LLM decide
+            confidence = 0.5
+        elif intent == "flight_status" and FLIGHT_NUMBER_PATTERN.search(normalized):
+            confidence = min(confidence + 0.05, 0.99)
+        if re.search(r"\b(book|search|find)\b|đặt vé|tìm chuyến", normalized):
+            # Mixed with a booking request, which needs field extraction
+            confidence = min(confidence, 0.6)
+
+        return {
+            "intent": intent,
+            "confidence": confidence,
+            "reasoning": text.strip(),
+            "language": language,
+            "path": "keyword"
+        }
+
+    def _pending_field(self, state: Dict[str, Any], intent: str) -> Optional[str]:
+        """Get the field the agent asked for last (first missing required field)."""
+        return pending_booking_field(state.get("booking_info", {}), intent)
+
+    def _classify_pending_answer(self, text: str, normalized: str, state: Dict[str, Any], previous) -> Optional[Dict[str, Any]]:
+        """Match a short reply against the pending field's expected shape."""
+        if previous.intent not in ["book_flight", "search_flights"]:
+            return None
+
+        field = self._pending_field(state, previous.intent)
+        if field is None or len(normalized.split()) > 8:
+            return None
+        # Switching topics ("cancel my booking") is not an answer
+        if any(pattern.search(normalized) for _, pattern, _ in KEYWORD_RULES):
+            return None
+
+        confidence = self._answer_confidence(field, normalized)
+        if confidence == 0.0:
+            return None
+
+        field_label = settings.booking.field_names.get(field, field)
+        return {
+            "intent": previous.intent,
+            "confidence": confidence,
+            "reasoning": f"{previous.reasoning} The user answered the {field_label} question: {text.strip()}",
+            "path": "pending_answer"
+        }
+
+    def _answer_confidence(self, field: str, normalized: str) -> float:
+        """Confidence that ``normalized`` is an answer for ``field``."""
+        if field == "email":
+            return 0.97 if EMAIL_PATTERN.match(normalized) else 0.0
+        if field in ["date", "return_date"]:
+            return 0.92 if DATE_PATTERN.search(normalized) else 0.0
+        if field == "passengers":
+            return 0.93 if COUNT_PATTERN.match(normalized) else 0.0
+        if field == "round_trip":
+            return 0.93 if YES_NO_PATTERN.match(normalized) else 0.0
+        if field == "class_type":
+            return 0.95 if CLASS_PATTERN.match(normalized) else 0.0
+        if field in ["departure_city", "arrival_city", "city"]:
+            if normalized.strip(" .!") in self.cities:
+                return 0.93
+            # Unknown place names are likely but not certain
+            return 0.75 if NAME_PATTERN.match(normalized) else 0.0
+        if field == "passenger_name":
+            return 0.88 if NAME_PATTERN.match(normalized) else 0.0
+        return 0.0
+
+    def record(self, path: str):
+        """Count a hit for a classification path."""
+        with self._lock:
+            self._stats[path] = self._stats.get(path, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-path hit counts and the local hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+        total = sum(stats.values())
+        stats["total"] = total
+        stats["fast_path_hit_rate"] = (total - stats["llm_fallback"]) / total if total else 0.0
+        return stats
+
+
+# Global instance
+intent_rules = RuleBasedIntentClassifier()
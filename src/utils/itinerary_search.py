@@ -0,0 +1,249 @@
+"""
+Multi-leg (connecting flight) itinerary search for Flight Booking Agent
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+from .flight_inventory import FlightInventory, flight_inventory
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+OBJECTIVES = ("price", "duration")
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class DayIndex:
+    """Adjacency of one day's flights: departures per airport sorted by time.
+
+    A leg is ``(departure_minute, arrival_minute, flight_number, departure,
+    arrival, price)`` with minutes counted from midnight of the day (arrival
+    may pass 1440). Per-airport
+    minimum price/duration out and in, plus the reverse route map, feed the
+    search heuristics.
+    """
+
+    def __init__(self, flight_date: str, rows: List[Tuple]):
+        self.flight_date = flight_date
+        by_airport = defaultdict(list)
+        self.arrivals_from: Dict[str, set] = defaultdict(set)
+        self.route_min: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self.min_out: Dict[str, Tuple[float, int]] = {}
+        self.min_in: Dict[str, Tuple[float, int]] = {}
+
+        for flight_number, _, departure, arrival, departure_time, arrival_time, price, _, _ in rows:
+            start = _minutes(departure_time)
+            # Schedules store local clock times; a flight landing "earlier" lands the next day
+            duration = (_minutes(arrival_time) - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+            origin, destination = departure.casefold(), arrival.casefold()
+            by_airport[origin].append((start, start + duration, flight_number, departure, arrival, price))
+            self.arrivals_from[destination].add(origin)
+            for table, key in ((self.route_min, (origin, destination)), (self.min_out, origin), (self.min_in, destination)):
+                best = table.get(key)
+                table[key] = (min(best[0], price), min(best[1], duration)) if best else (price, duration)
+
+        self.departures: Dict[str, Tuple[List[int], List[Tuple]]] = {}
+        for airport, legs in by_airport.items():
+            legs.sort()
+            self.departures[airport] = ([leg[0] for leg in legs], legs)
+
+    def __len__(self) -> int:
+        return sum(len(times) for times, _ in self.departures.values())
+
+
+class ItinerarySearch:
+    """Top-k itinerary search over the inventory as a time-expanded graph.
+
+    Nodes are (airport, time) events; edges are dated flights plus waits at an
+    airport of at least ``min_connection_minutes`` and at most
+    ``max_connection_minutes``. The search is best-first (A*) on price or
+    total travel time: the heuristic is the cheapest/shortest direct flight
+    to the destination when one exists, otherwise the cheapest/shortest
+    flight out of the airport plus into the destination. A label is pruned
+    when k cheaper labels with no more legs were already expanded on the same
+    inbound flight. Day indexes are built once per date and kept in
+    an LRU cache; they hold the schedule only, and seats are read from the
+    inventory for each itinerary before it is returned.
+    """
+
+    def __init__(self, inventory: Optional[FlightInventory] = None, min_connection_minutes: int = 45,
+                 max_connection_minutes: int = 12 * 60, max_cached_days: int = 8, max_expansions: int = 50000):
+        self.inventory = inventory or flight_inventory
+        self.min_connection_minutes = min_connection_minutes
+        self.max_connection_minutes = max_connection_minutes
+        self.max_cached_days = max_cached_days
+        self.max_expansions = max_expansions
+        self._days: "OrderedDict[str, DayIndex]" = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+        # Flights added for a date (searches, bookings, loads) make its cached index stale
+        self.inventory.add_flights_listener(self.invalidate)
+
+    def day_index(self, flight_date: str) -> DayIndex:
+        """Adjacency for a date, materializing the day's flights on first use."""
+        with self._lock:
+            index = self._days.get(flight_date)
+            if index is not None:
+                self._days.move_to_end(flight_date)
+                return index
+
+        self.inventory.materialize_date(flight_date)
+        with self._lock:
+            invalidations = self._invalidations
+        index = DayIndex(flight_date, self.inventory.flights_on(flight_date))
+        with self._lock:
+            # Not cached if flights were added while it was being built; the next search rebuilds it
+            if invalidations == self._invalidations:
+                self._days[flight_date] = index
+                while len(self._days) > self.max_cached_days:
+                    self._days.popitem(last=False)
+        logger.info(f"Built itinerary index for {flight_date}: {len(index)} flights")
+        return index
+
+    def invalidate(self, flight_date: Optional[str] = None):
+        """Drop cached day indexes (all of them without a date)."""
+        with self._lock:
+            self._invalidations += 1
+            if flight_date is None:
+                self._days.clear()
+            else:
+                self._days.pop(flight_date, None)
+
+    def search(self, departure: str, arrival: str, flight_date: str, max_legs: int = 3, k: int = 5,
+               objective: str = "price", passengers: int = 1) -> List[Dict[str, Any]]:
+        """Best ``k`` itineraries departing on ``flight_date`` with at most ``max_legs`` flights."""
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}")
+        origin, target = departure.strip().casefold(), arrival.strip().casefold()
+        if origin == target or max_legs < 1 or k < 1:
+            return []
+
+        start_day = date.fromisoformat(flight_date.strip())
+        # Days the last leg can depart on: flights last under a day, connections at most max_connection_minutes
+        last_departure = (max_legs - 1) * (MINUTES_PER_DAY + self.max_connection_minutes) + MINUTES_PER_DAY
+        span = last_departure // MINUTES_PER_DAY + 1
+        days = [self.day_index((start_day + timedelta(days=offset)).isoformat()) for offset in range(span)]
+
+        by_price = objective == "price"
+        metric = 0 if by_price else 1
+        direct_to_target = set()
+        for day in days:
+            direct_to_target |= day.arrivals_from.get(target, set())
+        target_in = min((day.min_in[target][metric] for day in days if target in day.min_in), default=None)
+        if target_in is None:
+            return []
+
+        bounds = {target: 0}
+
+        def heuristic(airport: str) -> float:
+            """Lower bound on the remaining price or flying time from an airport."""
+            if airport not in bounds:
+                out = min((day.min_out[airport][metric] for day in days if airport in day.min_out), default=0)
+                bound = out + target_in + (0 if by_price else self.min_connection_minutes)
+                if airport in direct_to_target:
+                    bound = min([bound] + [day.route_min[(airport, target)][metric] for day in days
+                                           if (airport, target) in day.route_min])
+                bounds[airport] = bound
+            return bounds[airport]
+
+        def hops_needed(airport: str) -> int:
+            return 0 if airport == target else 1 if airport in direct_to_target else 2
+
+        # Heap entries: (f, tie-break, sequence, legs); each leg is (day offset, leg tuple)
+        heap = []
+        sequence = 0
+        times, legs = days[0].departures.get(origin, ([], []))
+        for leg in legs:
+            if hops_needed(leg[4].casefold()) + 1 > max_legs:
+                continue
+            cost = leg[5] if by_price else leg[1] - leg[0]
+            heapq.heappush(heap, (cost + heuristic(leg[4].casefold()), leg[1] - leg[0] if by_price else leg[5],
+                                  sequence, ((0, leg),)))
+            sequence += 1
+
+        results = []
+        expanded: Dict[Tuple[str, int], List[Tuple[int, int]]] = defaultdict(list)
+        expansions = 0
+        while heap and len(results) < k and expansions < self.max_expansions:
+            _, _, _, path = heapq.heappop(heap)
+            offset, last = path[-1]
+            airport = last[4].casefold()
+            arrived = offset * MINUTES_PER_DAY + last[1]
+            first_departure = path[0][1][0]
+
+            if airport == target:
+                itinerary = self._itinerary(path, start_day, passengers)
+                if itinerary is not None:
+                    results.append(itinerary)
+                continue
+
+            # Beaten by k expanded labels on the same inbound flight with no more legs (an earlier
+            # arrival does not dominate: the connection window also has an upper bound)
+            labels = expanded[(airport, arrived)]
+            beaten = sum(1 for seen_first, seen_legs in labels
+                         if seen_legs <= len(path) and (by_price or seen_first >= first_departure))
+            if beaten >= k:
+                continue
+            labels.append((first_departure, len(path)))
+            expansions += 1
+
+            visited = {step[1][3].casefold() for step in path} | {airport}
+            cost_so_far = sum(step[1][5] for step in path) if by_price else arrived - first_departure
+            earliest = arrived + self.min_connection_minutes
+            latest = arrived + self.max_connection_minutes
+            for day_offset in range(earliest // MINUTES_PER_DAY, min(latest // MINUTES_PER_DAY, len(days) - 1) + 1):
+                times, legs = days[day_offset].departures.get(airport, ([], []))
+                base = day_offset * MINUTES_PER_DAY
+                for position in range(bisect_left(times, earliest - base), bisect_right(times, latest - base)):
+                    leg = legs[position]
+                    next_airport = leg[4].casefold()
+                    if next_airport in visited:
+                        continue
+                    if len(path) + 1 + hops_needed(next_airport) > max_legs:
+                        continue
+                    landed = base + leg[1]
+                    cost = cost_so_far + leg[5] if by_price else landed - first_departure
+                    heapq.heappush(heap, (cost + heuristic(next_airport),
+                                          landed - first_departure if by_price else sum(step[1][5] for step in path) + leg[5],
+                                          sequence, path + ((day_offset, leg),)))
+                    sequence += 1
+
+        return results
+
+    def _itinerary(self, path: Tuple, start_day: date, passengers: int) -> Optional[Dict[str, Any]]:
+        """Itinerary dict for a path, or None if a leg no longer has enough seats."""
+        legs = []
+        for offset, leg in path:
+            flight_date = (start_day + timedelta(days=offset)).isoformat()
+            current = self.inventory.get_flight(leg[2], flight_date)
+            if current is None or current["available_seats"] < passengers:
+                return None
+            legs.append(current)
+
+        first_offset, first = path[0]
+        last_offset, last = path[-1]
+        departed = first_offset * MINUTES_PER_DAY + first[0]
+        landed = last_offset * MINUTES_PER_DAY + last[1]
+        return {
+            "legs": legs,
+            "stops": len(legs) - 1,
+            "connections": [leg["arrival"] for leg in legs[:-1]],
+            "total_price": round(sum(leg["price"] for leg in legs), 2),
+            "duration_minutes": landed - departed,
+            "departure_date": legs[0]["flight_date"],
+            "arrival_date": (start_day + timedelta(days=landed // MINUTES_PER_DAY)).isoformat()
+        }
+
+
+# Global instance
+itinerary_search = ItinerarySearch()
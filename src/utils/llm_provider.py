@@ -0,0 +1,350 @@
+"""
+LLM provider for Flight Booking Agent: OpenAI, or offline fake/replay backends
+"""
+
+import ast
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+from pydantic import PrivateAttr
+
+from ..config import settings, LLMConfig
+from .booking_extractor import booking_extractor
+from .intent_rules import intent_rules, detect_language, looks_vietnamese, normalize_text
+
+BOOK_PATTERN = re.compile(r"\b(book|reserve)\b|đặt vé|đặt chỗ|đặt chuyến")
+SEARCH_PATTERN = re.compile(r"\b(search|find|look for|any flights?)\b|tìm chuyến|tìm vé|có chuyến")
+FLIGHT_NUMBER = re.compile(r"\b([A-Z]{2}\d{3,4})\b")
+BOOKING_REFERENCE = re.compile(r"\b(BK[A-Z0-9]{6,})\b", re.IGNORECASE)
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)+")
+CONVERSATION_TURN = re.compile(r"User: (.*?)(?= Assistant: | User: |$)", re.DOTALL)
+ASKED_QUESTION = re.compile(r"\?\s*User: (?:(?! Assistant: | User: ).)*$", re.DOTALL)
+PROMPT_FIELD = re.compile(r"^- ([\w ]+): (.*)$", re.MULTILINE)
+ENGLISH_WORDS = re.compile(r"\b(i|i'm|my|me|the|to|from|what|how|is|are|please|thanks|thank you|book|flight|want|can)\b")
+
+ANSWERS = {
+    "en": "I'm Tebby, your flight booking assistant. I can search and book flights, check flight status and weather, "
+          "and look up or cancel bookings. How can I help with your trip?",
+    "vi": "Em là Tebby, trợ lý đặt vé máy bay. Em có thể tìm và đặt chuyến bay, kiểm tra tình trạng chuyến bay, "
+          "thời tiết, tra cứu hoặc hủy đặt chỗ. Quý khách cần hỗ trợ gì ạ?"
+}
+RESULT_INTROS = {"en": "Here is what I found:", "vi": "Đây là thông tin em tìm được:"}
+
+
+def message_text(message: BaseMessage) -> str:
+    """Plain text of a message whose content may be a list of parts."""
+    if isinstance(message.content, list):
+        return " ".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in message.content)
+    return str(message.content)
+
+
+class LatencyModel:
+    """Seeded sampler of simulated LLM latencies.
+
+    ``constant`` always returns ``mean_ms``; ``uniform`` spreads ``jitter_ms``
+    either side of it; ``normal`` uses ``jitter_ms`` as standard deviation;
+    ``lognormal`` keeps the mean with a right tail (``jitter_ms`` / ``mean_ms``
+    as shape), like real completion latencies.
+    """
+
+    def __init__(self, mean_ms: float = 0.0, jitter_ms: float = 0.0, distribution: str = "constant", seed: int = 0):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """One latency in seconds."""
+        if self.mean_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.distribution == "uniform":
+                ms = self._random.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+            elif self.distribution == "normal":
+                ms = self._random.gauss(self.mean_ms, self.jitter_ms)
+            elif self.distribution == "lognormal":
+                sigma = self.jitter_ms / self.mean_ms
+                ms = self._random.lognormvariate(math.log(self.mean_ms) - sigma ** 2 / 2, sigma)
+            else:
+                ms = self.mean_ms
+        return max(ms, 0.0) / 1000
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic offline stand-in for the OpenAI chat model.
+
+    Recognizes the agent's prompts and answers each in the format it expects:
+    intent JSON (rule-based intents, carried over from earlier turns when the
+    user only answers a booking question), extraction JSON (local regex and
+    gazetteer extractor), summaries, and in ``process_booking`` tool calls
+    (search then book, weather, status, booking lookup, cancellation) followed
+    by an answer built from the tool results. Only tools passed to
+    ``bind_tools`` are called. With ``replies`` it replays recorded replies in
+    order instead. Latencies come from a seeded ``LatencyModel`` (first token)
+    plus ``token_ms`` per following word; ``_stream`` yields word chunks.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    distribution: str = "constant"
+    token_ms: float = 0.0
+    seed: int = 0
+    replies: Optional[List[Dict[str, Any]]] = None
+    tool_names: Optional[List[str]] = None
+
+    _latency: LatencyModel = PrivateAttr()
+    _state: Dict[str, Any] = PrivateAttr()
+
+    def model_post_init(self, __context: Any):
+        self._latency = LatencyModel(self.latency_ms, self.jitter_ms, self.distribution, self.seed)
+        # Shared with the copies made by bind_tools
+        self._state = {"calls": 0, "replayed": 0, "lock": threading.Lock()}
+
+    @classmethod
+    def from_config(cls, config: LLMConfig, replies: Optional[List[Dict[str, Any]]] = None) -> "FakeChatModel":
+        return cls(latency_ms=config.fake_latency_ms, jitter_ms=config.fake_latency_jitter_ms,
+                   distribution=config.fake_latency_distribution, token_ms=config.fake_token_ms,
+                   seed=config.fake_seed, replies=replies)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def calls(self) -> int:
+        """LLM calls made by this model and its tool-bound copies."""
+        return self._state["calls"]
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"tool_names": [getattr(tool, "name", str(tool)) for tool in tools]})
+
+    # Replies
+
+    def _next_id(self) -> int:
+        with self._state["lock"]:
+            self._state["calls"] += 1
+            return self._state["calls"]
+
+    def _replay(self, call: int) -> AIMessage:
+        with self._state["lock"]:
+            reply = self.replies[self._state["replayed"] % len(self.replies)]
+            self._state["replayed"] += 1
+        tool_calls = [{"name": tool_call["name"], "args": tool_call.get("args", {}),
+                       "id": tool_call.get("id") or f"call_{call}_{index}"}
+                      for index, tool_call in enumerate(reply.get("tool_calls", []))]
+        return AIMessage(content=reply.get("content", ""), tool_calls=tool_calls)
+
+    @staticmethod
+    def _conversation_language(turns: List[str]) -> str:
+        """Language of the conversation: bare answers (names, cities, emails) do not switch it to English."""
+        language = detect_language(turns[0]) if turns else "en"
+        for turn in turns[1:]:
+            if looks_vietnamese(turn):
+                language = "vi"
+            elif ENGLISH_WORDS.search(normalize_text(turn)):
+                language = "en"
+        return language
+
+    @staticmethod
+    def _user_turns(conversation: str) -> List[str]:
+        return [turn.strip() for turn in CONVERSATION_TURN.findall(conversation)] or [conversation.strip()]
+
+    @staticmethod
+    def _intent_of(text: str) -> Optional[str]:
+        normalized = normalize_text(text)
+        if BOOK_PATTERN.search(normalized):
+            return "book_flight"
+        if SEARCH_PATTERN.search(normalized):
+            return "search_flights"
+        result = intent_rules.classify(text)
+        return result["intent"] if result else None
+
+    def _classify(self, conversation: str) -> Dict[str, Any]:
+        """Intent of the last user turn; answers to booking questions keep the earlier booking intent."""
+        turns = self._user_turns(conversation)
+        last = turns[-1]
+        intent = self._intent_of(last)
+        if intent is None and (ASKED_QUESTION.search(conversation) or booking_extractor.extract(last).fields):
+            intent = next((self._intent_of(turn) for turn in reversed(turns[:-1])
+                           if self._intent_of(turn) in ("book_flight", "search_flights")), None)
+        return {
+            "intent": intent or "general_inquiry",
+            "confidence": 0.9,
+            "reasoning": last,
+            "language": self._conversation_language(turns)
+        }
+
+    def _extract(self, system: str, text: str) -> Dict[str, Any]:
+        missing = re.search(r"Missing information: (\[.*?\])", system)
+        missing_fields = ast.literal_eval(missing.group(1)) if missing else []
+        fields = booking_extractor.extract(text, missing_fields[0] if missing_fields else None).fields
+        return {"extracted_info": fields, "updated_info": fields}
+
+    def _tool_call(self, call: int, name: str, args: Dict[str, Any]) -> Optional[AIMessage]:
+        if self.tool_names is not None and name not in self.tool_names:
+            return None
+        return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{call}"}])
+
+    def _booking_reply(self, call: int, system: str, messages: List[BaseMessage]) -> AIMessage:
+        """Next tool call of the booking flow, or the answer once its tools ran."""
+        last_user = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1)
+        user_text = message_text(messages[last_user]) if last_user >= 0 else ""
+        results = {m.name: message_text(m) for m in messages[last_user + 1:] if isinstance(m, ToolMessage)}
+        fields = {key: value for key, value in PROMPT_FIELD.findall(system) if value not in ("Not specified", "N/A")}
+        reply = None
+
+        if "wants to book a flight" in system and "book_flight" not in results:
+            flight = FLIGHT_NUMBER.search(results.get("search_flights", "") + " " + user_text)
+            if flight and "Passenger" in fields and "Email" in fields:
+                reply = self._tool_call(call, "book_flight", {
+                    "flight_number": flight.group(1), "passenger_name": fields["Passenger"], "email": fields["Email"],
+                    "passengers": int(fields.get("Passengers", 1)), "class_type": fields.get("Class", "economy"),
+                    "date": fields.get("Date")})
+            elif "search_flights" not in results and {"Departure", "Destination", "Date"} <= fields.keys():
+                reply = self._tool_call(call, "search_flights", {
+                    "departure_city": fields["Departure"], "arrival_city": fields["Destination"], "date": fields["Date"]})
+        elif "flight search assistant" in system and "search_flights" not in results:
+            if {"Departure", "Destination", "Date"} <= fields.keys():
+                reply = self._tool_call(call, "search_flights", {
+                    "departure_city": fields["Departure"], "arrival_city": fields["Destination"], "date": fields["Date"],
+                    "passengers": int(fields.get("Passengers", 1)), "class_type": fields.get("Class", "economy")})
+        elif "weather information" in system and "get_weather" not in results:
+            extracted = booking_extractor.extract(user_text).fields
+            city = extracted.get("arrival_city") or extracted.get("departure_city")
+            if city:
+                reply = self._tool_call(call, "get_weather", {"city": city})
+        elif "flight status assistant" in system and "get_flight_status" not in results:
+            flight = FLIGHT_NUMBER.search(user_text.upper())
+            if flight:
+                reply = self._tool_call(call, "get_flight_status", {"flight_number": flight.group(1)})
+        elif "booking information assistant" in system and "get_booking_info" not in results:
+            reference = BOOKING_REFERENCE.search(user_text)
+            if reference:
+                reply = self._tool_call(call, "get_booking_info", {"booking_reference": reference.group(1).upper()})
+        elif "cancellation assistant" in system and "cancel_booking" not in results:
+            reference, email = BOOKING_REFERENCE.search(user_text), EMAIL.search(user_text)
+            if reference and email:
+                reply = self._tool_call(call, "cancel_booking", {
+                    "booking_reference": reference.group(1).upper(), "email": email.group(0)})
+
+        if reply is not None:
+            return reply
+        language = self._conversation_language([message_text(m) for m in messages if isinstance(m, HumanMessage)])
+        if results:
+            details = "\n\n".join(result[:600] for result in results.values())
+            return AIMessage(content=f"{RESULT_INTROS.get(language, RESULT_INTROS['en'])}\n\n{details}")
+        return AIMessage(content=ANSWERS.get(language, ANSWERS["en"]))
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        call = self._next_id()
+        if self.replies:
+            message = self._replay(call)
+        else:
+            system = message_text(messages[0]) if messages and isinstance(messages[0], SystemMessage) else ""
+            prompt = message_text(messages[-1]) if messages else ""
+            if "intent classifier and booking information extractor" in system:
+                result = self._classify(prompt.split("conversation: ", 1)[-1])
+                fields = (booking_extractor.extract(result["reasoning"]).fields
+                          if result["intent"] in ("book_flight", "search_flights") else {})
+                message = AIMessage(content=json.dumps({**result, "booking_info": fields}, ensure_ascii=False))
+            elif "intent classifier" in system:
+                message = AIMessage(content=json.dumps(self._classify(prompt.split("conversation: ", 1)[-1]),
+                                                       ensure_ascii=False))
+            elif "extracting flight booking information" in system:
+                message = AIMessage(content=json.dumps(
+                    self._extract(system, prompt.split("User intent expansion: ", 1)[-1]), ensure_ascii=False))
+            elif "summarizing conversations" in system or "memory of a flight booking conversation" in system:
+                turns = self._user_turns(prompt.replace("\n", " "))
+                message = AIMessage(content="The user said: " + " / ".join(turns)[:400])
+            else:
+                message = self._booking_reply(call, system, messages)
+
+        input_tokens = sum(len(message_text(m)) for m in messages) // 4
+        output_tokens = len(message.content) // 4 + 10 * len(message.tool_calls)
+        message.usage_metadata = {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                                  "total_tokens": input_tokens + output_tokens}
+        return message
+
+    # Generation
+
+    def _chunks(self, message: AIMessage) -> List[AIMessageChunk]:
+        """Word chunks of the reply (tool calls in one chunk); usage on the last one."""
+        words = re.findall(r"\S+\s*", message.content) or [""]
+        chunks = [AIMessageChunk(content=word) for word in words]
+        if message.tool_calls:
+            chunks[-1] = AIMessageChunk(content=chunks[-1].content, tool_call_chunks=[
+                {"name": tool_call["name"], "args": json.dumps(tool_call["args"], ensure_ascii=False),
+                 "id": tool_call["id"], "index": index} for index, tool_call in enumerate(message.tool_calls)])
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    def _delays(self, chunks: int) -> List[float]:
+        return [self._latency.sample()] + [self.token_ms / 1000] * (chunks - 1)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message = self._reply(messages)
+        time.sleep(sum(self._delays(len(self._chunks(message)))))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message = self._reply(messages)
+        await asyncio.sleep(sum(self._delays(len(self._chunks(message)))))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any):
+        chunks = self._chunks(self._reply(messages))
+        for delay, chunk in zip(self._delays(len(chunks)), chunks):
+            time.sleep(delay)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any):
+        chunks = self._chunks(self._reply(messages))
+        for delay, chunk in zip(self._delays(len(chunks)), chunks):
+            await asyncio.sleep(delay)
+            yield ChatGenerationChunk(message=chunk)
+
+
+def load_replies(path: str) -> List[Dict[str, Any]]:
+    """Recorded replies, one JSON object per line: ``{"content": ..., "tool_calls": [{"name", "args"}]}``."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def create_llms(config: Optional[LLMConfig] = None) -> Tuple[BaseChatModel, BaseChatModel]:
+    """Main (tool calling, streamed answers) and processing (classification, extraction, summaries) chat models."""
+    config = config or settings.llm
+    if config.provider == "fake":
+        return FakeChatModel.from_config(config), FakeChatModel.from_config(config)
+    if config.provider == "replay":
+        # One model, so both roles consume the recording in call order
+        model = FakeChatModel.from_config(config, load_replies(config.replay_file))
+        return model, model
+
+    llm = ChatOpenAI(
+        model=config.model,
+        temperature=config.temperature,
+        max_tokens=config.max_tokens,
+        # Token usage on streamed replies, for the tool loop's token budget
+        stream_usage=True
+    )
+    processed_llm = ChatOpenAI(
+        model=config.model,
+        temperature=0.1,
+        disable_streaming=True
+    )
+    return llm, processed_llm
@@ -33,6 +33,14 @@ class BookingInformation(BaseModel):
     class_type: Optional[str] = Field(description="Class type (economy, business, first)", default="economy")
 
 
+class IntentExtraction(IntentClassification):
+    """Model for fused intent classification and booking information extraction output."""
+    booking_info: BookingInformation = Field(
+        default_factory=BookingInformation,
+        description="Booking fields the user explicitly provided"
+    )
+
+
 class ConversationEntry(BaseModel):
     """Model for a single conversation entry."""
     timestamp: datetime = Field(default_factory=datetime.now, description="Timestamp of the conversation entry")
@@ -68,8 +76,11 @@ class ConversationHistory(BaseModel):
 class FlightBookingState(TypedDict):
     """State schema for the flight booking agent."""
     messages: Annotated[list[AnyMessage], add_messages]
+    # Running summary of the turns trimmed from messages
+    conversation_summary: str
     intent_classification: IntentClassification
     booking_info: dict
+    extracted_booking_info: dict
     conversation_history: ConversationHistory
     current_step: str
     data: str
@@ -0,0 +1,259 @@
+"""
+Seeded synthetic flight schedule generator for Flight Booking Agent
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Real coordinates for the mock cities so they become well-connected hubs
+CITY_COORDINATES = {
+    "New York": (40.64, -73.78),
+    "London": (51.47, -0.45),
+    "Paris": (49.01, 2.55),
+    "Tokyo": (35.55, 139.78),
+    "Sydney": (-33.95, 151.18),
+    "Seoul": (37.46, 126.44),
+    "Berlin": (52.36, 13.50),
+    "Rome": (41.80, 12.25),
+}
+
+NAME_SYLLABLES = [
+    "an", "bel", "cor", "dan", "el", "fal", "gar", "hal", "is", "jor", "kal", "lin", "mar", "nor", "os",
+    "pel", "quin", "ros", "sal", "tor", "ul", "var", "wen", "xan", "yor", "zel", "bri", "dra", "ven", "tal",
+]
+
+# Aircraft seat maps (economy, business, first) and maximum range in km
+AIRCRAFT = [
+    ("E190", (96, 12, 0), 3000),
+    ("A320", (150, 24, 0), 5000),
+    ("B737-800", (162, 12, 0), 5000),
+    ("A321neo", (182, 20, 0), 6500),
+    ("B787-9", (216, 28, 8), 14000),
+    ("A350-900", (253, 40, 8), 15000),
+    ("B777-300ER", (296, 42, 8), 16000),
+]
+
+DEPARTURE_WINDOW = (5 * 60, 23 * 60)  # minutes after midnight
+
+
+@dataclass
+class Airport:
+    """Generated airport (named after its city)."""
+    name: str
+    latitude: float
+    longitude: float
+    weight: float
+
+
+@dataclass
+class ScheduledFlight:
+    """A recurring flight operated on some weekdays."""
+    flight_number: str
+    departure: str
+    arrival: str
+    departure_minute: int
+    duration_minutes: int
+    price: float
+    airline: str
+    aircraft: str
+    seats: int
+    weekdays: Tuple[int, ...]
+
+    def as_schedule(self) -> Dict[str, Any]:
+        """Row for ``FlightInventory.add_schedules``."""
+        return {
+            "flight_number": self.flight_number,
+            "departure": self.departure,
+            "arrival": self.arrival,
+            "departure_time": format_minutes(self.departure_minute),
+            "arrival_time": format_minutes(self.departure_minute + self.duration_minutes),
+            "price": self.price,
+            "airline": self.airline,
+            "available_seats": self.seats,
+            "weekdays": self.weekdays
+        }
+
+
+def format_minutes(minutes: int) -> str:
+    """Format minutes after midnight as HH:MM (wrapping past midnight)."""
+    minutes %= 24 * 60
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def great_circle_km(a: Airport, b: Airport) -> float:
+    """Haversine distance between two airports."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.latitude, a.longitude, b.latitude, b.longitude))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+
+class ScheduleGenerator:
+    """Deterministic generator of airports, routes, schedules and dated flights.
+
+    The same seed and parameters, including ``start_date`` (today when not
+    given), always produce the same data; ``load`` records them in the
+    inventory's metadata. Airlines and
+    hub cities come from ``settings.mock_data``; route popularity follows a
+    Zipf-like hub weight; fares scale with distance, cabin seat maps with
+    aircraft size, and each dated flight gets its own demand-adjusted fare
+    and remaining seats.
+    """
+
+    def __init__(self, airports: int = 2000, routes_per_airport: int = 6, horizon_days: int = 60,
+                 start_date: Optional[date] = None, seed: int = 42,
+                 airlines: Optional[List[str]] = None, cities: Optional[List[str]] = None):
+        self.airport_count = max(airports, 2)
+        self.routes_per_airport = routes_per_airport
+        self.horizon_days = horizon_days
+        self.start_date = start_date or date.today()
+        self.seed = seed
+        self.airlines = airlines or settings.mock_data.airlines
+        self.cities = cities or settings.mock_data.cities
+        self._airports: Optional[List[Airport]] = None
+        self._schedules: Optional[List[ScheduledFlight]] = None
+
+    def parameters(self) -> Dict[str, Any]:
+        """Parameters that, with this code, reproduce the generated data."""
+        return {
+            "seed": self.seed,
+            "start_date": self.start_date.isoformat(),
+            "horizon_days": self.horizon_days,
+            "airports": self.airport_count,
+            "routes_per_airport": self.routes_per_airport,
+        }
+
+    def airports(self) -> List[Airport]:
+        """Mock cities first (as the largest hubs), then synthetic airports."""
+        if self._airports is not None:
+            return self._airports
+
+        rng = random.Random(self.seed)
+        airports = []
+        names = set()
+        for rank, city in enumerate(self.cities[:self.airport_count]):
+            latitude, longitude = CITY_COORDINATES.get(city, (rng.uniform(-50, 65), rng.uniform(-180, 180)))
+            airports.append(Airport(city, latitude, longitude, 1.0 / (rank + 1) ** 0.8))
+            names.add(city.lower())
+
+        while len(airports) < self.airport_count:
+            name = "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+            if name.lower() in names:
+                name = f"{name} {rng.choice(['North', 'South', 'East', 'West', 'Central'])}"
+                if name.lower() in names:
+                    continue
+            names.add(name.lower())
+            rank = len(airports)
+            airports.append(Airport(name, rng.uniform(-50, 65), rng.uniform(-180, 180), 1.0 / (rank + 1) ** 0.8))
+
+        self._airports = airports
+        return airports
+
+    def routes(self) -> List[Tuple[Airport, Airport]]:
+        """Directed routes: a full mesh between mock cities plus hub-weighted links, both directions."""
+        rng = random.Random(self.seed + 1)
+        airports = self.airports()
+        weights = [airport.weight for airport in airports]
+        pairs = set()
+
+        hubs = [i for i, airport in enumerate(airports) if airport.name in self.cities]
+        for i in hubs:
+            for j in hubs:
+                if i != j:
+                    pairs.add((i, j))
+
+        for i in range(len(airports)):
+            destinations = rng.choices(range(len(airports)), weights=weights, k=self.routes_per_airport * 2)
+            added = 0
+            for j in destinations:
+                if j == i or (i, j) in pairs:
+                    continue
+                pairs.add((i, j))
+                pairs.add((j, i))
+                added += 1
+                if added >= self.routes_per_airport:
+                    break
+
+        return [(airports[i], airports[j]) for i, j in sorted(pairs)]
+
+    def schedules(self) -> List[ScheduledFlight]:
+        """Recurring flights for every route."""
+        if self._schedules is not None:
+            return self._schedules
+
+        rng = random.Random(self.seed + 2)
+        # Two-letter codes; FL is kept for the hand-written mock flights
+        codes = []
+        for airline in self.airlines:
+            code = airline[:2].upper()
+            suffix = 0
+            while code in codes or code == "FL":
+                code = f"{airline[0].upper()}{suffix}"
+                suffix += 1
+            codes.append(code)
+        counters = [1] * len(self.airlines)
+
+        schedules = []
+        for origin, destination in self.routes():
+            distance = great_circle_km(origin, destination)
+            duration = int(35 + distance / 780 * 60)
+            # Busier routes between bigger hubs get more daily frequencies
+            frequencies = 1 + min(3, int((origin.weight + destination.weight) * 6 * rng.random()))
+            aircraft = [plane for plane in AIRCRAFT if plane[2] >= distance] or AIRCRAFT[-1:]
+            for _ in range(frequencies):
+                airline_index = rng.randrange(len(self.airlines))
+                model, seat_map, _ = rng.choice(aircraft[:3])
+                weekdays = tuple(range(7)) if rng.random() < 0.8 else tuple(sorted(rng.sample(range(7), rng.randint(3, 6))))
+                schedules.append(ScheduledFlight(
+                    flight_number=f"{codes[airline_index]}{counters[airline_index]:04d}",
+                    departure=origin.name,
+                    arrival=destination.name,
+                    departure_minute=rng.randrange(DEPARTURE_WINDOW[0], DEPARTURE_WINDOW[1], 5),
+                    duration_minutes=duration,
+                    price=round((49 + 0.11 * distance) * rng.uniform(0.85, 1.25), 2),
+                    airline=self.airlines[airline_index],
+                    aircraft=model,
+                    seats=sum(seat_map),
+                    weekdays=weekdays
+                ))
+                counters[airline_index] += 1
+
+        self._schedules = schedules
+        return schedules
+
+    def flights(self) -> Iterator[Tuple]:
+        """Dated flight rows (``FLIGHT_COLUMNS`` order) over the horizon."""
+        rng = random.Random(self.seed + 3)
+        days = [self.start_date + timedelta(days=offset) for offset in range(self.horizon_days)]
+        day_info = [(day.isoformat(), day.weekday(), 1.15 if day.weekday() in (4, 6) else 1.0) for day in days]
+
+        for schedule in self.schedules():
+            departure_time = format_minutes(schedule.departure_minute)
+            arrival_time = format_minutes(schedule.departure_minute + schedule.duration_minutes)
+            operating = set(schedule.weekdays)
+            for offset, (day, weekday, weekend_factor) in enumerate(day_info):
+                if weekday not in operating:
+                    continue
+                # Fares rise close to departure; earlier dates have sold more seats
+                closeness = 1.0 + 0.5 * max(0, 14 - offset) / 14
+                load_factor = rng.uniform(0.2, 0.6) + 0.35 * max(0, 30 - offset) / 30
+                yield (
+                    schedule.flight_number, day, schedule.departure, schedule.arrival, departure_time, arrival_time,
+                    round(schedule.price * weekend_factor * closeness * rng.uniform(0.9, 1.1), 2),
+                    schedule.airline, max(0, int(schedule.seats * (1 - load_factor)))
+                )
+
+    def load(self, inventory) -> Dict[str, int]:
+        """Bulk load schedules and dated flights into a ``FlightInventory``."""
+        schedules = [schedule.as_schedule() for schedule in self.schedules()]
+        counts = inventory.bulk_load(schedules, self.flights())
+        inventory.set_metadata({f"generator.{key}": value for key, value in self.parameters().items()})
+        logger.info(f"Loaded {counts['schedules']} schedules and {counts['flights']} flights")
+        return counts
@@ -0,0 +1,88 @@
+"""
+Coalescing stream writer for Flight Booking Agent
+"""
+
+import time
+from typing import Callable, Dict, Any, Optional
+
+from ..config import settings, StreamingConfig
+
+
+class StreamEmitter:
+    """Buffers streamed text and writes it as fewer ``{"type": event_type, "content": ...}`` events.
+
+    Text is emitted once ``chunk_bytes`` (UTF-8) are buffered or
+    ``flush_interval`` has passed since the last event, cut at the last
+    word boundary so words are never split (unless one word alone exceeds
+    ``max_chunk_bytes``). ``chunk_bytes`` adapts to the consumer: an event
+    whose write takes longer than ``slow_emit_seconds`` doubles it (up to
+    ``max_chunk_bytes``), faster writes shrink it back toward
+    ``min_chunk_bytes``. The window is only checked on ``write``, so call
+    ``flush()`` when the text is complete.
+    """
+
+    def __init__(self, writer: Callable[[Dict[str, Any]], None], event_type: str,
+                 config: Optional[StreamingConfig] = None, clock: Callable[[], float] = time.monotonic):
+        self.writer = writer
+        self.event_type = event_type
+        self.config = config or settings.streaming
+        self.clock = clock
+        self.chunk_bytes = self.config.min_chunk_bytes
+        self.stats = {"writes": 0, "events": 0, "bytes": 0}
+        self._buffer = ""
+        self._last_emit = clock()
+
+    def _emit(self, text: str):
+        start = self.clock()
+        self.writer({"type": self.event_type, "content": text})
+        cost = self.clock() - start
+        self._last_emit = start + cost
+        self.stats["events"] += 1
+        self.stats["bytes"] += len(text.encode("utf-8"))
+
+        if cost > self.config.slow_emit_seconds:
+            self.chunk_bytes = min(self.chunk_bytes * 2, self.config.max_chunk_bytes)
+        else:
+            self.chunk_bytes = max(self.chunk_bytes - self.chunk_bytes // 4, self.config.min_chunk_bytes)
+
+    @staticmethod
+    def _word_end(text: str) -> int:
+        """Index just after the last whitespace of text (0 if none)."""
+        return max(text.rfind(" "), text.rfind("\n")) + 1
+
+    def _cut(self) -> int:
+        """Length of the next chunk of at most ``chunk_bytes`` ending on a word boundary (0 to wait)."""
+        head = self._buffer.encode("utf-8")[:self.chunk_bytes].decode("utf-8", errors="ignore")
+        cut = self._word_end(head)
+        if cut == 0 and len(self._buffer.encode("utf-8")) >= self.config.max_chunk_bytes:
+            # A single word longer than the largest chunk
+            cut = len(head)
+        return cut
+
+    def write(self, text: str):
+        """Add text to the buffer and emit the chunks that are due."""
+        self.stats["writes"] += 1
+        if not self.config.coalesce:
+            if text:
+                self._emit(text)
+            return
+        self._buffer += text
+
+        while len(self._buffer.encode("utf-8")) >= self.chunk_bytes:
+            cut = self._cut()
+            if cut == 0:
+                break
+            self._emit(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+
+        if self._buffer and self.clock() - self._last_emit >= self.config.flush_interval:
+            cut = self._word_end(self._buffer)
+            if cut:
+                self._emit(self._buffer[:cut])
+                self._buffer = self._buffer[cut:]
+
+    def flush(self):
+        """Emit whatever is buffered."""
+        if self._buffer:
+            self._emit(self._buffer)
+            self._buffer = ""
@@ -0,0 +1,205 @@
+"""
+Background, incremental conversation summaries for Flight Booking Agent
+"""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable
+import logging
+
+from langchain_core.messages import HumanMessage
+
+from ..config import settings, MemoryConfig
+from .conversation_memory import ConversationMemory
+from .conversation_service import conversation_service
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationSummaryWorker:
+    """Summarizes conversations off the critical path, one pending job per thread_id.
+
+    Each turn submits the conversation's messages; only messages not seen
+    before are kept, so a job holds the new turns since the last summary.
+    A job is due after ``summary_every_turns`` new turns, or when the
+    thread has been idle for ``summary_idle_seconds``; later submissions for
+    the same thread merge into its pending job. The worker then asks the LLM
+    to update the previous summary with the new turns (one call per job) and
+    saves it with ``save_conversation_summary``. Without ``background`` due
+    jobs run inline in ``submit`` and idle jobs wait for ``flush``.
+    """
+
+    def __init__(self, config: Optional[MemoryConfig] = None, background: bool = True,
+                 max_cached_summaries: int = 1000):
+        self.config = config or settings.memory
+        self.background = background
+        self.max_cached_summaries = max_cached_summaries
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._seen: "OrderedDict[str, set]" = OrderedDict()  # thread_id -> ids of the messages already queued
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()  # thread_id -> latest summary text
+        self._running = 0
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+        self.stats = {"submitted": 0, "coalesced": 0, "runs": 0, "failures": 0}
+
+    def _ensure_worker(self):
+        """Start the background summarizer on first use."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="conversation-summary-worker", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _new_messages(self, thread_id: str, messages: List[Any]) -> List[Any]:
+        """Messages not queued before (ids are compared, so turns trimmed from state are not an issue)."""
+        seen = self._seen.get(thread_id, set())
+        self._seen[thread_id] = {message.id for message in messages if message.id is not None}
+        self._seen.move_to_end(thread_id)
+        while len(self._seen) > self.max_cached_summaries:
+            self._seen.popitem(last=False)
+        return [message for message in messages if message.id is None or message.id not in seen]
+
+    def submit(self, thread_id: str, user_id: str, messages: List[Any], booking_info: Dict[str, Any],
+               summarize: Callable[[str, str], str]):
+        """Queue the new turns of a conversation; ``summarize(previous, conversation_text)`` returns the summary."""
+        with self._cond:
+            new_messages = self._new_messages(thread_id, messages)
+            if not new_messages:
+                return
+            job = self._pending.get(thread_id)
+            if job is None:
+                job = self._pending[thread_id] = {"thread_id": thread_id, "lines": [], "turns": 0}
+            else:
+                self.stats["coalesced"] += 1
+            self.stats["submitted"] += 1
+
+            text = ConversationMemory.conversation_text(new_messages)
+            if text:
+                job["lines"].append(text)
+            job["turns"] += sum(1 for message in new_messages if isinstance(message, HumanMessage))
+            job.update(user_id=user_id, booking_info=booking_info, summarize=summarize)
+            now = time.monotonic()
+            job["due"] = now if job["turns"] >= self.config.summary_every_turns else now + self.config.summary_idle_seconds
+
+            if self.background and not self._stopping:
+                self._ensure_worker()
+                self._cond.notify()
+                return
+            if job["due"] > now:
+                return
+            del self._pending[thread_id]
+            self._running += 1
+        self._summarize(job)
+
+    def _next_job(self) -> Optional[Dict[str, Any]]:
+        """Wait for the earliest due job (None when stopping with nothing left)."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                due = [job for job in self._pending.values() if job["due"] <= now or self._stopping]
+                if due:
+                    job = min(due, key=lambda job: job["due"])
+                    del self._pending[job["thread_id"]]
+                    self._running += 1
+                    return job
+                if self._stopping:
+                    return None
+                wait = min((job["due"] for job in self._pending.values()), default=now + 1.0) - now
+                self._cond.wait(max(wait, 0.001))
+
+    def _run(self):
+        """Background loop running due jobs."""
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._summarize(job)
+
+    def _previous_summary(self, thread_id: str) -> str:
+        """Latest summary of a thread (cached, else loaded from the database)."""
+        with self._cond:
+            summary = self._summaries.get(thread_id)
+        if summary is None:
+            saved = conversation_service.get_conversation_summary_detailed(thread_id)
+            summary = saved.get("summary_text") or "" if saved else ""
+        return summary
+
+    def _summarize(self, job: Dict[str, Any]):
+        """Update the thread's summary with the job's new turns and save it."""
+        thread_id = job["thread_id"]
+        try:
+            summary = job["summarize"](self._previous_summary(thread_id), "\n".join(job["lines"]))
+            success = conversation_service.save_conversation_summary(
+                thread_id=thread_id,
+                user_id=job["user_id"],
+                summary_text=summary,
+                key_points=None,
+                intent_summary=None,
+                booking_info=job["booking_info"]
+            )
+            with self._cond:
+                self.stats["runs"] += 1
+                self._summaries[thread_id] = summary
+                self._summaries.move_to_end(thread_id)
+                while len(self._summaries) > self.max_cached_summaries:
+                    self._summaries.popitem(last=False)
+            if not success:
+                logger.warning(f"Failed to save conversation summary for thread {thread_id}")
+        except Exception as e:
+            logger.error(f"Failed to generate conversation summary for thread {thread_id}: {e}")
+            with self._cond:
+                self.stats["failures"] += 1
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Run every pending job now (idle ones included) and wait for them; False if the timeout expired."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._worker is None or not self._worker.is_alive():
+            with self._cond:
+                jobs = list(self._pending.values())
+                self._pending.clear()
+                self._running += len(jobs)
+            for job in jobs:
+                self._summarize(job)
+            return True
+
+        with self._cond:
+            for job in self._pending.values():
+                job["due"] = 0.0
+            self._cond.notify_all()
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Stop the worker after summarizing every pending conversation."""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout)
+        else:
+            self.flush()
+        logger.info("Conversation summary worker closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get submission, coalescing and LLM run counters."""
+        with self._cond:
+            return {**self.stats, "pending": len(self._pending), "running": self._running}
+
+
+# Global instance
+summary_worker = ConversationSummaryWorker(background=settings.memory.background_summaries)
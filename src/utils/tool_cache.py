@@ -0,0 +1,121 @@
+"""
+TTL + LRU cache for tool results in Flight Booking Agent
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Tuple, Iterable
+import logging
+
+from ..config import settings, ToolCacheConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ToolResultCache:
+    """Bounded result cache shared by the read-only tools.
+
+    Entries are keyed on the tool name plus its normalized arguments and
+    expire after the tool's TTL; the least recently used entry is evicted
+    when ``max_entries`` is reached. Entries can carry tags (e.g. a
+    route/date) so that a seat change drops exactly the searches it affects.
+    """
+
+    def __init__(self, config: Optional[ToolCacheConfig] = None, clock: Callable[[], float] = time.monotonic):
+        self.config = config or settings.tool_cache
+        self.ttls = self.config.get_ttls()
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Look up a key; returns ``(found, value)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return True, entry[1]
+                del self._entries[key]
+                self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return False, None
+
+    def set(self, key: Tuple, value: Any, ttl: float, tags: Iterable[str] = ()):
+        """Store a value for ``ttl`` seconds, evicting least recently used entries."""
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value, tuple(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, tool_name: Optional[str] = None, tag: Optional[str] = None) -> int:
+        """Drop entries of a tool and/or with a tag (everything without arguments); returns the number dropped."""
+        with self._lock:
+            keys = [key for key, (_, _, tags) in self._entries.items()
+                    if (tool_name is None or key[0] == tool_name) and (tag is None or tag in tags)]
+            for key in keys:
+                del self._entries[key]
+            self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def cached(self, tool_name: str, key: Callable[..., Tuple],
+               tags: Optional[Callable[..., Iterable[str]]] = None) -> Callable:
+        """Decorator for a tool function (apply below ``@tool``).
+
+        ``key`` and ``tags`` receive the call's arguments by name, defaults
+        included; ``key`` returns the normalized argument tuple.
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                ttl = self.ttls.get(tool_name, 0)
+                if not self.config.enabled or ttl <= 0:
+                    return func(*args, **kwargs)
+
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                cache_key = (tool_name,) + tuple(key(**bound.arguments))
+                found, value = self.get(cache_key)
+                if found:
+                    return value
+
+                value = func(*args, **kwargs)
+                self.set(cache_key, value, ttl, tags(**bound.arguments) if tags else ())
+                return value
+
+            return wrapper
+        return decorator
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "size": len(self._entries),
+                "max_entries": self.config.max_entries,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+            }
+
+
+def route_tag(departure: str, arrival: str, flight_date: str) -> str:
+    """Tag for cached results that depend on a route's seats on a date."""
+    return f"route:{departure.strip().casefold()}|{arrival.strip().casefold()}|{flight_date.strip()}"
+
+
+# Global instance
+tool_cache = ToolResultCache()
@@ -0,0 +1,165 @@
+"""
+Concurrent tool call execution for Flight Booking Agent
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+from ..config import settings, ToolExecutionConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ToolTimeoutError(Exception):
+    """Raised (as a call result) when a tool call exceeds its timeout."""
+    pass
+
+
+@dataclass
+class ToolCallResult:
+    """Outcome of one tool call."""
+    name: str
+    result: Any = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+
+class ToolExecutor:
+    """Run the tool calls of one model reply concurrently, keeping their order.
+
+    Calls are grouped into waves: consecutive read-only calls share a wave
+    and run together on a bounded thread pool (or ``asyncio.gather`` on the
+    async path); a state-changing tool (``sequential_tools``) is a wave of
+    its own, so it sees the effects of earlier calls and later calls see its
+    effects. Each concurrent call has its own timeout, and an exception or
+    timeout only fails that call. A timed-out sync call is abandoned, not
+    interrupted: its worker thread finishes in the background. State-changing
+    calls run without a timeout so they are never abandoned half-way.
+    """
+
+    def __init__(self, config: Optional[ToolExecutionConfig] = None):
+        self.config = config or settings.tool_execution
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.turn_latencies = deque(maxlen=1000)
+        self.stats = {"turns": 0, "calls": 0, "errors": 0, "timeouts": 0}
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.config.max_workers, thread_name_prefix="tool-call")
+            return self._pool
+
+    def _concurrent(self, tool) -> bool:
+        return self.config.parallel and tool.name not in self.config.sequential_tools
+
+    def _waves(self, calls: List[Tuple[Any, Dict[str, Any]]]) -> List[List[int]]:
+        """Group call indexes into waves that may run together."""
+        waves = []
+        previous = False
+        for i, (tool, _) in enumerate(calls):
+            concurrent = self._concurrent(tool)
+            if concurrent and previous:
+                waves[-1].append(i)
+            else:
+                waves.append([i])
+            previous = concurrent
+        return waves
+
+    def run(self, calls: List[Tuple[Any, Dict[str, Any]]]) -> List[ToolCallResult]:
+        """Run ``(tool, args)`` calls; results are in call order."""
+        if not calls:
+            return []
+        start = time.perf_counter()
+        results: List[Optional[ToolCallResult]] = [None] * len(calls)
+        for wave in self._waves(calls):
+            tool, args = calls[wave[0]]
+            if not self._concurrent(tool):
+                # State-changing calls run inline and are never abandoned half-way
+                results[wave[0]] = self._invoke(tool, args)
+                continue
+
+            # Each call gets its own copy of the context (callbacks, tracing, stream writer)
+            futures = {i: self.pool.submit(contextvars.copy_context().run, self._invoke, *calls[i]) for i in wave}
+            submitted = time.perf_counter()
+            for i in wave:
+                tool = calls[i][0]
+                timeout = self.config.get_timeout(tool.name)
+                try:
+                    results[i] = futures[i].result(timeout=max(0.0, submitted + timeout - time.perf_counter()))
+                except FutureTimeoutError:
+                    futures[i].cancel()
+                    results[i] = self._timed_out(tool.name, timeout, time.perf_counter() - submitted)
+        self._record(results, time.perf_counter() - start)
+        return results
+
+    async def arun(self, calls: List[Tuple[Any, Dict[str, Any]]]) -> List[ToolCallResult]:
+        """Async version of run (timed-out calls are cancelled)."""
+        if not calls:
+            return []
+        start = time.perf_counter()
+        results: List[ToolCallResult] = []
+        for wave in self._waves(calls):
+            results.extend(await asyncio.gather(*[self._ainvoke(*calls[i]) for i in wave]))
+        self._record(results, time.perf_counter() - start)
+        return results
+
+    def _invoke(self, tool, args: Dict[str, Any]) -> ToolCallResult:
+        start = time.perf_counter()
+        try:
+            return ToolCallResult(tool.name, result=tool.invoke(args), elapsed=time.perf_counter() - start)
+        except Exception as e:
+            return ToolCallResult(tool.name, error=e, elapsed=time.perf_counter() - start)
+
+    async def _ainvoke(self, tool, args: Dict[str, Any]) -> ToolCallResult:
+        start = time.perf_counter()
+        timeout = self.config.get_timeout(tool.name) if self._concurrent(tool) else None
+        try:
+            result = await asyncio.wait_for(tool.ainvoke(args), timeout=timeout)
+            return ToolCallResult(tool.name, result=result, elapsed=time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            return self._timed_out(tool.name, timeout, time.perf_counter() - start)
+        except Exception as e:
+            return ToolCallResult(tool.name, error=e, elapsed=time.perf_counter() - start)
+
+    def _timed_out(self, tool_name: str, timeout: float, elapsed: float) -> ToolCallResult:
+        logger.warning(f"Tool {tool_name} timed out after {timeout}s")
+        return ToolCallResult(tool_name, error=ToolTimeoutError(f"timed out after {timeout:g}s"), elapsed=elapsed)
+
+    def _record(self, results: List[ToolCallResult], elapsed: float):
+        with self._lock:
+            self.stats["turns"] += 1
+            self.stats["calls"] += len(results)
+            self.stats["errors"] += sum(1 for r in results if r.error is not None)
+            self.stats["timeouts"] += sum(1 for r in results if isinstance(r.error, ToolTimeoutError))
+            self.turn_latencies.append(elapsed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get call counters and tool-phase latency percentiles of recent turns."""
+        with self._lock:
+            latencies = sorted(self.turn_latencies)
+        percentile = lambda fraction: latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] if latencies else 0.0
+        return {
+            **self.stats,
+            "p50_turn_latency": percentile(0.5),
+            "p99_turn_latency": percentile(0.99)
+        }
+
+    def shutdown(self):
+        """Stop the worker threads (pending calls are cancelled)."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+# Global instance
+tool_executor = ToolExecutor()
@@ -0,0 +1,232 @@
+"""
+Write-behind buffer for conversation entries
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationWriteBuffer:
+    """Bounded queue of conversation entries flushed to SQLite in batches.
+
+    A background thread commits queued entries with ``add_conversation_entries``
+    once ``batch_size`` entries are waiting or ``flush_interval`` seconds have
+    passed. When the queue is full, producers wait up to ``enqueue_timeout`` and
+    then write synchronously, so entries are never dropped.
+    """
+
+    def __init__(self, db, max_queue_size: int = 1000, batch_size: int = 50,
+                 flush_interval: float = 0.2, enqueue_timeout: float = 1.0):
+        """Initialize the buffer.
+
+        Args:
+            db: DatabaseManager used for writes.
+            max_queue_size: Maximum number of entries waiting to be written.
+            batch_size: Maximum number of entries per transaction.
+            flush_interval: Maximum seconds an entry waits before being flushed.
+            enqueue_timeout: Seconds a producer blocks on a full queue before
+                falling back to a synchronous write.
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue_size)
+        # Guards the stopping check, worker start and producer count; puts happen outside it
+        self._lock = threading.Lock()
+        # Signalled when no producer is between the stopping check and its put, so close() can send the sentinel
+        self._idle = threading.Condition(self._lock)
+        self._producers = 0
+        self._stats_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "sync_fallbacks": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0
+        }
+        atexit.register(self.close)
+
+    def _ensure_worker(self):
+        """Start the background flusher on first use. Called with ``_lock`` held, never after close()."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="conversation-write-buffer", daemon=True)
+        self._worker.start()
+
+    def add(self, entry: Dict[str, Any]) -> bool:
+        """Queue an entry for writing.
+
+        Returns True when the entry was queued or written synchronously under
+        backpressure, False only if the synchronous fallback failed.
+        """
+        # Stamp now so batching delay doesn't shift the stored time
+        entry.setdefault("timestamp", datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+
+        with self._lock:
+            accepting = not self._stopping.is_set()
+            if accepting:
+                self._ensure_worker()
+                self._producers += 1
+
+        queued = False
+        if accepting:
+            try:
+                # Outside _lock: under backpressure each producer waits at most one enqueue_timeout
+                self._queue.put(entry, timeout=self.enqueue_timeout)
+                queued = True
+            except queue.Full:
+                logger.warning("Conversation write queue full, writing entry synchronously")
+            finally:
+                with self._lock:
+                    self._producers -= 1
+                    if not self._producers:
+                        self._idle.notify_all()
+        if not queued:
+            return self._write_sync(entry)
+
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def _write_sync(self, entry: Dict[str, Any]) -> bool:
+        """Write a single entry directly, bypassing the queue."""
+        with self._stats_lock:
+            self._stats["sync_fallbacks"] += 1
+        success = self.db.add_conversation_entries([entry])
+        with self._stats_lock:
+            self._stats["written" if success else "failed"] += 1
+        return success
+
+    def _run(self):
+        """Background loop collecting and flushing batches."""
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+
+            batch: List[Dict[str, Any]] = []
+            stop = first is None
+            if not stop:
+                batch.append(first)
+
+            # Gather until the batch is full or the flush window closes
+            deadline = time.monotonic() + self.flush_interval
+            while not stop and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._flush_batch(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+
+            if stop:
+                # Drain whatever is left, then exit
+                self._drain()
+                return
+
+    def _drain(self):
+        """Flush every entry still in the queue."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._queue.task_done()
+                if item is not None:
+                    batch.append(item)
+            if not batch:
+                return
+            self._flush_batch(batch)
+
+    def _flush_batch(self, batch: List[Dict[str, Any]]):
+        """Commit a batch, retrying entries one by one if the batch fails."""
+        start = time.perf_counter()
+        if self.db.add_conversation_entries(batch):
+            written, failed = len(batch), 0
+        else:
+            results = [self.db.add_conversation_entries([entry]) for entry in batch]
+            written = sum(results)
+            failed = len(batch) - written
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._stats_lock:
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["last_flush_ms"] = elapsed_ms
+            self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], elapsed_ms)
+            self._stats["total_flush_ms"] += elapsed_ms
+
+        if failed:
+            logger.error(f"Failed to write {failed} of {len(batch)} buffered conversation entries")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued entry has been written.
+
+        Returns False if the timeout expired first.
+        """
+        if self._worker is None or not self._worker.is_alive():
+            self._drain()
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Stop the flusher after writing everything still queued."""
+        with self._lock:
+            # Entries queued before this point are ahead of the sentinel; later add() calls write synchronously
+            if self._stopping.is_set():
+                return
+            self._stopping.set()
+            worker = self._worker
+            # Producers already accepted finish their put (at most enqueue_timeout) ahead of the sentinel
+            self._idle.wait_for(lambda: self._producers == 0)
+        if worker is not None and worker.is_alive():
+            # Sentinel may block briefly if the queue is full; the worker keeps draining
+            self._queue.put(None)
+            worker.join(timeout)
+        else:
+            self._drain()
+        logger.info("Conversation write buffer closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, throughput and flush latency counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_flush_ms"] = stats["total_flush_ms"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
@@ -0,0 +1,40 @@
+"""
+Lazily materialized days must not hide routes that are searched for the first time later
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.utils.flight_inventory import FlightInventory
+from src.utils.itinerary_search import ItinerarySearch
+
+FLIGHT_DATE = "2026-11-04"
+SCHEDULES = [
+    {"flight_number": "TS0001", "departure": "New York", "arrival": "Seoul", "departure_time": "08:00",
+     "arrival_time": "22:00", "price": 900, "airline": "Test Air", "available_seats": 30},
+    {"flight_number": "TS0002", "departure": "Seoul", "arrival": "Sydney", "departure_time": "23:30",
+     "arrival_time": "10:00", "price": 500, "airline": "Test Air", "available_seats": 30},
+]
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    inventory = FlightInventory(str(tmp_path / "inventory.db"))
+    inventory.add_schedules(SCHEDULES)
+    yield inventory
+    inventory.close()
+
+
+def test_direct_search_after_connecting_search_generates_new_route(inventory):
+    assert ItinerarySearch(inventory).search("New York", "Sydney", FLIGHT_DATE)
+    assert inventory.search_flights("Seoul", "Berlin", FLIGHT_DATE)
+
+
+def test_bulk_loaded_day_stays_complete(inventory):
+    inventory.bulk_load([], [("TS0001", FLIGHT_DATE, "New York", "Seoul", "08:00", "22:00", 900, "Test Air", 30)])
+    assert inventory.search_flights("Seoul", "Berlin", FLIGHT_DATE) == []
@@ -0,0 +1,39 @@
+"""
+Answers to a pending booking question keep the conversation language unless they are Vietnamese
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "test-placeholder")
+
+import pytest
+
+from src.utils.intent_rules import intent_rules
+from src.utils.models import IntentClassification
+
+
+def pending_state(language: str, booking_info: dict) -> dict:
+    previous = IntentClassification(intent="book_flight", confidence=0.9, reasoning="User books a flight",
+                                    language=language)
+    return {"current_step": "collecting_info", "intent_classification": previous, "booking_info": booking_info}
+
+
+@pytest.mark.parametrize("text, booking_info", [
+    ("Tokyo", {}),
+    ("Nguyen Van A", {"departure_city": "Hanoi", "arrival_city": "Tokyo", "date": "2026-12-15", "round_trip": False,
+                      "passengers": 1, "class_type": "economy"}),
+])
+def test_ascii_answer_keeps_vietnamese(text, booking_info):
+    result = intent_rules.classify(text, pending_state("vi", booking_info))
+    assert result["path"] == "pending_answer"
+    assert result["language"] == "vi"
+
+
+def test_vietnamese_answer_switches_language():
+    result = intent_rules.classify("Hà Nội", pending_state("en", {}))
+    assert result["path"] == "pending_answer"
+    assert result["language"] == "vi"
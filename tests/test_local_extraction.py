@@ -0,0 +1,71 @@
+"""
+Local booking extraction must not overwrite collected fields with partial guesses
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "test-placeholder")
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.agents import FlightAgent
+
+COLLECTED = {
+    "departure_city": "London",
+    "arrival_city": "Tokyo",
+    "round_trip": False,
+    "date": "2026-12-15",
+}
+
+
+@pytest.fixture(scope="module")
+def agent():
+    return FlightAgent()
+
+
+def collecting_state(text: str) -> dict:
+    return {"messages": [HumanMessage(content=text)], "current_step": "collecting_info"}
+
+
+def test_name_containing_a_city_keeps_departure_city(agent):
+    info = {**COLLECTED, "passengers": 1, "class_type": "economy"}
+    complete = agent._local_extraction(collecting_state("Paris Hilton"), "book_flight", info)
+    assert not complete
+    assert info["departure_city"] == "London"
+
+
+def test_duration_is_not_read_as_a_new_date(agent):
+    info = dict(COLLECTED)
+    complete = agent._local_extraction(collecting_state("2.5 hours"), "book_flight", info)
+    assert not complete
+    assert info["date"] == "2026-12-15"
+
+
+def test_partial_result_still_fills_missing_fields(agent):
+    info = {"departure_city": "London"}
+    agent._local_extraction(collecting_state("to Tokyo, sometime soon-ish"), "book_flight", info)
+    assert info == {"departure_city": "London", "arrival_city": "Tokyo"}
+
+
+def test_complete_result_updates_collected_fields(agent):
+    info = dict(COLLECTED)
+    assert agent._local_extraction(collecting_state("from Paris"), "book_flight", info)
+    assert info["departure_city"] == "Paris"
+
+
+def test_return_weekday_is_after_the_outbound_date(agent):
+    info = {"arrival_city": "Rome"}
+    agent._local_extraction(collecting_state("I am flying to Rome next friday returning sunday"), "book_flight", info)
+    assert info["return_date"] > info["date"]
+
+
+def test_return_weekday_answer_follows_the_collected_date(agent):
+    info = {**COLLECTED, "round_trip": True, "passengers": 1, "class_type": "economy",
+            "passenger_name": "John Smith", "email": "john.smith@example.com"}
+    assert agent._local_extraction(collecting_state("sunday"), "book_flight", info)
+    assert info["return_date"] == "2026-12-20"